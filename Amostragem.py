@@ -0,0 +1,138 @@
+"""
+Sampling primitives shared by the ticket generators.
+"""
+
+import hashlib
+import random
+from typing import Any, List, Sequence
+
+_SEED_BYTES = 32
+
+
+def child_seed(root_seed: int, index: int) -> int:
+    """
+    Derive the seed of an independent child stream.
+
+    Like SeedSequence.spawn: the child seed is a 256-bit hash of the root
+    seed and the child index, so sibling streams (e.g. one per worker
+    process) are uncorrelated, and the same (root, index) always gives the
+    same stream.
+
+    Args:
+        root_seed (int): Seed of the parent stream
+        index (int): Position of the child among its siblings
+
+    Returns:
+        Seed for random.Random
+    """
+    digest = hashlib.blake2b(f"{root_seed}:{index}".encode('ascii'), digest_size=_SEED_BYTES)
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def spawn_seeds(root_seed: int, count: int) -> List[int]:
+    """Return the seeds of the first `count` child streams of a root seed."""
+    return [child_seed(root_seed, index) for index in range(count)]
+
+
+def sample_indices(population_size: int, k: int, rng: random.Random = random) -> List[int]:
+    """
+    Draw k distinct indices from range(population_size) in random order.
+
+    Sparse Fisher-Yates shuffle: only the displaced slots are kept in a
+    dict, so time and memory are O(k) even when k is a large fraction of a
+    huge population (random.sample would copy the whole population then).
+
+    Args:
+        population_size (int): Size of the index space
+        k (int): Number of distinct indices to draw
+        rng (random.Random): Source of randomness
+
+    Returns:
+        List of k distinct indices, uniformly sampled without replacement
+
+    Raises:
+        ValueError: If k is negative or larger than the population
+    """
+    if not 0 <= k <= population_size:
+        raise ValueError(
+            f"Cannot draw {k} distinct items from a population of {population_size}"
+        )
+
+    randrange = rng.randrange
+    displaced = {}
+    sample = []
+    for position in range(k):
+        target = randrange(position, population_size)
+        sample.append(displaced.get(target, target))
+        displaced[target] = displaced.pop(position, position)
+    return sample
+
+
+class AliasTable:
+    """
+    Vose alias table for O(1) weighted sampling with replacement.
+
+    Built once in O(n); every draw then costs one uniform variate and one
+    comparison, however the weights were obtained.
+    """
+
+    def __init__(self, items: Sequence[Any], weights: Sequence[float]):
+        """
+        Build the alias table.
+
+        Args:
+            items (Sequence[Any]): Items to sample
+            weights (Sequence[float]): Non-negative weight of each item
+
+        Raises:
+            ValueError: If the lengths differ or no weight is positive
+        """
+        if len(items) != len(weights):
+            raise ValueError("Each item must have exactly one weight")
+        total = sum(weights)
+        if total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("Weights must be non-negative with a positive sum")
+
+        size = len(items)
+        scaled = [weight * size / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+
+        self._items = list(items)
+        self._probabilities = [1.0] * size
+        self._aliases = list(items)
+        while small and large:
+            lesser = small.pop()
+            greater = large.pop()
+            self._probabilities[lesser] = scaled[lesser]
+            self._aliases[lesser] = items[greater]
+            scaled[greater] += scaled[lesser] - 1
+            (small if scaled[greater] < 1 else large).append(greater)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def sample(self, k: int, rng: random.Random = random) -> List[Any]:
+        """
+        Draw k items with replacement, each in proportion to its weight.
+
+        Args:
+            k (int): Number of draws
+            rng (random.Random): Source of randomness
+
+        Returns:
+            List of k sampled items
+        """
+        size = len(self._items)
+        items = self._items
+        probabilities = self._probabilities
+        aliases = self._aliases
+        uniform = rng.random
+        sample = []
+        append = sample.append
+        for _ in range(k):
+            # One variate picks both the column and the coin flip
+            position = uniform() * size
+            column = int(position)
+            append(items[column] if position - column < probabilities[column] else aliases[column])
+        return sample
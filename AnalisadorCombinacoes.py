@@ -0,0 +1,132 @@
+"""
+Streaming analysis of generated Mega-Sena combinations.
+
+CombinationAnalyzer consumes tickets chunk by chunk and keeps only fixed
+size state: a per-number counter and a uniqueness structure over
+combination ranks, so it can run beside a generator without materializing
+the whole batch.
+"""
+
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, Iterable, Sequence, Union
+
+from Bilhetes import TicketArray, TicketSet, _sorted_rows
+from IndiceCombinacoes import (
+    MAX_NUMBER,
+    MIN_NUMBER,
+    TOTAL_COMBINATIONS,
+    mask_number_counts,
+    rank_combination,
+    rank_rows,
+    unmask_rows,
+    unrank_batch,
+)
+
+# Past this many distinct tickets a set of ranks costs more than a bitmap
+# over the whole rank space (TOTAL_COMBINATIONS bits, about 6 MB)
+_BITMAP_THRESHOLD = TOTAL_COMBINATIONS // 512
+
+Chunk = Union[array, bytes, bytearray, memoryview, TicketArray, Iterable[Sequence[int]]]
+
+
+class CombinationAnalyzer:
+    """
+    Incremental analyzer producing the same report as analyze_combinations.
+
+    Accepted chunks are flat row-major batches (array('B'), bytes) such as
+    those returned by generate_batch, arrays of combination ranks, array('Q')
+    masks or Bilhetes.TicketArray, or any iterable of combinations.
+    result() can be called at any point.
+    """
+
+    def __init__(self):
+        """Initialize an empty analyzer."""
+        self.total_combinations = 0
+        self._number_counts = Counter()
+        self._seen_ranks = set()
+        self._seen_bitmap = None
+        self._unique_combinations = 0
+
+    def update(self, chunk: Chunk) -> 'CombinationAnalyzer':
+        """
+        Consume one chunk of combinations.
+
+        Args:
+            chunk: Flat batch of rows (numbers in any order), array of ranks,
+                array('Q') of masks or TicketArray, or iterable of
+                combinations
+
+        Returns:
+            The analyzer itself, to allow chaining
+
+        Raises:
+            ValueError: If a row or combination is not a valid ticket
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)) or (
+            isinstance(chunk, array) and chunk.typecode == 'B'
+        ):
+            rows = _sorted_rows(chunk)
+            self._number_counts.update(rows)
+            ranks = rank_rows(rows)
+        elif isinstance(chunk, TicketArray) or (isinstance(chunk, array) and chunk.typecode == 'Q'):
+            masks = chunk.masks if isinstance(chunk, TicketArray) else chunk
+            counts = mask_number_counts(masks)
+            self._number_counts.update({num: count for num, count in enumerate(counts) if count})
+            ranks = rank_rows(unmask_rows(masks))
+        elif isinstance(chunk, array):
+            ranks = chunk
+            self._number_counts.update(chain.from_iterable(unrank_batch(ranks)))
+        else:
+            combinations = chunk if isinstance(chunk, list) else list(chunk)
+            self._number_counts.update(chain.from_iterable(combinations))
+            ranks = [rank_combination(combo) for combo in combinations]
+
+        self.total_combinations += len(ranks)
+        self._add_ranks(ranks)
+        return self
+
+    def consume(self, chunks: Iterable[Chunk]) -> 'CombinationAnalyzer':
+        """
+        Consume every chunk from an iterator, e.g. a batch generator.
+
+        Args:
+            chunks (Iterable): Chunks accepted by update
+
+        Returns:
+            The analyzer itself, to allow chaining
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def _add_ranks(self, ranks: Sequence[int]) -> None:
+        """Record ranks in the uniqueness structure, switching to a bitmap when large."""
+        if self._seen_bitmap is None:
+            self._seen_ranks.update(ranks)
+            self._unique_combinations = len(self._seen_ranks)
+            if self._unique_combinations <= _BITMAP_THRESHOLD:
+                return
+            self._seen_bitmap = TicketSet()
+            ranks, self._seen_ranks = self._seen_ranks, set()
+            self._unique_combinations = 0
+
+        self._unique_combinations += self._seen_bitmap.add_ranks(ranks)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Report the analysis of everything consumed so far.
+
+        Returns:
+            Dictionary with analysis details
+        """
+        return {
+            'total_combinations': self.total_combinations,
+            'unique_combinations': self._unique_combinations,
+            'frequency_analysis': {
+                num: self._number_counts[num]
+                for num in range(MIN_NUMBER, MAX_NUMBER + 1)
+                if self._number_counts[num] > 0
+            }
+        }
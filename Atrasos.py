@@ -0,0 +1,190 @@
+"""
+Delay (atraso) and recent-window statistics of the draw history.
+
+DelayTable keeps the contest x number 0/1 occurrence matrix column by
+column: one bytearray per number with a 1 for every contest that drew it.
+Everything is derived from the columns with C-level bytes operations in
+one pass per number, instead of a Python loop per draw:
+
+- delay: contests since the number last appeared (rfind of the last 1;
+  the whole history for a number never drawn);
+- longest gap: the longest run of contests without it, the current delay
+  included (the longest piece between 1s);
+- window counts: its appearances in the last W contests, for each window
+  in `windows` (a count of 1s over the column's tail).
+
+Adding a draw appends one cell per column and updates the delays, gaps
+and window counts in O(MAX_NUMBER) per window, whatever the history size;
+removing the last one undoes it the same way.
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+# Window sizes, in contests, kept up to date by default
+DEFAULT_WINDOWS = (10, 25, 50, 100)
+
+_NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+
+
+class DelayTable:
+    """
+    Per-number delays, longest gaps and recent-window counts.
+
+    Lists are indexed by number (MAX_NUMBER + 1 entries; index 0 is
+    unused), like FrequencyTable.counts.
+    """
+
+    def __init__(self, numbers: Iterable[int] = (), windows: Sequence[int] = DEFAULT_WINDOWS):
+        """
+        Build the statistics of an existing history.
+
+        Args:
+            numbers (Iterable[int]): Flat sequence of drawn numbers,
+                COMBINATION_SIZE per contest, oldest first
+            windows (Sequence[int]): Window sizes, in contests, whose
+                counts are precomputed
+
+        Raises:
+            ValueError: If a window is not positive or the history does
+                not hold whole draws
+        """
+        self.windows = tuple(sorted(set(windows)))
+        if any(window < 1 for window in self.windows):
+            raise ValueError("Window sizes must be positive")
+        numbers = bytes(numbers)
+        if len(numbers) % COMBINATION_SIZE:
+            raise ValueError(f"The history must hold {COMBINATION_SIZE} numbers per draw")
+        self.draws = len(numbers) // COMBINATION_SIZE
+
+        matrix = bytearray(self.draws * MAX_NUMBER)
+        for index, num in enumerate(numbers):
+            matrix[index // COMBINATION_SIZE * MAX_NUMBER + num - MIN_NUMBER] = 1
+        self.columns = [bytearray()] + [matrix[num - MIN_NUMBER::MAX_NUMBER] for num in _NUMBERS]
+
+        self.delays = [0] * (MAX_NUMBER + 1)
+        self.longest_gaps = [0] * (MAX_NUMBER + 1)
+        for num in _NUMBERS:
+            column = self.columns[num]
+            self.delays[num] = self.draws - 1 - column.rfind(1)
+            self.longest_gaps[num] = max(map(len, column.split(b'\x01')))
+        self.window_counts = {window: self._count_window(window) for window in self.windows}
+
+    def _count_window(self, window: int) -> List[int]:
+        """Count each number's appearances in the last `window` contests."""
+        start = max(0, self.draws - window)
+        return [0] + [self.columns[num].count(1, start) for num in _NUMBERS]
+
+    def counts(self, window: int) -> List[int]:
+        """
+        Return each number's appearances in the last `window` contests.
+
+        Precomputed windows are returned as is (do not modify them); other
+        sizes are counted from the columns on demand.
+
+        Raises:
+            ValueError: If the window is not positive
+        """
+        counts = self.window_counts.get(window)
+        if counts is not None:
+            return counts
+        if window < 1:
+            raise ValueError("Window sizes must be positive")
+        return self._count_window(window)
+
+    def add(self, draw: Iterable[int]) -> None:
+        """
+        Take in the next contest.
+
+        Args:
+            draw (Iterable[int]): Drawn numbers
+        """
+        drawn = set(draw)
+        for num in _NUMBERS:
+            hit = num in drawn
+            self.columns[num].append(hit)
+            if hit:
+                self.delays[num] = 0
+            else:
+                delay = self.delays[num] = self.delays[num] + 1
+                if delay > self.longest_gaps[num]:
+                    self.longest_gaps[num] = delay
+        self.draws += 1
+
+        for window, counts in self.window_counts.items():
+            leaving = self.draws - 1 - window
+            for num in _NUMBERS:
+                column = self.columns[num]
+                counts[num] += column[-1] - (column[leaving] if leaving >= 0 else 0)
+
+    def remove_last(self) -> None:
+        """
+        Undo the last add: drop the most recent contest.
+
+        The delays and window counts step back in O(MAX_NUMBER) per window.
+        A longest gap only changes for a number whose current delay is its
+        longest gap; one find over its column tells whether an earlier gap
+        was as long.
+
+        Raises:
+            ValueError: If the history is empty
+        """
+        if not self.draws:
+            raise ValueError("The history is empty")
+        for window, counts in self.window_counts.items():
+            leaving = self.draws - 1 - window
+            for num in _NUMBERS:
+                column = self.columns[num]
+                counts[num] -= column[-1] - (column[leaving] if leaving >= 0 else 0)
+        self.draws -= 1
+
+        for num in _NUMBERS:
+            column = self.columns[num]
+            if column.pop():
+                # The gap this appearance closed becomes the current delay
+                self.delays[num] = self.draws - 1 - column.rfind(1)
+                continue
+            delay = self.delays[num]
+            self.delays[num] = delay - 1
+            if delay == self.longest_gaps[num]:
+                last = column.rfind(1)
+                if last < 0 or column.find(bytes(delay), 0, last) < 0:
+                    self.longest_gaps[num] = delay - 1
+
+    def hottest(self, k: int, window: int) -> List[int]:
+        """
+        Return the k numbers most drawn in the last `window` contests.
+
+        Ties go to the number drawn most recently, then the smaller one.
+        """
+        counts, delays = self.counts(window), self.delays
+        return sorted(_NUMBERS, key=lambda num: (-counts[num], delays[num], num))[:max(k, 0)]
+
+    def coldest(self, k: int, window: int) -> List[int]:
+        """
+        Return the k numbers least drawn in the last `window` contests.
+
+        Ties go to the number with the longest delay, then the smaller one.
+        """
+        counts, delays = self.counts(window), self.delays
+        return sorted(_NUMBERS, key=lambda num: (counts[num], -delays[num], num))[:max(k, 0)]
+
+    def most_overdue(self, k: int) -> List[int]:
+        """Return the k numbers with the longest current delay."""
+        delays = self.delays
+        return sorted(_NUMBERS, key=lambda num: (-delays[num], num))[:max(k, 0)]
+
+    def summary(self, num: int) -> Dict[str, int]:
+        """
+        Return the statistics of one number.
+
+        Returns:
+            Dictionary with 'delay', 'longest_gap' and 'last_<W>' per
+            precomputed window
+        """
+        if not MIN_NUMBER <= num <= MAX_NUMBER:
+            raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+        summary = {'delay': self.delays[num], 'longest_gap': self.longest_gaps[num]}
+        summary.update((f'last_{window}', counts[num]) for window, counts in self.window_counts.items())
+        return summary
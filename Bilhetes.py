@@ -0,0 +1,625 @@
+"""
+Compact ticket value types.
+
+A Ticket stores its six numbers as one 60-bit mask (bit num - 1 per
+number) in a single slot, so hashing and equality are integer operations
+and the matches between two tickets are the popcount of their AND. The
+ordering of masks as integers is the colexicographic order of
+IndiceCombinacoes, so sorting tickets sorts them by rank.
+
+TicketArray keeps many tickets as masks in one array('Q'): 8 bytes per
+ticket instead of a list of six ints (over 100 bytes), with bulk
+conversion from and to the packed rows of generate_batch, per-number
+counts and match counts computed in C-level passes, and set operations on
+the masks themselves.
+
+TicketSet is a set of distinct tickets as a bitmap over the combination
+ranks: TOTAL_COMBINATIONS bits (about 6 MB) whatever the number of
+tickets, with bulk insertion from generated batches, set algebra on the
+whole bitmap at C speed and a file format that is memory-mapped on open:
+
+    header : magic b'MSTS', version (u16), reserved (u16)
+    bits   : BITMAP_BYTES, bit (rank % 8) of byte (rank // 8) per ticket
+"""
+
+import mmap
+import re
+import struct
+from array import array
+from operator import lt
+from typing import Iterable, Iterator, List, Sequence, Union
+
+from IndiceCombinacoes import (
+    COMBINATION_SIZE,
+    MAX_NUMBER,
+    MIN_NUMBER,
+    RANK_TYPECODE,
+    TOTAL_COMBINATIONS,
+    combination_mask,
+    mask_number_counts,
+    mask_numbers,
+    mask_rows,
+    rank_combination,
+    rank_rows,
+    unmask_rows,
+    unrank_combination,
+)
+
+_FULL_MASK = (1 << MAX_NUMBER) - 1
+
+BITMAP_BYTES = (TOTAL_COMBINATIONS + 7) // 8
+
+_SET_MAGIC = b'MSTS'
+_SET_VERSION = 1
+_SET_HEADER = struct.Struct('<4sHH')
+
+# _BYTE_BITS[value]: offsets of the bits set in a bitmap byte
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+_NONZERO_BYTE = re.compile(rb'[^\x00]')
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+# int.bit_count is Python 3.10+
+_popcount = getattr(int, 'bit_count', _popcount)
+
+
+def _mask_of(numbers: Union['Ticket', Iterable[int]]) -> int:
+    """
+    Return the mask of a ticket or of six distinct numbers.
+
+    Raises:
+        ValueError: If the numbers do not form a valid ticket
+    """
+    if isinstance(numbers, Ticket):
+        return numbers.mask
+    numbers = list(numbers)
+    if len(numbers) != COMBINATION_SIZE:
+        raise ValueError(f"Each combination must have exactly {COMBINATION_SIZE} numbers")
+    if any(num < MIN_NUMBER or num > MAX_NUMBER for num in numbers):
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+    mask = combination_mask(numbers)
+    if _popcount(mask) != COMBINATION_SIZE:
+        raise ValueError("No duplicate numbers allowed in a single combination")
+    return mask
+
+
+class Ticket:
+    """
+    Immutable Mega-Sena ticket stored as a 60-bit mask.
+
+    Tickets compare equal when they hold the same numbers in any order,
+    hash like their mask and order by combination rank.
+    """
+
+    __slots__ = ('mask',)
+
+    def __init__(self, numbers: Iterable[int]):
+        """
+        Args:
+            numbers (Iterable[int]): Six distinct numbers, in any order
+
+        Raises:
+            ValueError: If the numbers do not form a valid ticket
+        """
+        object.__setattr__(self, 'mask', _mask_of(numbers))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> 'Ticket':
+        """
+        Wrap a mask, e.g. an element of a TicketArray.
+
+        Raises:
+            ValueError: If the mask does not encode six numbers
+        """
+        if mask & ~_FULL_MASK or _popcount(mask) != COMBINATION_SIZE:
+            raise ValueError(f"A ticket mask must have {COMBINATION_SIZE} of its {MAX_NUMBER} bits set")
+        ticket = object.__new__(cls)
+        object.__setattr__(ticket, 'mask', mask)
+        return ticket
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Ticket is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Ticket is immutable")
+
+    def __reduce__(self):
+        return Ticket.from_mask, (self.mask,)
+
+    def tobytes(self) -> bytes:
+        """Return the sorted numbers as a packed row."""
+        return mask_numbers(self.mask)
+
+    def tolist(self) -> List[int]:
+        """Return the sorted numbers."""
+        return list(self.tobytes())
+
+    @property
+    def rank(self) -> int:
+        """Colexicographic rank of the ticket (see IndiceCombinacoes)."""
+        return rank_combination(self.tobytes())
+
+    def matches(self, other: Union['Ticket', Sequence[int]]) -> int:
+        """
+        Return how many numbers two tickets (or a ticket and a draw) share.
+
+        Args:
+            other (Ticket | Sequence[int]): Ticket or drawn numbers
+        """
+        mask = other.mask if isinstance(other, Ticket) else combination_mask(other)
+        return _popcount(self.mask & mask)
+
+    def __contains__(self, num: int) -> bool:
+        return MIN_NUMBER <= num <= MAX_NUMBER and bool(self.mask >> (num - MIN_NUMBER) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.tobytes())
+
+    def __len__(self) -> int:
+        return COMBINATION_SIZE
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Ticket):
+            return self.mask == other.mask
+        return NotImplemented
+
+    def __lt__(self, other: 'Ticket') -> bool:
+        if isinstance(other, Ticket):
+            return self.mask < other.mask
+        return NotImplemented
+
+    def __le__(self, other: 'Ticket') -> bool:
+        if isinstance(other, Ticket):
+            return self.mask <= other.mask
+        return NotImplemented
+
+    def __gt__(self, other: 'Ticket') -> bool:
+        if isinstance(other, Ticket):
+            return self.mask > other.mask
+        return NotImplemented
+
+    def __ge__(self, other: 'Ticket') -> bool:
+        if isinstance(other, Ticket):
+            return self.mask >= other.mask
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Ticket({self.tolist()})"
+
+
+class TicketArray:
+    """
+    Sequence of tickets stored as 60-bit masks in one array('Q').
+
+    Indexing returns Ticket objects, slicing returns a TicketArray; the
+    underlying `masks` array is accepted directly by
+    ConferirBilhetes.check_pool and AnalisadorCombinacoes.
+    """
+
+    __slots__ = ('masks',)
+
+    def __init__(self, tickets: Iterable[Union[Ticket, Sequence[int]]] = ()):
+        """
+        Args:
+            tickets (Iterable): Tickets or sequences of six numbers
+
+        Raises:
+            ValueError: If some ticket is invalid
+        """
+        self.masks = array('Q', map(_mask_of, tickets))
+
+    @classmethod
+    def from_masks(cls, masks: Iterable[int]) -> 'TicketArray':
+        """
+        Wrap masks that are known to be valid, e.g. from mask_rows.
+
+        An array('Q') is used as given, not copied.
+        """
+        tickets = cls()
+        tickets.masks = masks if isinstance(masks, array) and masks.typecode == 'Q' else array('Q', masks)
+        return tickets
+
+    @classmethod
+    def from_rows(cls, batch: Sequence[int]) -> 'TicketArray':
+        """
+        Convert a flat batch of sorted rows, e.g. from generate_batch.
+
+        Args:
+            batch (Sequence[int]): COMBINATION_SIZE numbers per ticket
+        """
+        return cls.from_masks(mask_rows(batch))
+
+    def to_rows(self) -> array:
+        """Return the tickets as a flat array('B') of sorted rows."""
+        return unmask_rows(self.masks)
+
+    def tolist(self) -> List[List[int]]:
+        """Return the tickets as lists of sorted numbers."""
+        rows = self.to_rows()
+        return [rows[start:start + COMBINATION_SIZE].tolist() for start in range(0, len(rows), COMBINATION_SIZE)]
+
+    def append(self, ticket: Union[Ticket, Sequence[int]]) -> None:
+        """Add one ticket at the end."""
+        self.masks.append(_mask_of(ticket))
+
+    def extend(self, tickets: Union['TicketArray', Iterable[Union[Ticket, Sequence[int]]]]) -> None:
+        """Add tickets at the end; another TicketArray is copied in bulk."""
+        if isinstance(tickets, TicketArray):
+            self.masks.extend(tickets.masks)
+        else:
+            self.masks.extend(map(_mask_of, tickets))
+
+    def number_counts(self) -> List[int]:
+        """Return how many tickets contain each number, indexed by number."""
+        return mask_number_counts(self.masks)
+
+    def match_counts(self, draw: Sequence[int]) -> bytes:
+        """Return one byte per ticket with its matches against a draw."""
+        from ConferirBilhetes import mask_match_counts
+
+        return mask_match_counts(self.masks, draw)
+
+    def unique(self) -> 'TicketArray':
+        """Return the distinct tickets, in order of first appearance."""
+        return TicketArray.from_masks(array('Q', dict.fromkeys(self.masks)))
+
+    def _combine(self, other: 'TicketArray', keep: bool) -> 'TicketArray':
+        other_masks = set(other.masks)
+        return TicketArray.from_masks(array('Q', [
+            mask for mask in dict.fromkeys(self.masks) if (mask in other_masks) == keep
+        ]))
+
+    def __and__(self, other: 'TicketArray') -> 'TicketArray':
+        """Distinct tickets present in both arrays, in this array's order."""
+        return self._combine(other, True)
+
+    def __sub__(self, other: 'TicketArray') -> 'TicketArray':
+        """Distinct tickets of this array missing from the other."""
+        return self._combine(other, False)
+
+    def __or__(self, other: 'TicketArray') -> 'TicketArray':
+        """Distinct tickets present in either array, this array's first."""
+        masks = dict.fromkeys(self.masks)
+        masks.update(dict.fromkeys(other.masks))
+        return TicketArray.from_masks(array('Q', masks))
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Ticket, 'TicketArray']:
+        if isinstance(index, slice):
+            return TicketArray.from_masks(self.masks[index])
+        return Ticket.from_mask(self.masks[index])
+
+    def __iter__(self) -> Iterator[Ticket]:
+        return map(Ticket.from_mask, self.masks)
+
+    def __contains__(self, ticket: Union[Ticket, Sequence[int]]) -> bool:
+        try:
+            mask = _mask_of(ticket)
+        except (TypeError, ValueError):
+            return False
+        return mask in self.masks
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TicketArray):
+            return self.masks == other.masks
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TicketArray({len(self)} tickets)"
+
+
+def _rank_of(ticket: Union[Ticket, Sequence[int]]) -> int:
+    """
+    Return the rank of a ticket or of six distinct numbers.
+
+    Raises:
+        ValueError: If the numbers do not form a valid ticket
+    """
+    if isinstance(ticket, Ticket):
+        return ticket.rank
+    return rank_combination(ticket)
+
+
+def _sorted_rows(batch: Sequence[int]) -> bytes:
+    """
+    Return a flat batch as bytes of sorted rows, checking its tickets.
+
+    Batches of sorted rows (generate_batch, read_tickets) are checked in a
+    few C-level passes over their columns; rows in any other order are
+    sorted first.
+
+    Raises:
+        ValueError: If the batch does not hold whole tickets of distinct
+            numbers between MIN_NUMBER and MAX_NUMBER
+    """
+    rows = bytes(batch)
+    if len(rows) % COMBINATION_SIZE:
+        raise ValueError(f"A batch must hold {COMBINATION_SIZE} numbers per ticket")
+    if rows and (min(rows) < MIN_NUMBER or max(rows) > MAX_NUMBER):
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+
+    def increasing(data: bytes) -> bool:
+        columns = [data[position::COMBINATION_SIZE] for position in range(COMBINATION_SIZE)]
+        return all(all(map(lt, left, right)) for left, right in zip(columns, columns[1:]))
+
+    if not increasing(rows):
+        rows = b''.join(
+            bytes(sorted(rows[start:start + COMBINATION_SIZE])) for start in range(0, len(rows), COMBINATION_SIZE)
+        )
+        if not increasing(rows):
+            raise ValueError("Each ticket must have distinct numbers")
+    return rows
+
+
+class TicketSet:
+    """
+    Set of distinct tickets stored as a bitmap over combination ranks.
+
+    Memory is fixed at BITMAP_BYTES, so deduplicating any stream of
+    tickets costs linear time and about 6 MB. Iteration, ranks() and
+    to_rows() go in rank order. Set operators work on the whole bitmap
+    through Python's big integers.
+    """
+
+    __slots__ = ('bits', '_mmap')
+
+    def __init__(self, tickets: Iterable[Union[Ticket, Sequence[int]]] = ()):
+        """
+        Args:
+            tickets (Iterable): Tickets, sequences of six numbers or a
+                TicketArray
+
+        Raises:
+            ValueError: If some ticket is invalid
+        """
+        self.bits = bytearray(BITMAP_BYTES)
+        self._mmap = None
+        if isinstance(tickets, TicketArray):
+            self.add_rows(tickets.to_rows())
+        else:
+            self.add_ranks(map(_rank_of, tickets))
+
+    @classmethod
+    def from_rows(cls, batch: Sequence[int]) -> 'TicketSet':
+        """Build the set of a flat batch of rows, e.g. from generate_batch (see add_rows)."""
+        tickets = cls()
+        tickets.add_rows(batch)
+        return tickets
+
+    @classmethod
+    def from_ranks(cls, ranks: Iterable[int]) -> 'TicketSet':
+        """Build the set of some combination ranks."""
+        tickets = cls()
+        tickets.add_ranks(ranks)
+        return tickets
+
+    @classmethod
+    def _from_int(cls, value: int) -> 'TicketSet':
+        tickets = cls()
+        tickets.bits[:] = value.to_bytes(BITMAP_BYTES, 'little')
+        return tickets
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> 'TicketSet':
+        """
+        Memory-map a set saved with save().
+
+        Args:
+            path (str): Set file
+            writable (bool): Write changes through to the file; otherwise
+                they stay private to this process (copy-on-write)
+
+        Raises:
+            ValueError: If the file is not a ticket set
+        """
+        with open(path, 'r+b' if writable else 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY)
+        if len(mapped) != _SET_HEADER.size + BITMAP_BYTES or _SET_HEADER.unpack_from(mapped)[:2] != (
+            _SET_MAGIC, _SET_VERSION
+        ):
+            mapped.close()
+            raise ValueError(f"{path} is not a ticket set (version {_SET_VERSION})")
+        tickets = cls.__new__(cls)
+        tickets._mmap = mapped
+        tickets.bits = memoryview(mapped)[_SET_HEADER.size:]
+        return tickets
+
+    def save(self, path: str) -> None:
+        """Write the set to a file that open() can map."""
+        with open(path, 'wb') as file:
+            file.write(_SET_HEADER.pack(_SET_MAGIC, _SET_VERSION, 0))
+            file.write(self.bits)
+
+    def close(self) -> None:
+        """Unmap the file of a set from open(); writable sets are flushed."""
+        if self._mmap is not None:
+            self.bits.release()
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            self.bits = bytearray(BITMAP_BYTES)
+
+    def __enter__(self) -> 'TicketSet':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_ranks(self, ranks: Iterable[int]) -> int:
+        """
+        Insert tickets by rank.
+
+        Returns:
+            How many of them were not in the set yet
+        """
+        bits = self.bits
+        added = 0
+        for rank in ranks:
+            index = rank >> 3
+            bit = 1 << (rank & 7)
+            if not bits[index] & bit:
+                bits[index] |= bit
+                added += 1
+        return added
+
+    def add_rows(self, batch: Sequence[int]) -> int:
+        """
+        Insert a flat batch of rows, e.g. from generate_batch.
+
+        Rows may list their numbers in any order; sorted ones, as every
+        batch of this package is, skip the sorting.
+
+        Returns:
+            How many of its tickets were not in the set yet
+
+        Raises:
+            ValueError: If a row is not a valid ticket
+        """
+        return self.add_ranks(rank_rows(_sorted_rows(batch)))
+
+    def new_rows(self, batch: Sequence[int]) -> array:
+        """
+        Insert a batch and return the rows that were not in the set yet.
+
+        Repeats within the batch are kept once, in order of first
+        appearance.
+
+        Args:
+            batch (Sequence[int]): Flat batch of rows, numbers in any order
+                (see add_rows)
+
+        Returns:
+            array('B') of the new rows, each sorted, laid out as the batch
+
+        Raises:
+            ValueError: If a row is not a valid ticket
+        """
+        bits = self.bits
+        rows = _sorted_rows(batch)
+        fresh = []
+        for row, rank in enumerate(rank_rows(rows)):
+            index = rank >> 3
+            bit = 1 << (rank & 7)
+            if not bits[index] & bit:
+                bits[index] |= bit
+                start = row * COMBINATION_SIZE
+                fresh.append(rows[start:start + COMBINATION_SIZE])
+        return array('B', b''.join(fresh))
+
+    def dedupe(self, batches: Iterable[Sequence[int]]) -> Iterator[array]:
+        """
+        Drop repeated tickets from a stream of batches, in constant memory.
+
+        Tickets already in the set (e.g. a previously played pool) are
+        dropped too. The set keeps every ticket seen.
+
+        Args:
+            batches (Iterable): Flat batches of rows, e.g. from
+                iter_batches or ExportarBilhetes.read_tickets
+
+        Returns:
+            Iterator of the new rows of each batch (see new_rows)
+        """
+        for batch in batches:
+            yield self.new_rows(batch)
+
+    def add(self, ticket: Union[Ticket, Sequence[int]]) -> None:
+        """Insert one ticket."""
+        self.add_ranks((_rank_of(ticket),))
+
+    def discard(self, ticket: Union[Ticket, Sequence[int]]) -> None:
+        """Remove one ticket if present."""
+        rank = _rank_of(ticket)
+        self.bits[rank >> 3] &= ~(1 << (rank & 7)) & 0xFF
+
+    def ranks(self) -> array:
+        """Return the ranks of the tickets, ascending."""
+        bits = self.bits
+        return array(RANK_TYPECODE, [
+            8 * match.start() + bit
+            for match in _NONZERO_BYTE.finditer(bits)
+            for bit in _BYTE_BITS[bits[match.start()]]
+        ])
+
+    def to_rows(self) -> array:
+        """Return the tickets as a flat array('B') of sorted rows, in rank order."""
+        return array('B', b''.join([bytes(unrank_combination(rank)) for rank in self.ranks()]))
+
+    def to_ticket_array(self) -> TicketArray:
+        """Return the tickets as a TicketArray, in rank order."""
+        return TicketArray.from_rows(self.to_rows())
+
+    def _int(self) -> int:
+        return int.from_bytes(self.bits, 'little')
+
+    def _assign(self, value: int) -> 'TicketSet':
+        self.bits[:] = value.to_bytes(BITMAP_BYTES, 'little')
+        return self
+
+    def __or__(self, other: 'TicketSet') -> 'TicketSet':
+        """Tickets in either set."""
+        return TicketSet._from_int(self._int() | other._int())
+
+    def __and__(self, other: 'TicketSet') -> 'TicketSet':
+        """Tickets in both sets."""
+        return TicketSet._from_int(self._int() & other._int())
+
+    def __sub__(self, other: 'TicketSet') -> 'TicketSet':
+        """Tickets of this set missing from the other."""
+        return TicketSet._from_int(self._int() & ~other._int())
+
+    def __xor__(self, other: 'TicketSet') -> 'TicketSet':
+        """Tickets in exactly one of the sets."""
+        return TicketSet._from_int(self._int() ^ other._int())
+
+    def __ior__(self, other: 'TicketSet') -> 'TicketSet':
+        return self._assign(self._int() | other._int())
+
+    def __iand__(self, other: 'TicketSet') -> 'TicketSet':
+        return self._assign(self._int() & other._int())
+
+    def __isub__(self, other: 'TicketSet') -> 'TicketSet':
+        return self._assign(self._int() & ~other._int())
+
+    def __ixor__(self, other: 'TicketSet') -> 'TicketSet':
+        return self._assign(self._int() ^ other._int())
+
+    def isdisjoint(self, other: 'TicketSet') -> bool:
+        """True if no ticket is in both sets."""
+        return not self._int() & other._int()
+
+    def issubset(self, other: 'TicketSet') -> bool:
+        """True if every ticket of this set is in the other."""
+        return not self._int() & ~other._int()
+
+    def __len__(self) -> int:
+        return _popcount(self._int())
+
+    def __bool__(self) -> bool:
+        return _NONZERO_BYTE.search(self.bits) is not None
+
+    def __contains__(self, ticket: Union[Ticket, Sequence[int]]) -> bool:
+        try:
+            rank = _rank_of(ticket)
+        except (TypeError, ValueError):
+            return False
+        return bool(self.bits[rank >> 3] >> (rank & 7) & 1)
+
+    def __iter__(self) -> Iterator[Ticket]:
+        return (Ticket(unrank_combination(rank)) for rank in self.ranks())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TicketSet):
+            return memoryview(self.bits) == memoryview(other.bits)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TicketSet({len(self)} tickets)"
@@ -0,0 +1,236 @@
+"""
+On-disk cache of the statistics derived from a draw history.
+
+Each cached history is one file named after a fingerprint of the history
+bytes and of the code that derives the statistics, so a new draw or an
+updated FrequencyTable / CooccurrenceTable implementation simply misses the
+cache. Files are memory-mapped copy-on-write on load: opening them costs a
+few syscalls, and add_draw on the resulting tables never touches the file.
+Layout (little-endian):
+
+    header  : magic b'MSST', version (u16), reserved (u16), draws (u32)
+    counts  : (MAX_NUMBER + 1) x u32 per-number counts (index 0 unused)
+    pairs   : 60 x 60 x u32 pair counts
+    triples : C(60, 3) x u32 triple counts
+
+The directory is kept under a size cap by deleting the least recently used
+files; loading a file refreshes its modification time.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Optional, Sequence, Tuple
+
+import Coocorrencias
+import Frequencias
+from Coocorrencias import TOTAL_TRIPLES, CooccurrenceTable
+from Frequencias import FrequencyTable
+from IndiceCombinacoes import MAX_NUMBER
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SORTEADOR_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'sorteador_megasena')
+)
+
+# Each entry is about 150 KB, so the default keeps a few dozen histories
+DEFAULT_MAX_BYTES = 8 << 20
+
+_MAGIC = b'MSST'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')
+_SUFFIX = '.bin'
+
+_COUNTS_SIZE = MAX_NUMBER + 1
+_PAIRS_SIZE = MAX_NUMBER * MAX_NUMBER
+_FILE_SIZE = _HEADER.size + 4 * (_COUNTS_SIZE + _PAIRS_SIZE + TOTAL_TRIPLES)
+
+_code_version = None
+
+
+def code_version() -> bytes:
+    """
+    Fingerprint the code that derives the cached statistics.
+
+    Hashes the file format version and the source of the modules building
+    the tables, so editing them invalidates every cached entry.
+    """
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.blake2b(str(_VERSION).encode('ascii'), digest_size=16)
+        for module in (Frequencias, Coocorrencias, sys.modules[__name__]):
+            try:
+                with open(module.__file__, 'rb') as file:
+                    digest.update(file.read())
+            except (OSError, TypeError):
+                digest.update(module.__name__.encode('ascii'))
+        _code_version = digest.digest()
+    return _code_version
+
+
+def _u32_view(buffer: memoryview, offset: int, count: int) -> Sequence[int]:
+    """View `count` little-endian u32 values starting at `offset`."""
+    view = buffer[offset:offset + 4 * count]
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    swapped = array('I', view.tobytes())
+    swapped.byteswap()
+    return swapped
+
+
+class StatisticsCache:
+    """
+    Directory of cached FrequencyTable and CooccurrenceTable data, keyed by
+    history fingerprint, with a least-recently-used size cap.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Cache directory; created on first store
+            max_bytes (int): Total size the directory is trimmed to
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, numbers: Sequence[int]) -> str:
+        """
+        Return the cache key of a history.
+
+        Args:
+            numbers (Sequence[int]): Flat buffer of sorted draws
+
+        Returns:
+            Hex digest of the history bytes and the code version
+        """
+        digest = hashlib.blake2b(code_version(), digest_size=16)
+        digest.update(bytes(numbers))
+        return digest.hexdigest()
+
+    def _path(self, numbers: Sequence[int]) -> str:
+        return os.path.join(self.directory, self.key(numbers) + _SUFFIX)
+
+    def load(self, numbers: Sequence[int]) -> Optional[Tuple[FrequencyTable, CooccurrenceTable]]:
+        """
+        Memory-map the statistics of a history, if cached.
+
+        Args:
+            numbers (Sequence[int]): Flat buffer of sorted draws
+
+        Returns:
+            (frequencies, cooccurrences), or None on a cache miss. Damaged
+            entries are deleted and reported as misses.
+        """
+        path = self._path(numbers)
+        try:
+            with open(path, 'rb') as file:
+                # Copy-on-write: later add_draw calls stay private to this process
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        buffer = memoryview(mapped)
+        valid = len(buffer) == _FILE_SIZE
+        if valid:
+            magic, version, _, draws = _HEADER.unpack_from(buffer)
+            valid = magic == _MAGIC and version == _VERSION
+        if not valid:
+            buffer.release()
+            mapped.close()
+            self._discard(path)
+            return None
+
+        offset = _HEADER.size
+        counts = _u32_view(buffer, offset, _COUNTS_SIZE)
+        offset += 4 * _COUNTS_SIZE
+        pairs = _u32_view(buffer, offset, _PAIRS_SIZE)
+        offset += 4 * _PAIRS_SIZE
+        triples = _u32_view(buffer, offset, TOTAL_TRIPLES)
+        return (
+            FrequencyTable.from_counts(counts),
+            CooccurrenceTable.from_tables(draws, pairs, triples),
+        )
+
+    def store(
+        self,
+        numbers: Sequence[int],
+        frequencies: FrequencyTable,
+        cooccurrences: CooccurrenceTable
+    ) -> None:
+        """
+        Save the statistics of a history and trim the directory.
+
+        The cache is only an optimization: write errors (e.g. a read-only
+        home directory) are ignored.
+
+        Args:
+            numbers (Sequence[int]): Flat buffer of sorted draws the tables
+                were derived from
+            frequencies (FrequencyTable): Per-number counts
+            cooccurrences (CooccurrenceTable): Pair and triple counts
+        """
+        tables = [
+            array('I', frequencies.counts),
+            array('I', cooccurrences.pairs),
+            array('I', cooccurrences.triples),
+        ]
+        if sys.byteorder != 'little':
+            for table in tables:
+                table.byteswap()
+
+        path = self._path(numbers)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION, 0, cooccurrences.draws))
+                for table in tables:
+                    file.write(table.tobytes())
+            os.replace(temporary, path)
+        except OSError:
+            self._discard(temporary)
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        for path, _, _ in self._entries():
+            self._discard(path)
+
+    def _entries(self):
+        """Return (path, size, last use) of every cached entry."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, status.st_size, status.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cap is respected."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,241 @@
+"""
+Prize checking of Mega-Sena ticket pools against a draw.
+
+The kernels work on whole chunks without a per-ticket Python loop:
+
+- packed rows (COMBINATION_SIZE bytes per ticket) are translated into 0/1
+  hit bytes;
+- 60-bit masks (array('Q')) are ANDed with the draw mask as one big integer
+  and popcounted byte-wise through a translate table;
+
+then the bytes of every ticket are summed at once with shifted additions
+over a single big integer. Rank arrays go through an inverted index of the
+ranks that win a prize for the draw.
+"""
+
+import sys
+from array import array
+from functools import lru_cache
+from itertools import combinations as _combinations, repeat
+from typing import Any, Dict, Sequence
+
+from Bilhetes import TicketArray
+from ExportarBilhetes import read_tickets
+from IndiceCombinacoes import (
+    COMBINATION_SIZE,
+    MAX_NUMBER,
+    MIN_NUMBER,
+    RANK_TYPECODE,
+    combination_mask,
+    rank_combination,
+)
+
+# Integer array typecodes read as ranks by check_pool ('Q' holds masks and
+# 'B' packed rows)
+_RANK_TYPECODES = frozenset('hHiIlLq')
+
+# Number of matched numbers that wins each prize tier
+PRIZE_TIERS = {
+    'sena': 6,
+    'quina': 5,
+    'quadra': 4,
+}
+
+DEFAULT_CHUNK_TICKETS = 1 << 20
+
+_MASK_BYTES = 8
+_POPCOUNT = bytes(bin(value).count('1') for value in range(256))
+
+
+def _lane_sums(hits: bytes, width: int) -> bytes:
+    """Sum every group of `width` small bytes into one byte per group."""
+    if not hits:
+        return b''
+    # Every lane total stays below 256, so shifted sums never carry into a
+    # neighbouring byte; the first byte of each lane ends up with its total.
+    value = int.from_bytes(hits, 'little')
+    total = value
+    for shift in range(8, 8 * width, 8):
+        total += value >> shift
+    return total.to_bytes(len(hits) + 1, 'little')[0:len(hits):width]
+
+
+def match_counts(batch: Sequence[int], draw: Sequence[int]) -> bytes:
+    """
+    Count how many numbers of each ticket appear in a draw.
+
+    Args:
+        batch (Sequence[int]): Flat batch of tickets, such as the array('B')
+            returned by generate_batch, or bytes
+        draw (Sequence[int]): The drawn numbers
+
+    Returns:
+        One byte per ticket holding its number of matches (0 to 6)
+    """
+    table = bytearray(256)
+    for num in draw:
+        table[num] = 1
+    return _lane_sums(bytes(batch).translate(table), COMBINATION_SIZE)
+
+
+def mask_match_counts(masks: array, draw: Sequence[int]) -> bytes:
+    """
+    Count matches for tickets encoded as 60-bit masks (bitmask AND + popcount).
+
+    Args:
+        masks (array): array('Q') of ticket masks, see combination_mask
+        draw (Sequence[int]): The drawn numbers
+
+    Returns:
+        One byte per ticket holding its number of matches (0 to 6)
+    """
+    raw = masks.tobytes()
+    pattern = combination_mask(draw).to_bytes(_MASK_BYTES, sys.byteorder) * len(masks)
+    common = int.from_bytes(raw, 'little') & int.from_bytes(pattern, 'little')
+    hits = common.to_bytes(len(raw), 'little').translate(_POPCOUNT)
+    return _lane_sums(hits, _MASK_BYTES)
+
+
+@lru_cache(maxsize=16)
+def _winning_ranks(draw: tuple) -> Dict[int, int]:
+    """Build the inverted index rank -> matches for every prize-winning ticket."""
+    others = [num for num in range(MIN_NUMBER, MAX_NUMBER + 1) if num not in draw]
+    index = {}
+    for matches in PRIZE_TIERS.values():
+        for hit in _combinations(draw, matches):
+            for rest in _combinations(others, COMBINATION_SIZE - matches):
+                index[rank_combination(hit + rest)] = matches
+    return index
+
+
+def rank_prize_matches(ranks: Sequence[int], draw: Sequence[int]) -> bytes:
+    """
+    Count matches for ranked tickets through an inverted index of winners.
+
+    Only prize-winning match counts are resolved; tickets below the lowest
+    tier are reported as 0.
+
+    Args:
+        ranks (Sequence[int]): Combination ranks, see IndiceCombinacoes
+        draw (Sequence[int]): The drawn numbers
+
+    Returns:
+        One byte per ticket holding its number of matches if it wins a prize
+    """
+    lookup = _winning_ranks(tuple(sorted(draw)))
+    return bytes(map(lookup.get, ranks, repeat(0)))
+
+
+def tier_counts(counts: bytes) -> Dict[str, int]:
+    """
+    Summarize per-ticket match counts into prize tier hits.
+
+    Args:
+        counts (bytes): Output of one of the match kernels
+
+    Returns:
+        Dictionary mapping each tier in PRIZE_TIERS to its number of winners
+    """
+    return {tier: counts.count(matches) for tier, matches in PRIZE_TIERS.items()}
+
+
+def _empty_check() -> Dict[str, Any]:
+    """Return a zeroed check report."""
+    return {
+        'total_tickets': 0,
+        'hits': {tier: 0 for tier in PRIZE_TIERS},
+        'winners': {tier: [] for tier in PRIZE_TIERS}
+    }
+
+
+def _accumulate(report: Dict[str, Any], counts: bytes) -> None:
+    """Add the match counts of the next chunk of tickets to a report."""
+    offset = report['total_tickets']
+    for tier, matches in PRIZE_TIERS.items():
+        winners = report['winners'][tier]
+        marker = bytes((matches,))
+        position = counts.find(marker)
+        while position != -1:
+            winners.append(offset + position)
+            position = counts.find(marker, position + 1)
+        report['hits'][tier] += counts.count(matches)
+    report['total_tickets'] += len(counts)
+
+
+def check_pool(
+    draw: Sequence[int],
+    pool: Any,
+    chunk_tickets: int = DEFAULT_CHUNK_TICKETS
+) -> Dict[str, Any]:
+    """
+    Check a pool of tickets against a draw.
+
+    Args:
+        draw (Sequence[int]): The six drawn numbers
+        pool: Tickets as a flat batch (array('B') or bytes), an array of
+            ranks (any other integer typecode but 'Q'), an array('Q') of
+            masks, a TicketArray, or a list of combinations
+        chunk_tickets (int): Tickets processed per kernel call
+
+    Returns:
+        Dictionary with the total number of tickets, hits per prize tier
+        and the pool indices of the winning tickets per tier
+
+    Raises:
+        ValueError: If the draw is invalid
+        TypeError: If the pool is an array of an unsupported typecode
+    """
+    rank_combination(draw)
+
+    if isinstance(pool, TicketArray):
+        pool = pool.masks
+    if isinstance(pool, array) and pool.typecode == 'Q':
+        kernel, width = mask_match_counts, 1
+    elif isinstance(pool, array) and pool.typecode in _RANK_TYPECODES:
+        if pool.typecode != RANK_TYPECODE:
+            pool = array(RANK_TYPECODE, pool)
+        kernel, width = rank_prize_matches, 1
+    elif isinstance(pool, array) and pool.typecode != 'B':
+        raise TypeError(f"Cannot check an array('{pool.typecode}'): use 'B' rows, 'Q' masks or ranks")
+    elif isinstance(pool, (bytes, bytearray, memoryview, array)):
+        kernel, width = match_counts, COMBINATION_SIZE
+    else:
+        pool = bytes(num for combo in pool for num in sorted(combo))
+        kernel, width = match_counts, COMBINATION_SIZE
+
+    report = _empty_check()
+    step = chunk_tickets * width
+    for start in range(0, len(pool), step):
+        _accumulate(report, kernel(pool[start:start + step], draw))
+    return report
+
+
+def check_file(
+    draw: Sequence[int],
+    path: str,
+    chunk_tickets: int = DEFAULT_CHUNK_TICKETS
+) -> Dict[str, Any]:
+    """
+    Stream a pool of packed tickets from disk and check it against a draw.
+
+    The file is in the 'bin' export format (COMBINATION_SIZE bytes per
+    ticket, optionally .gz/.bz2/.xz compressed), so memory use is bounded
+    by chunk_tickets regardless of the pool size.
+
+    Args:
+        draw (Sequence[int]): The six drawn numbers
+        path (str): Path of the packed ticket file
+        chunk_tickets (int): Tickets read and checked per chunk
+
+    Returns:
+        Same report as check_pool
+
+    Raises:
+        ValueError: If the draw is invalid
+    """
+    rank_combination(draw)
+
+    report = _empty_check()
+    for chunk in read_tickets(path, chunk_tickets):
+        _accumulate(report, match_counts(chunk, draw))
+    return report
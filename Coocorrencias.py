@@ -0,0 +1,325 @@
+"""
+Pair and triple co-occurrence statistics of the draw history.
+
+Pairs are counted in a symmetric 60 x 60 matrix stored row-major in a flat
+array('I'); triples in a flat array('I') indexed by the colex rank of the
+sorted triple, C(60, 3) = 34,220 slots. Both are built column-wise over the
+flat history buffer (one C-level pass per position pair or triple instead
+of a Python loop per draw), updated in O(35) per added or removed draw,
+and saved in a small little-endian binary file:
+
+    header  : magic b'MSCO', version (u16), reserved (u16), draws (u32)
+    pairs   : 60 x 60 x u32 pair counts
+    triples : C(60, 3) x u32 triple counts
+"""
+
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import combinations
+from operator import add
+from typing import Iterable, List, Sequence, Tuple
+
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, binomial
+
+PAIR_SIZE = 2
+TRIPLE_SIZE = 3
+TOTAL_TRIPLES = binomial(MAX_NUMBER, TRIPLE_SIZE)
+
+_MAGIC = b'MSCO'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')
+
+_NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+_PAIR_POSITIONS = list(combinations(range(COMBINATION_SIZE), PAIR_SIZE))
+_TRIPLE_POSITIONS = list(combinations(range(COMBINATION_SIZE), TRIPLE_SIZE))
+
+# _TRIPLE_TERMS[i][num]: colex term of `num` at position i of a sorted triple
+_TRIPLE_TERMS = [
+    [binomial(num - MIN_NUMBER, position + 1) if num >= MIN_NUMBER else 0 for num in range(MAX_NUMBER + 1)]
+    for position in range(TRIPLE_SIZE)
+]
+
+
+def _pair_index(a: int, b: int) -> int:
+    """Return the flat matrix index of the ordered pair (a, b)."""
+    return (a - MIN_NUMBER) * MAX_NUMBER + (b - MIN_NUMBER)
+
+
+def triple_rank(triple: Sequence[int]) -> int:
+    """
+    Return the colex rank of a triple of distinct numbers.
+
+    Raises:
+        ValueError: If the triple is invalid
+    """
+    triple = sorted(triple)
+    if len(triple) != TRIPLE_SIZE or len(set(triple)) != TRIPLE_SIZE:
+        raise ValueError(f"A triple must have {TRIPLE_SIZE} distinct numbers")
+    if triple[0] < MIN_NUMBER or triple[-1] > MAX_NUMBER:
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+    return sum(terms[num] for terms, num in zip(_TRIPLE_TERMS, triple))
+
+
+def unrank_triple(rank: int) -> List[int]:
+    """Return the sorted triple with the given colex rank."""
+    triple = []
+    for position in range(TRIPLE_SIZE, 0, -1):
+        value = position - 1
+        while binomial(value + 1, position) <= rank:
+            value += 1
+        rank -= binomial(value, position)
+        triple.append(value + MIN_NUMBER)
+    return triple[::-1]
+
+
+def _pair_keys(numbers: Sequence[int], first: int, second: int) -> array:
+    """
+    Pack two number columns of a flat batch into native u16 keys.
+
+    The key of a row is the two bytes (row[first], row[second]) read as one
+    unsigned short, so a whole column pair becomes integers without a
+    Python-level loop.
+    """
+    keys = bytearray(2 * (len(numbers) // COMBINATION_SIZE))
+    keys[0::2] = numbers[first::COMBINATION_SIZE]
+    keys[1::2] = numbers[second::COMBINATION_SIZE]
+    return array('H', keys)
+
+
+def _triple_ranks(numbers: Sequence[int], positions: Tuple[int, int, int]) -> Iterable[int]:
+    """Yield the colex rank of the triple at `positions` of every sorted row."""
+    columns = [
+        map(terms.__getitem__, numbers[position::COMBINATION_SIZE])
+        for terms, position in zip(_TRIPLE_TERMS, positions)
+    ]
+    return map(add, map(add, columns[0], columns[1]), columns[2])
+
+
+class CooccurrenceTable:
+    """
+    Pair and triple counts of a draw history.
+
+    `pairs` is the symmetric 60 x 60 matrix (row-major, number 1 first) and
+    `triples` the counts by triple rank; both are array('I').
+    """
+
+    def __init__(self, numbers: Sequence[int] = b''):
+        """
+        Count the pairs and triples of an existing history.
+
+        Args:
+            numbers (Sequence[int]): Flat buffer of sorted draws, e.g.
+                DrawStore.numbers
+        """
+        self.draws = len(numbers) // COMBINATION_SIZE
+        self.pairs = array('I', [0]) * (MAX_NUMBER * MAX_NUMBER)
+        self.triples = array('I', [0]) * TOTAL_TRIPLES
+        self._pair_lookup = None
+
+        pair_counts = Counter()
+        for first, second in _PAIR_POSITIONS:
+            pair_counts.update(_pair_keys(numbers, first, second))
+        for key, count in pair_counts.items():
+            a, b = key.to_bytes(2, sys.byteorder)
+            self.pairs[_pair_index(a, b)] += count
+            self.pairs[_pair_index(b, a)] += count
+
+        triple_counts = Counter()
+        for positions in _TRIPLE_POSITIONS:
+            triple_counts.update(_triple_ranks(numbers, positions))
+        for rank, count in triple_counts.items():
+            self.triples[rank] = count
+
+    @classmethod
+    def from_tables(cls, draws: int, pairs: Sequence[int], triples: Sequence[int]) -> 'CooccurrenceTable':
+        """
+        Wrap precomputed tables, e.g. memory-mapped from a cache file.
+
+        Args:
+            draws (int): Number of draws counted
+            pairs (Sequence[int]): 60 x 60 u32 pair counts, row-major
+            triples (Sequence[int]): u32 triple counts by colex rank
+
+        Returns:
+            The table; `pairs` and `triples` are used as given, not copied
+        """
+        table = cls()
+        table.draws = draws
+        table.pairs = pairs
+        table.triples = triples
+        return table
+
+    def _change(self, draw: Sequence[int], delta: int) -> None:
+        """Add `delta` to every pair and triple of a draw."""
+        draw = sorted(draw)
+        for a, b in combinations(draw, PAIR_SIZE):
+            self.pairs[_pair_index(a, b)] += delta
+            self.pairs[_pair_index(b, a)] += delta
+        for triple in combinations(draw, TRIPLE_SIZE):
+            self.triples[triple_rank(triple)] += delta
+        self.draws += delta
+        self._pair_lookup = None
+
+    def add(self, draw: Sequence[int]) -> None:
+        """
+        Count the pairs and triples of a new draw.
+
+        Args:
+            draw (Sequence[int]): The six drawn numbers
+        """
+        self._change(draw, 1)
+
+    def remove(self, draw: Sequence[int]) -> None:
+        """
+        Uncount the pairs and triples of a previously added draw.
+
+        Args:
+            draw (Sequence[int]): The six drawn numbers
+
+        Raises:
+            ValueError: If some pair of the draw was never counted
+        """
+        if any(self.pair_count(a, b) == 0 for a, b in combinations(draw, PAIR_SIZE)):
+            raise ValueError(f"Draw {list(draw)} has not been counted")
+        self._change(draw, -1)
+
+    def pair_count(self, a: int, b: int) -> int:
+        """Return how many draws contained both a and b."""
+        return self.pairs[_pair_index(a, b)]
+
+    def triple_count(self, a: int, b: int, c: int) -> int:
+        """Return how many draws contained a, b and c."""
+        return self.triples[triple_rank((a, b, c))]
+
+    def top_partners(self, number: int, k: int = 5) -> List[Tuple[int, int]]:
+        """
+        Return the numbers most often drawn together with `number`.
+
+        Args:
+            number (int): Reference number
+            k (int): Number of partners to return
+
+        Returns:
+            Up to k (partner, count) tuples, highest count first and ties by
+            number; partners never drawn with `number` are left out
+
+        Raises:
+            ValueError: If the number is out of range
+        """
+        if not MIN_NUMBER <= number <= MAX_NUMBER:
+            raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+        row = _pair_index(number, MIN_NUMBER)
+        partners = [
+            (partner, self.pairs[row + partner - MIN_NUMBER])
+            for partner in _NUMBERS
+            if partner != number and self.pairs[row + partner - MIN_NUMBER]
+        ]
+        partners.sort(key=lambda item: (-item[1], item[0]))
+        return partners[:k]
+
+    def top_pairs(self, k: int = 10) -> List[Tuple[Tuple[int, int], int]]:
+        """Return up to k ((a, b), count) pairs drawn together most often."""
+        pairs = [
+            ((a, b), self.pairs[_pair_index(a, b)])
+            for a, b in combinations(_NUMBERS, PAIR_SIZE)
+            if self.pairs[_pair_index(a, b)]
+        ]
+        pairs.sort(key=lambda item: -item[1])
+        return pairs[:k]
+
+    def top_triples(self, k: int = 10) -> List[Tuple[Tuple[int, int, int], int]]:
+        """Return up to k ((a, b, c), count) triples drawn together most often."""
+        ranks = sorted(
+            (rank for rank, count in enumerate(self.triples) if count),
+            key=lambda rank: -self.triples[rank]
+        )
+        return [(tuple(unrank_triple(rank)), self.triples[rank]) for rank in ranks[:k]]
+
+    def _lookup(self) -> List[int]:
+        """Return (building once per update) the pair counts indexed by u16 key."""
+        if self._pair_lookup is None:
+            lookup = [0] * (1 << 16)
+            for a, b in combinations(_NUMBERS, PAIR_SIZE):
+                # Both byte orders, so the key does not depend on endianness
+                lookup[a | b << 8] = lookup[b | a << 8] = self.pairs[_pair_index(a, b)]
+            self._pair_lookup = lookup
+        return self._pair_lookup
+
+    def pair_score(self, ticket: Sequence[int]) -> int:
+        """
+        Return the pair score of a ticket.
+
+        The score is the sum, over the 15 pairs of the ticket, of how many
+        past draws contained that pair.
+        """
+        return sum(self.pair_count(a, b) for a, b in combinations(ticket, PAIR_SIZE))
+
+    def pair_scores(self, batch: Sequence[int]) -> array:
+        """
+        Score every ticket of a flat batch.
+
+        Works column pair by column pair over the whole batch, so the cost
+        per ticket is a handful of C-level lookups.
+
+        Args:
+            batch (Sequence[int]): Flat batch of tickets, e.g. from
+                generate_batch
+
+        Returns:
+            array('I') with the pair score of each ticket
+        """
+        getitem = self._lookup().__getitem__
+        scores = None
+        for first, second in _PAIR_POSITIONS:
+            values = map(getitem, _pair_keys(batch, first, second))
+            scores = list(values) if scores is None else list(map(add, scores, values))
+        return array('I', scores or ())
+
+    def save(self, path: str) -> None:
+        """
+        Write the tables to a binary file.
+
+        Args:
+            path (str): Destination path
+        """
+        pairs = array('I', self.pairs)
+        triples = array('I', self.triples)
+        if sys.byteorder != 'little':
+            pairs.byteswap()
+            triples.byteswap()
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, 0, self.draws))
+            pairs.tofile(file)
+            triples.tofile(file)
+
+    @classmethod
+    def load(cls, path: str) -> 'CooccurrenceTable':
+        """
+        Read tables written by save.
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            The loaded table
+
+        Raises:
+            ValueError: If the file is not a co-occurrence table
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, _, draws = _HEADER.unpack_from(data)
+        pairs_end = _HEADER.size + 4 * MAX_NUMBER * MAX_NUMBER
+        if magic != _MAGIC or version != _VERSION or len(data) != pairs_end + 4 * TOTAL_TRIPLES:
+            raise ValueError(f"{path} is not a co-occurrence table (version {_VERSION})")
+
+        pairs = array('I')
+        pairs.frombytes(data[_HEADER.size:pairs_end])
+        triples = array('I')
+        triples.frombytes(data[pairs_end:])
+        if sys.byteorder != 'little':
+            pairs.byteswap()
+            triples.byteswap()
+        return cls.from_tables(draws, pairs, triples)
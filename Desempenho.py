@@ -0,0 +1,494 @@
+"""
+Performance benchmarks of generation, analysis, statistics building and
+the GUI results display.
+
+Every case runs at several sizes (tickets or history draws) and reports
+throughput, latency percentiles over the repetitions and the peak Python
+memory of one extra traced run. Results are written as JSON so that runs
+on different commits can be compared with --comparar, and the v1.0 engine
+(v1.0/sorteador.py) runs the same workloads where it supports them, so a
+refactor can be checked against the original code.
+
+    python Desempenho.py -o resultados.json
+    python Desempenho.py --rapido --comparar resultados.json
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from CacheEstatisticas import StatisticsCache
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+from Metodos import METHODS
+
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+DEFAULT_HISTORY_SIZES = (16, 1_000, 10_000)
+
+# Each case is repeated until both limits are reached (or MAX_REPEAT runs)
+DEFAULT_MIN_REPEAT = 5
+DEFAULT_MIN_TIME = 1.0
+MAX_REPEAT = 1000
+
+# Slowdown of the median latency reported as a regression by --comparar
+DEFAULT_THRESHOLD = 0.10
+
+LEGACY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'v1.0', 'sorteador.py')
+LEGACY_METHODS = ('most_frequent', 'least_frequent', 'mixed', 'random')
+# The v1.0 GUI inserts every row into the Text widget, which takes minutes
+# beyond this size
+LEGACY_GUI_MAX_SIZE = 10_000
+
+CURRENT = 'atual'
+LEGACY = 'v1.0'
+
+RESULTS_VERSION = 1
+
+
+class Case(NamedTuple):
+    """One benchmarked workload at one size."""
+    name: str
+    engine: str
+    size: int
+    run: Callable[[], Any]
+    setup: Optional[Callable[[], None]] = None
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def measure(
+    run: Callable[[], Any],
+    setup: Callable[[], None] = None,
+    min_repeat: int = DEFAULT_MIN_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME
+) -> Dict[str, float]:
+    """
+    Time a callable repeatedly, after one warm-up run, and trace its peak
+    memory once.
+
+    Args:
+        run (Callable): Workload; its return value is discarded
+        setup (Callable, optional): Untimed preparation before each run
+        min_repeat (int): Minimum number of timed runs
+        min_time (float): Minimum total timed seconds
+
+    Returns:
+        Dictionary with the number of runs, mean / min / max and p50 / p90 /
+        p99 latencies in seconds, and the peak traced memory in bytes
+    """
+    # Untimed warm-up run: lazily built tables are not part of the latency
+    if setup is not None:
+        setup()
+    run()
+
+    latencies = []
+    total = 0.0
+    gc.collect()
+    while len(latencies) < MAX_REPEAT and (len(latencies) < min_repeat or total < min_time):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        total += elapsed
+
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'repeat': len(latencies),
+        'mean_s': total / len(latencies),
+        'min_s': latencies[0],
+        'p50_s': _percentile(latencies, 0.50),
+        'p90_s': _percentile(latencies, 0.90),
+        'p99_s': _percentile(latencies, 0.99),
+        'max_s': latencies[-1],
+        'peak_bytes': peak,
+    }
+
+
+def random_history(draws: int, seed: int = 0) -> List[List[int]]:
+    """Return `draws` uniformly random draws, for history-size scaling."""
+    rng = random.Random(seed)
+    numbers = range(MIN_NUMBER, MAX_NUMBER + 1)
+    return [sorted(rng.sample(numbers, COMBINATION_SIZE)) for _ in range(draws)]
+
+
+def load_legacy(path: str = LEGACY_PATH):
+    """
+    Import the v1.0 engine from its script.
+
+    Returns:
+        The module, or None if it (or tkinter, which it imports) is missing
+    """
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location('sorteador_v1', path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+    return module
+
+
+def _gui_root():
+    """Return a Tk root window, or None when there is no display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.geometry("600x700")
+    return root
+
+
+def _current_cases(sizes: Sequence[int], history_sizes: Sequence[int], root, seed: int) -> Iterator[Case]:
+    """Yield the cases of the current engine."""
+    generator = SorteadorMegaSena(seed=seed)
+
+    for method in METHODS:
+        for size in sizes:
+            yield Case(
+                f'generate_combinations/{method}', CURRENT, size,
+                lambda method=method, size=size: generator.generate_combinations(method, size)
+            )
+            yield Case(
+                f'generate_batch/{method}', CURRENT, size,
+                lambda method=method, size=size: generator.generate_batch(method, size)
+            )
+
+    for size in sizes:
+        batch = generator.generate_batch('random', size)
+        yield Case('analyze_combinations', CURRENT, size, lambda batch=batch: generator.analyze_combinations(batch))
+        del batch
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = StatisticsCache(directory)
+        for draws in history_sizes:
+            history = random_history(draws, seed)
+            yield Case(
+                'init', CURRENT, draws,
+                lambda history=history: SorteadorMegaSena(historical_results=history, seed=seed)
+            )
+            SorteadorMegaSena(historical_results=history, cache=cache)
+            yield Case(
+                'init/cache', CURRENT, draws,
+                lambda history=history: SorteadorMegaSena(historical_results=history, cache=cache, seed=seed)
+            )
+
+    if root is not None:
+        from SorteadorMega import MegaSenaGeneratorApp
+        import tkinter as tk
+        window = tk.Toplevel(root)
+        app = MegaSenaGeneratorApp(window)
+        window.update()
+        for size in sizes:
+            batch = app.generator.generate_batch('mixed', size)
+            analysis = app.generator.analyze_combinations(batch)
+
+            def display(batch=batch, analysis=analysis, size=size):
+                app._display_results('mixed', size, batch, analysis)
+                window.update()
+
+            yield Case('display_results', CURRENT, size, display)
+        window.destroy()
+
+
+def _legacy_cases(legacy, sizes: Sequence[int], root, seed: int) -> Iterator[Case]:
+    """Yield the cases the v1.0 engine supports."""
+    reseed = lambda: random.seed(seed)
+    generator = legacy.MegaSenaNumberGenerator()
+
+    for method in LEGACY_METHODS:
+        for size in sizes:
+            yield Case(
+                f'generate_combinations/{method}', LEGACY, size,
+                lambda method=method, size=size: generator.generate_combinations(method, size),
+                reseed
+            )
+
+    for size in sizes:
+        random.seed(seed)
+        combinations = generator.generate_combinations('random', size)
+        yield Case(
+            'analyze_combinations', LEGACY, size,
+            lambda combinations=combinations: generator.analyze_combinations(combinations)
+        )
+        del combinations
+
+    # The v1.0 history is fixed: its 16 year-end draws
+    yield Case('init', LEGACY, len(generator.historical_results), legacy.MegaSenaNumberGenerator)
+
+    if root is not None:
+        import tkinter as tk
+        window = tk.Toplevel(root)
+        app = legacy.MegaSenaGeneratorApp(window)
+        window.update()
+        app.method_var.set('mixed')
+        for size in sizes:
+            if size > LEGACY_GUI_MAX_SIZE:
+                continue
+            app.num_combinations_var.set(size)
+
+            def display():
+                # v1.0 has no separate display step: this includes generation
+                app.generate_and_display()
+                window.update()
+
+            yield Case('display_results', LEGACY, size, display, reseed)
+        window.destroy()
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    history_sizes: Sequence[int] = DEFAULT_HISTORY_SIZES,
+    legacy: bool = True,
+    gui: bool = True,
+    only: str = None,
+    min_repeat: int = DEFAULT_MIN_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+    seed: int = 0,
+    progress: Callable[[str], None] = None
+) -> Dict[str, Any]:
+    """
+    Run every benchmark case.
+
+    Args:
+        sizes (Sequence[int]): Numbers of tickets generated, analyzed and
+            displayed
+        history_sizes (Sequence[int]): Numbers of history draws the
+            statistics are built from
+        legacy (bool): Also run the v1.0 engine
+        gui (bool): Also run the GUI cases (skipped without a display)
+        only (str, optional): Only run cases whose name contains this text
+        min_repeat (int): Minimum timed runs per case
+        min_time (float): Minimum timed seconds per case
+        seed (int): Seed of every random stream
+        progress (Callable[[str], None], optional): Called with a line of
+            text after each case
+
+    Returns:
+        JSON-serializable dictionary with the environment and one entry
+        per case
+    """
+    root = _gui_root() if gui else None
+    sources = [_current_cases(sizes, history_sizes, root, seed)]
+    legacy_module = load_legacy() if legacy else None
+    if legacy_module is not None:
+        sources.append(_legacy_cases(legacy_module, sizes, root, seed))
+
+    results = []
+    try:
+        for source in sources:
+            for case in source:
+                if only and only not in case.name:
+                    continue
+                stats = measure(case.run, case.setup, min_repeat, min_time)
+                stats['throughput_per_s'] = case.size / stats['p50_s'] if stats['p50_s'] else None
+                results.append({'name': case.name, 'engine': case.engine, 'size': case.size, **stats})
+                if progress is not None:
+                    progress(_format_result(results[-1]))
+    finally:
+        if root is not None:
+            root.destroy()
+
+    return {
+        'version': RESULTS_VERSION,
+        'environment': _environment(),
+        'gui': root is not None,
+        'legacy': legacy_module is not None,
+        'results': results,
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    """Describe where the benchmarks ran."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _key(result: Dict[str, Any]):
+    return result['name'], result['engine'], result['size']
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Compare the median latency of the cases present in both runs.
+
+    Args:
+        baseline (dict): Earlier output of run_benchmarks
+        current (dict): Later output of run_benchmarks
+        threshold (float): Relative slowdown reported as a regression
+
+    Returns:
+        One entry per common case with both medians, the ratio
+        current / baseline and whether it is a regression
+    """
+    earlier = {_key(result): result for result in baseline['results']}
+    changes = []
+    for result in current['results']:
+        before = earlier.get(_key(result))
+        if before is None or not before['p50_s']:
+            continue
+        ratio = result['p50_s'] / before['p50_s']
+        changes.append({
+            'name': result['name'],
+            'engine': result['engine'],
+            'size': result['size'],
+            'baseline_p50_s': before['p50_s'],
+            'p50_s': result['p50_s'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return changes
+
+
+def legacy_speedups(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return how much faster the current engine is than v1.0 on each
+    workload both ran.
+    """
+    legacy = {
+        (result['name'], result['size']): result
+        for result in results['results'] if result['engine'] == LEGACY
+    }
+    speedups = []
+    for result in results['results']:
+        old = legacy.get((result['name'], result['size']))
+        if result['engine'] == CURRENT and old is not None and result['p50_s']:
+            speedups.append({
+                'name': result['name'],
+                'size': result['size'],
+                'legacy_p50_s': old['p50_s'],
+                'p50_s': result['p50_s'],
+                'speedup': old['p50_s'] / result['p50_s'],
+            })
+    return speedups
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    throughput = result['throughput_per_s']
+    return (
+        f"{result['engine']:<6}{result['name']:<40}{result['size']:>10}"
+        f"{_format_seconds(result['p50_s']):>12}{_format_seconds(result['p99_s']):>12}"
+        f"{throughput or 0:>14,.0f}/s{result['peak_bytes'] / (1 << 20):>10.1f} MB"
+    )
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks from the command line; returns 1 on a regression."""
+    parser = argparse.ArgumentParser(description="Medição de desempenho do gerador")
+    parser.add_argument('-o', '--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--comparar', metavar='JSON', help="resultados anteriores para detectar regressões")
+    parser.add_argument('--limite', type=float, default=DEFAULT_THRESHOLD,
+                        help="piora relativa da mediana considerada regressão (padrão: %(default)s)")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="quantidades de bilhetes")
+    parser.add_argument('--historicos', type=int, nargs='+', default=list(DEFAULT_HISTORY_SIZES),
+                        help="tamanhos de histórico")
+    parser.add_argument('--filtro', help="só casos cujo nome contém este texto")
+    parser.add_argument('--sem-v1', action='store_true', help="não medir o motor v1.0")
+    parser.add_argument('--sem-gui', action='store_true', help="não medir a interface gráfica")
+    parser.add_argument('--rapido', action='store_true', help="uma única repetição por caso")
+    parser.add_argument('--semente', type=int, default=0, help="semente dos geradores")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    print(f"{'Motor':<6}{'Caso':<40}{'Tamanho':>10}{'p50':>12}{'p99':>12}{'Vazão':>16}{'Memória':>13}")
+    results = run_benchmarks(
+        sizes=args.tamanhos,
+        history_sizes=args.historicos,
+        legacy=not args.sem_v1,
+        gui=not args.sem_gui,
+        only=args.filtro,
+        min_repeat=1 if args.rapido else DEFAULT_MIN_REPEAT,
+        min_time=0.0 if args.rapido else DEFAULT_MIN_TIME,
+        seed=args.semente,
+        progress=print
+    )
+    if not results['gui'] and not args.sem_gui:
+        print("Interface gráfica indisponível: casos display_results ignorados", file=sys.stderr)
+
+    speedups = legacy_speedups(results)
+    if speedups:
+        print(f"\n{'Caso':<40}{'Tamanho':>10}{'v1.0':>12}{'atual':>12}{'Ganho':>10}")
+        for entry in speedups:
+            print(
+                f"{entry['name']:<40}{entry['size']:>10}{_format_seconds(entry['legacy_p50_s']):>12}"
+                f"{_format_seconds(entry['p50_s']):>12}{entry['speedup']:>9.1f}x"
+            )
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is None:
+        return 0
+    changes = compare(baseline, results, args.limite)
+    regressions = [change for change in changes if change['regression']]
+    print(f"\n{len(changes)} casos comparados com {args.comparar}, {len(regressions)} regressões")
+    for change in regressions:
+        print(
+            f"{change['engine']:<6}{change['name']:<40}{change['size']:>10}"
+            f"{_format_seconds(change['baseline_p50_s']):>12} -> {_format_seconds(change['p50_s'])}"
+            f" ({change['ratio']:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Streaming export of generated tickets.
+
+Tickets flow from SorteadorMegaSena.iter_batches to disk one chunk at a
+time, through buffered (optionally compressed) writers, so memory use does
+not depend on how many tickets are produced. Supported formats:
+
+    csv   : one ticket per line, numbers separated by commas
+    jsonl : one JSON array per line
+    bin   : packed, COMBINATION_SIZE bytes per ticket (one byte per number)
+
+Compression is chosen from the file suffix (.gz, .bz2, .xz) and uses the
+standard library codecs.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from array import array
+from functools import partial
+from typing import BinaryIO, Iterable, Iterator, Sequence
+
+from IndiceCombinacoes import COMBINATION_SIZE
+
+FORMATS = ('csv', 'jsonl', 'bin')
+
+COMPRESSIONS = {
+    # Level 6 (the gzip tool's default) is several times faster than 9
+    '.gz': partial(gzip.open, compresslevel=6),
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+DEFAULT_CHUNK_TICKETS = 1 << 16
+
+_BUFFER_SIZE = 1 << 20
+
+_ROW_TEMPLATES = {
+    'csv': ','.join(['%d'] * COMBINATION_SIZE) + '\n',
+    'jsonl': '[' + ', '.join(['%d'] * COMBINATION_SIZE) + ']\n',
+}
+
+
+def _split_suffixes(path: str):
+    """Return (format, compression suffix) inferred from a file name."""
+    root, suffix = os.path.splitext(path)
+    compression = suffix if suffix in COMPRESSIONS else None
+    if compression:
+        root, suffix = os.path.splitext(root)
+    return suffix.lstrip('.').lower(), compression
+
+
+def open_ticket_file(path: str, mode: str = 'rb') -> BinaryIO:
+    """
+    Open a ticket file in binary mode, decompressing by suffix when needed.
+
+    Args:
+        path (str): File path; .gz, .bz2 and .xz suffixes are compressed
+        mode (str): 'rb' or 'wb'
+
+    Returns:
+        Buffered binary file object
+    """
+    _, compression = _split_suffixes(path)
+    if compression:
+        return COMPRESSIONS[compression](path, mode)
+    return open(path, mode, buffering=_BUFFER_SIZE)
+
+
+def format_chunk(chunk: Sequence[int], file_format: str) -> bytes:
+    """
+    Serialize a flat row-major chunk of tickets.
+
+    Rows are rendered with one %-format call over the whole chunk, so there
+    is no per-ticket Python loop.
+
+    Args:
+        chunk (Sequence[int]): Flat batch of sorted numbers, e.g. from
+            generate_batch
+        file_format (str): One of FORMATS
+
+    Returns:
+        Encoded bytes for the chunk
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if file_format == 'bin':
+        return bytes(chunk)
+    if file_format not in _ROW_TEMPLATES:
+        raise ValueError(f"Invalid format. Choose from {list(FORMATS)}")
+    count = len(chunk) // COMBINATION_SIZE
+    return ((_ROW_TEMPLATES[file_format] * count) % tuple(chunk)).encode('ascii')
+
+
+def write_tickets(
+    chunks: Iterable[Sequence[int]],
+    path: str,
+    file_format: str = None
+) -> int:
+    """
+    Write a stream of ticket chunks to disk.
+
+    Args:
+        chunks (Iterable[Sequence[int]]): Flat batches, e.g. from
+            SorteadorMegaSena.iter_batches
+        path (str): Output path; its suffix selects compression
+        file_format (str, optional): One of FORMATS; inferred from the path
+            (e.g. 'tickets.csv.gz') when omitted
+
+    Returns:
+        Number of tickets written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if file_format is None:
+        file_format, _ = _split_suffixes(path)
+    if file_format not in FORMATS:
+        raise ValueError(f"Invalid format. Choose from {list(FORMATS)}")
+
+    written = 0
+    with open_ticket_file(path, 'wb') as file:
+        for chunk in chunks:
+            file.write(format_chunk(chunk, file_format))
+            written += len(chunk) // COMBINATION_SIZE
+    return written
+
+
+def read_tickets(path: str, chunk_tickets: int = DEFAULT_CHUNK_TICKETS) -> Iterator[array]:
+    """
+    Stream tickets back from a packed binary ticket file.
+
+    Args:
+        path (str): Path of a 'bin' file, optionally compressed
+        chunk_tickets (int): Tickets per yielded chunk
+
+    Returns:
+        Iterator of flat array('B') chunks
+    """
+    with open_ticket_file(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_tickets * COMBINATION_SIZE)
+            if not chunk:
+                break
+            # Decompressors may return short reads; keep whole tickets only
+            while len(chunk) % COMBINATION_SIZE:
+                rest = file.read(COMBINATION_SIZE - len(chunk) % COMBINATION_SIZE)
+                if not rest:
+                    raise ValueError(f"{path} ends with a truncated ticket")
+                chunk += rest
+            yield array('B', chunk)
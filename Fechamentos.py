@@ -0,0 +1,428 @@
+"""
+Wheel (fechamento) designer: small ticket sets with a match guarantee.
+
+Given a pool of chosen numbers and a guarantee "t if m" (e.g. a quadra if
+the six drawn numbers are all in the pool), finds a small set of tickets,
+all drawn from the pool, such that for every m numbers of the pool that
+could be drawn, at least one ticket contains t of them.
+
+Everything works on bitmasks over pool positions. A ticket covers a target
+(m-subset of the pool) exactly when the ticket and the target share one of
+the ticket's t-subsets, so the targets containing each t-subset are
+precomputed as one big-int bitset and a ticket's coverage is the OR of
+C(6, t) of them. The designer runs a lazy randomized greedy set cover,
+then a local search that drops redundant tickets and replaces pairs of
+tickets by a single one. Independent restarts run on a process pool, each
+with its own child seed, and the smallest wheel wins, so results are
+reproducible for a given seed and restart count.
+"""
+
+import argparse
+import heapq
+import os
+import random
+from array import array
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Optional, Sequence, Tuple
+
+from Amostragem import child_seed
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, binomial, iter_rows
+
+# Largest pool accepted: C(25, 6) = 177,100 candidate tickets
+MAX_POOL_SIZE = 25
+
+DEFAULT_RESTARTS = 4
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+# int.bit_count (Python 3.10+) is several times faster on the big target bitsets
+_popcount = getattr(int, 'bit_count', _popcount)
+
+
+def _subset_masks(universe: int, size: int) -> List[int]:
+    """Return the bitmasks of every `size`-subset of range(universe)."""
+    return [sum(1 << bit for bit in subset) for subset in combinations(range(universe), size)]
+
+
+def _mask_subsets(mask: int, size: int) -> List[int]:
+    """Return the bitmasks of every `size`-subset of the set bits of `mask`."""
+    bits = [1 << bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+    return [sum(subset) for subset in combinations(bits, size)]
+
+
+def _target_positions(bitset: int) -> List[int]:
+    """Return the indices of the set bits of a target bitset."""
+    bits = bin(bitset)[:1:-1]
+    positions = []
+    index = bits.find('1')
+    while index >= 0:
+        positions.append(index)
+        index = bits.find('1', index + 1)
+    return positions
+
+
+def _validate(pool: Sequence[int], guarantee: int, drawn: int) -> List[int]:
+    """
+    Validate a wheel request and return the sorted pool.
+
+    Raises:
+        ValueError: If the pool or the guarantee is invalid
+    """
+    pool = sorted(pool)
+    if len(set(pool)) != len(pool):
+        raise ValueError("No duplicate numbers allowed in the pool")
+    if any(num < MIN_NUMBER or num > MAX_NUMBER for num in pool):
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+    if not COMBINATION_SIZE <= len(pool) <= MAX_POOL_SIZE:
+        raise ValueError(f"The pool must have between {COMBINATION_SIZE} and {MAX_POOL_SIZE} numbers")
+    if not 1 <= guarantee <= drawn <= COMBINATION_SIZE:
+        raise ValueError(f"The guarantee must satisfy 1 <= t <= m <= {COMBINATION_SIZE}")
+    return pool
+
+
+class _Problem:
+    """Targets, candidates and coverage bitsets of one wheel request."""
+
+    def __init__(self, pool_size: int, guarantee: int, drawn: int):
+        self.pool_size = pool_size
+        self.guarantee = guarantee
+        self.targets = _subset_masks(pool_size, drawn)
+        self.candidates = _subset_masks(pool_size, COMBINATION_SIZE)
+
+        subsets = _subset_masks(pool_size, guarantee)
+        self._subset_ids = {subset: index for index, subset in enumerate(subsets)}
+        # t-subsets of each candidate, as indices into the bitset lists
+        self.candidate_subsets = [self.subset_ids(candidate) for candidate in self.candidates]
+        self.containing = self.bitsets(self.targets)
+
+    def subset_ids(self, mask: int) -> List[int]:
+        """Return the indices of the t-subsets of a ticket or target."""
+        return [self._subset_ids[subset] for subset in _mask_subsets(mask, self.guarantee)]
+
+    def bitsets(self, targets: Sequence[int]) -> List[int]:
+        """
+        For each t-subset, the bitset (over positions in `targets`) of the
+        targets containing it.
+        """
+        size = (len(targets) + 7) // 8
+        bitmaps = [None] * len(self._subset_ids)
+        for index, target in enumerate(targets):
+            byte, bit = index >> 3, 1 << (index & 7)
+            for subset in self.subset_ids(target):
+                bitmap = bitmaps[subset]
+                if bitmap is None:
+                    bitmap = bitmaps[subset] = bytearray(size)
+                bitmap[byte] |= bit
+        return [int.from_bytes(bitmap, 'little') if bitmap else 0 for bitmap in bitmaps]
+
+    def coverage(self, candidate: int, bitsets: List[int] = None) -> int:
+        """Return the bitset of targets sharing at least t numbers with a candidate."""
+        bitsets = self.containing if bitsets is None else bitsets
+        covered = 0
+        for subset in self.candidate_subsets[candidate]:
+            covered |= bitsets[subset]
+        return covered
+
+    def covers(self, candidate: int, targets: Sequence[int]) -> bool:
+        """Return True if a candidate (pool bitmask) covers every given target."""
+        guarantee = self.guarantee
+        return all(_popcount(candidate & target) >= guarantee for target in targets)
+
+    def covering(self, targets: List[int]) -> List[int]:
+        """Return every candidate (as a pool bitmask) covering all the given targets."""
+        guarantee = self.guarantee
+        first = targets[0]
+        # The target farthest from the first one rules out most candidates
+        farthest = min(targets, key=lambda target: _popcount(target & first))
+        return [
+            candidate for candidate in _covering_candidates(self.pool_size, guarantee, first)
+            if _popcount(candidate & farthest) >= guarantee and self.covers(candidate, targets)
+        ]
+
+
+@lru_cache(maxsize=4096)
+def _covering_candidates(pool_size: int, guarantee: int, target: int) -> Tuple[int, ...]:
+    """Return every ticket (as a pool bitmask) sharing at least t numbers with a target."""
+    outside = ((1 << pool_size) - 1) & ~target
+    inner = [1 << bit for bit in range(pool_size) if target >> bit & 1]
+    outer = [1 << bit for bit in range(pool_size) if outside >> bit & 1]
+    found = []
+    for shared in range(guarantee, min(len(inner), COMBINATION_SIZE) + 1):
+        for head in combinations(inner, shared):
+            head = sum(head)
+            found.extend(head + sum(tail) for tail in combinations(outer, COMBINATION_SIZE - shared))
+    return tuple(found)
+
+
+def _greedy(problem: _Problem, rng: random.Random) -> List[int]:
+    """
+    Lazy greedy set cover with random tie-breaking.
+
+    Gains only shrink as targets get covered, so a stale gain is an upper
+    bound: a candidate whose refreshed gain still beats the next bound in
+    the heap is the best one. Every ticket covers the same number of
+    targets initially, so the heap starts from that bound without
+    evaluating any candidate. Whenever most targets are covered, the
+    bitsets are rebuilt over the uncovered ones only, which keeps every
+    evaluation proportional to the work left.
+
+    Returns:
+        Indices of the chosen candidates
+    """
+    initial = _popcount(problem.coverage(0))
+    heap = [(-initial, rng.random(), candidate) for candidate in range(len(problem.candidates))]
+    heapq.heapify(heap)
+
+    active = problem.targets
+    bitsets = problem.containing
+    uncovered = (1 << len(active)) - 1
+    wheel = []
+    while uncovered:
+        _, tiebreak, candidate = heapq.heappop(heap)
+        gain = _popcount(problem.coverage(candidate, bitsets) & uncovered)
+        if heap and gain < -heap[0][0]:
+            heapq.heappush(heap, (-gain, tiebreak, candidate))
+            continue
+        wheel.append(candidate)
+        uncovered &= ~problem.coverage(candidate, bitsets)
+        if uncovered and 4 * _popcount(uncovered) < len(active):
+            active = [active[position] for position in _target_positions(uncovered)]
+            bitsets = problem.bitsets(active)
+            uncovered = (1 << len(active)) - 1
+    return wheel
+
+
+def _unions(coverages: List[int]) -> Tuple[List[int], List[int]]:
+    """Return the prefix and suffix unions of a list of coverage bitsets."""
+    prefix = [0]
+    for covered in coverages:
+        prefix.append(prefix[-1] | covered)
+    suffix = [0]
+    for covered in reversed(coverages):
+        suffix.append(suffix[-1] | covered)
+    suffix.reverse()
+    return prefix, suffix
+
+
+def _local_search(problem: _Problem, wheel: List[int], rng: random.Random) -> List[int]:
+    """
+    Drop redundant tickets and replace pairs of tickets by a single one.
+
+    Prefix and suffix unions give, for every ticket, the targets only it
+    covers, and for every pair the union of everybody else in O(1). A
+    replacement for the pair (first, second) must cover the targets only
+    `first` covers, so those candidates are listed once per ticket; they
+    are then screened against the targets only `second` covers before the
+    exact check against everything the pair alone covers. The search
+    resumes where the last change happened and stops after a full sweep
+    without changes.
+
+    Returns:
+        The improved wheel as pool bitmasks
+    """
+    masks = [problem.candidates[candidate] for candidate in wheel]
+    rng.shuffle(masks)
+    index_of = {mask: index for index, mask in enumerate(problem.candidates)}
+    start = 0
+    while True:
+        coverages = [problem.coverage(index_of[mask]) for mask in masks]
+        prefix, suffix = _unions(coverages)
+        unique = [
+            [problem.targets[position] for position in _target_positions(covered & ~(prefix[index] | suffix[index + 1]))]
+            for index, covered in enumerate(coverages)
+        ]
+
+        changed_at = None
+        for first in range(start, len(masks)):
+            if not unique[first]:
+                del masks[first]
+                changed_at = first
+                break
+            candidates = problem.covering(unique[first])
+            between = 0
+            for second in range(first + 1, len(masks)):
+                others = prefix[first] | between | suffix[second + 1]
+                between |= coverages[second]
+                fits = [candidate for candidate in candidates if problem.covers(candidate, unique[second])]
+                if not fits:
+                    continue
+                needed = (coverages[first] | coverages[second]) & ~others
+                targets = [problem.targets[position] for position in _target_positions(needed)]
+                replacement = next((candidate for candidate in fits if problem.covers(candidate, targets)), None)
+                if replacement is not None:
+                    masks[first] = replacement
+                    del masks[second]
+                    changed_at = first
+                    break
+            if changed_at is not None:
+                break
+
+        if changed_at is not None:
+            start = min(changed_at, len(masks) - 1)
+        elif start:
+            start = 0
+        else:
+            return masks
+
+
+def _design(job: Tuple[int, int, int, int]) -> List[int]:
+    """
+    Run one randomized restart (runs inside a worker process).
+
+    Args:
+        job: Pool size, guarantee t, drawn numbers m and restart seed
+
+    Returns:
+        Wheel as bitmasks over pool positions
+    """
+    pool_size, guarantee, drawn, seed = job
+    rng = random.Random(seed)
+    problem = _Problem(pool_size, guarantee, drawn)
+    return _local_search(problem, _greedy(problem, rng), rng)
+
+
+def _to_tickets(pool: List[int], wheel: List[int]) -> array:
+    """Map pool-position bitmasks to a sorted flat ticket batch."""
+    rows = sorted(
+        [pool[bit] for bit in range(len(pool)) if ticket >> bit & 1]
+        for ticket in wheel
+    )
+    return array('B', [num for row in rows for num in row])
+
+
+def design_wheel(
+    pool: Sequence[int],
+    guarantee: int = 4,
+    drawn: int = COMBINATION_SIZE,
+    restarts: int = DEFAULT_RESTARTS,
+    workers: int = None,
+    seed: int = 0
+) -> array:
+    """
+    Design a small set of tickets with a "t if m" guarantee over a pool.
+
+    Args:
+        pool (Sequence[int]): Chosen numbers (6 to MAX_POOL_SIZE)
+        guarantee (int): Matches t guaranteed on at least one ticket
+        drawn (int): Drawn numbers m that must fall in the pool
+        restarts (int): Independent randomized runs; the smallest wins
+        workers (int, optional): Worker processes. Defaults to the CPU count;
+            1 runs in the current process.
+        seed (int): Root seed; restart i uses child_seed(seed, i)
+
+    Returns:
+        Flat array('B') of sorted tickets, as returned by generate_batch
+
+    Raises:
+        ValueError: If the pool or the guarantee is invalid
+    """
+    pool = _validate(pool, guarantee, drawn)
+    jobs = [(len(pool), guarantee, drawn, child_seed(seed, index)) for index in range(max(restarts, 1))]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    if workers == 1:
+        wheels = list(map(_design, jobs))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            wheels = list(executor.map(_design, jobs))
+    # min keeps the first smallest wheel, so ties do not depend on scheduling
+    return _to_tickets(pool, min(wheels, key=len))
+
+
+def find_uncovered(
+    pool: Sequence[int],
+    tickets: Sequence[int],
+    guarantee: int = 4,
+    drawn: int = COMBINATION_SIZE
+) -> Optional[List[int]]:
+    """
+    Check a wheel exhaustively, independently of how it was designed.
+
+    Every t-subset of every ticket is recorded; an m-subset of the pool is
+    covered exactly when one of its own t-subsets was recorded. All
+    C(len(pool), m) draws are checked.
+
+    Args:
+        pool (Sequence[int]): Chosen numbers
+        tickets (Sequence[int]): Flat batch of tickets
+        guarantee (int): Matches t guaranteed on at least one ticket
+        drawn (int): Drawn numbers m that must fall in the pool
+
+    Returns:
+        The first m numbers of the pool for which no ticket has t matches,
+        or None if the guarantee holds
+
+    Raises:
+        ValueError: If the pool or the guarantee is invalid
+    """
+    pool = _validate(pool, guarantee, drawn)
+    hit = set()
+    for ticket in iter_rows(tickets):
+        hit.update(combinations(sorted(ticket), guarantee))
+    for draw in combinations(pool, drawn):
+        if not any(subset in hit for subset in combinations(draw, guarantee)):
+            return list(draw)
+    return None
+
+
+def verify_wheel(
+    pool: Sequence[int],
+    tickets: Sequence[int],
+    guarantee: int = 4,
+    drawn: int = COMBINATION_SIZE
+) -> bool:
+    """Return True if the tickets satisfy the "t if m" guarantee over the pool."""
+    return find_uncovered(pool, tickets, guarantee, drawn) is None
+
+
+def wheel_size_bound(pool_size: int, guarantee: int, drawn: int) -> int:
+    """
+    Return a simple lower bound on the size of any wheel.
+
+    Each ticket covers at most as many targets as one ticket covers in an
+    empty wheel, so at least ceil(targets / per-ticket coverage) tickets
+    are needed.
+    """
+    targets = binomial(pool_size, drawn)
+    per_ticket = sum(
+        binomial(COMBINATION_SIZE, shared) * binomial(pool_size - COMBINATION_SIZE, drawn - shared)
+        for shared in range(guarantee, min(drawn, COMBINATION_SIZE) + 1)
+    )
+    return -(-targets // per_ticket)
+
+
+def main() -> None:
+    """Design a wheel from the command line and print the tickets."""
+    parser = argparse.ArgumentParser(description="Fechamentos com garantia de acertos")
+    parser.add_argument('dezenas', nargs='+', type=int, help="dezenas escolhidas")
+    parser.add_argument('--garantia', type=int, default=4, help="acertos garantidos em pelo menos um bilhete")
+    parser.add_argument('--se-sorteadas', type=int, default=COMBINATION_SIZE, help="dezenas sorteadas dentro do grupo")
+    parser.add_argument('--tentativas', type=int, default=DEFAULT_RESTARTS, help="execuções independentes")
+    parser.add_argument('--processos', type=int, default=None, help="processos paralelos")
+    parser.add_argument('--semente', type=int, default=0, help="semente do projeto")
+    args = parser.parse_args()
+
+    try:
+        tickets = design_wheel(
+            args.dezenas, args.garantia, args.se_sorteadas,
+            restarts=args.tentativas, workers=args.processos, seed=args.semente
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    for index, ticket in enumerate(iter_rows(tickets), 1):
+        print(f"{index}. {list(ticket)}")
+    status = "garantia verificada" if verify_wheel(args.dezenas, tickets, args.garantia, args.se_sorteadas) else "GARANTIA FALHOU"
+    print(
+        f"\n{len(tickets) // COMBINATION_SIZE} bilhetes "
+        f"(mínimo teórico {wheel_size_bound(len(args.dezenas), args.garantia, args.se_sorteadas)}), {status}"
+    )
+
+
+if __name__ == '__main__':
+    main()
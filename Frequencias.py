@@ -0,0 +1,107 @@
+"""
+Incrementally maintained number frequencies.
+
+FrequencyTable keeps the historical count of every number together with a
+ranking of the numbers by count, so adding or removing a draw costs
+O(COMBINATION_SIZE * log 60) and the most / least frequent numbers are read
+straight off the ranking, without a full recount.
+"""
+
+from bisect import bisect_left, insort
+from typing import Iterable, List, Sequence
+
+from IndiceCombinacoes import MAX_NUMBER, MIN_NUMBER
+
+
+class FrequencyTable:
+    """
+    Per-number draw counts with an always-sorted ranking.
+
+    The ranking orders numbers by count (highest first) and, among equal
+    counts, by number, so the result never depends on the order in which
+    draws were added. Numbers that were never drawn are not ranked.
+    """
+
+    def __init__(self, numbers: Iterable[int] = ()):
+        """
+        Count the numbers of an existing history.
+
+        Args:
+            numbers (Iterable[int]): Flat sequence of drawn numbers
+        """
+        self.counts = [0] * (MAX_NUMBER + 1)
+        for num in numbers:
+            self.counts[num] += 1
+        self._rank()
+
+    @classmethod
+    def from_counts(cls, counts: Sequence[int]) -> 'FrequencyTable':
+        """
+        Build a table from precomputed counts, e.g. read from a cache.
+
+        Args:
+            counts (Sequence[int]): Count of each number, indexed by number
+                (MAX_NUMBER + 1 entries; index 0 is unused)
+        """
+        table = cls()
+        table.counts = list(counts)
+        table._rank()
+        return table
+
+    def _rank(self) -> None:
+        """Sort the numbers drawn at least once into the ranking."""
+        # Sorted keys (-count, num) of every number drawn at least once
+        self._ranking = sorted(
+            (-count, num)
+            for num, count in enumerate(self.counts)
+            if num >= MIN_NUMBER and count > 0
+        )
+
+    def _change(self, num: int, delta: int) -> None:
+        """Move a number to its new position in the ranking."""
+        count = self.counts[num]
+        if count > 0:
+            del self._ranking[bisect_left(self._ranking, (-count, num))]
+        count += delta
+        if count < 0:
+            raise ValueError(f"Number {num} has not been drawn")
+        self.counts[num] = count
+        if count > 0:
+            insort(self._ranking, (-count, num))
+
+    def add(self, draw: Iterable[int]) -> None:
+        """
+        Count the numbers of a new draw.
+
+        Args:
+            draw (Iterable[int]): Drawn numbers
+        """
+        for num in draw:
+            self._change(num, 1)
+
+    def remove(self, draw: Iterable[int]) -> None:
+        """
+        Uncount the numbers of a previously added draw.
+
+        Args:
+            draw (Iterable[int]): Drawn numbers
+
+        Raises:
+            ValueError: If a number would get a negative count
+        """
+        draw = list(draw)
+        for undone, num in enumerate(draw):
+            try:
+                self._change(num, -1)
+            except ValueError:
+                for restored in draw[:undone]:
+                    self._change(restored, 1)
+                raise
+
+    def most_frequent(self, k: int) -> List[int]:
+        """Return up to k drawn numbers with the highest counts, most frequent first."""
+        return [num for _, num in self._ranking[:k]]
+
+    def least_frequent(self, k: int) -> List[int]:
+        """Return up to k drawn numbers with the lowest counts, least frequent first."""
+        return [num for _, num in reversed(self._ranking[-k:])] if k > 0 else []
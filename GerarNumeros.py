@@ -1,6 +1,170 @@
-from typing import List, Dict, Literal
+from typing import Iterator, List, Dict, Sequence, Union
+import os
 import random
+import time
+from array import array
+from datetime import date
 from collections import Counter
+from concurrent.futures import Executor
+from itertools import combinations as _combinations, product as _product
+
+from AnalisadorCombinacoes import CombinationAnalyzer
+from Atrasos import DelayTable
+from CacheEstatisticas import StatisticsCache
+from Coocorrencias import CooccurrenceTable
+from Fechamentos import DEFAULT_RESTARTS, design_wheel
+from Bilhetes import TicketArray
+from Frequencias import FrequencyTable
+from Instrumentacao import DEFAULT_DUMP_INTERVAL, CountingRandom, Instrumentation, StatsDumper, timed
+from Restricoes import Constraints, constrained_sampler, satisfies
+from HistoricoSorteios import DrawStore
+from IndiceConcursos import ContestIndex
+from Metodos import METHODS, GenerationMethod
+from Amostragem import AliasTable, child_seed, sample_indices
+from IndiceCombinacoes import (
+    RANK_TYPECODE,
+    TOTAL_COMBINATIONS,
+    binomial,
+    iter_rows,
+    rank_rows,
+    unrank_combination,
+)
+
+# Uniform tickets are assembled from sorted sub-combinations of fixed-size 
+# number blocks (1-20, 21-40, 41-60), so concatenation is already sorted.
+_UNIFORM_BLOCK_SIZE = 20
+_uniform_block_cache = None
+
+# Combinations per batch yielded by SorteadorMegaSena.iter_batches
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Below this many tickets, 'random' unranks one uniform rank per ticket: 
+# the bulk block tables only pay off once their fixed cost is spread over 
+# a batch
+SMALL_RANDOM_BATCH = 48
+
+# Recent contests ranked by the 'hot' and 'cold' strategies (one of
+# Atrasos.DEFAULT_WINDOWS, so the counts are kept up to date)
+TREND_WINDOW = 25
+
+# Numbers in the pool of the 'hot', 'cold' and 'overdue' strategies
+TREND_POOL_SIZE = 10
+
+# Most tickets drawn per requested one by the weighted strategies with 
+# unique=True before giving up on finding distinct combinations
+MAX_DRAWS_PER_UNIQUE = 100
+
+
+def _subset_table(pool: List[int], size: int) -> List[bytes]:
+    """
+    Enumerate every sorted subset of a number pool as a packed byte row.
+    
+    Raises:
+        ValueError: If the pool is smaller than the requested subset size
+    """
+    if size > len(pool):
+        raise ValueError("Sample larger than population or is negative")
+    return [bytes(subset) for subset in _combinations(sorted(pool), size)]
+
+
+def _mixed_table(most: List[int], least: List[int], size: int) -> List[bytes]:
+    """
+    Enumerate the tickets joining half of one pool with half of the other.
+    
+    The pools overlap when fewer than 2 * size numbers were ever drawn; 
+    joins that repeat a number are dropped and repeated tickets kept once, 
+    so every row is a valid ticket.
+    
+    Raises:
+        ValueError: If a pool is smaller than half the ticket
+    """
+    half = size // 2
+    table = (
+        bytes(sorted(a + b))
+        for a in _subset_table(most, half)
+        for b in _subset_table(least, size - half)
+    )
+    return list(dict.fromkeys(row for row in table if len(set(row)) == size))
+
+
+def _draw_rows(
+    table: List[bytes], 
+    num_combinations: int, 
+    unique: bool, 
+    rng: random.Random
+) -> List[bytes]:
+    """
+    Draw rows from a strategy's outcome table, with or without replacement.
+    
+    The rows of the table are distinct tickets.
+    
+    Raises:
+        ValueError: If unique rows are requested beyond the table's rows
+    """
+    if not unique:
+        return rng.choices(table, k=num_combinations)
+    
+    if num_combinations > len(table):
+        raise ValueError(
+            f"Cannot generate {num_combinations} distinct combinations: "
+            f"this method only has {len(table)} possible combinations"
+        )
+    return [table[index] for index in sample_indices(len(table), num_combinations, rng)]
+
+
+def _filter_table(table: List[bytes], constraints: Constraints) -> List[bytes]:
+    """
+    Keep the rows of an outcome table that pass the constraints.
+    
+    Raises:
+        ValueError: If no row passes
+    """
+    if constraints is None:
+        return table
+    table = [row for row in table if satisfies(row, constraints)]
+    if not table:
+        raise ValueError("No combination satisfies the constraints")
+    return table
+
+
+def _uniform_block_tables():
+    """
+    Build (once) the tables used to draw uniformly random tickets in bulk.
+    
+    Returns:
+        Tuple of (block compositions, cumulative composition weights, 
+        per-block subset tables indexed by subset size)
+    """
+    global _uniform_block_cache
+    if _uniform_block_cache is None:
+        size = SorteadorMegaSena.COMBINATION_SIZE
+        blocks = [
+            list(range(start, start + _UNIFORM_BLOCK_SIZE))
+            for start in range(
+                SorteadorMegaSena.MIN_NUMBER, 
+                SorteadorMegaSena.MAX_NUMBER + 1, 
+                _UNIFORM_BLOCK_SIZE
+            )
+        ]
+        compositions = [
+            parts for parts in _product(range(size + 1), repeat=len(blocks))
+            if sum(parts) == size
+        ]
+        cum_weights = []
+        total = 0
+        for parts in compositions:
+            weight = 1
+            for part in parts:
+                weight *= binomial(_UNIFORM_BLOCK_SIZE, part)
+            total += weight
+            cum_weights.append(total)
+        block_tables = [
+            [_subset_table(block, part) for part in range(size + 1)]
+            for block in blocks
+        ]
+        _uniform_block_cache = (compositions, cum_weights, block_tables)
+    return _uniform_block_cache
+
 
 class SorteadorMegaSena:
     """
@@ -14,49 +178,380 @@ class SorteadorMegaSena:
     MAX_NUMBER = 60
     COMBINATION_SIZE = 6
 
-    def __init__(self, historical_results: List[List[int]] = None):
+    def __init__(
+        self, 
+        historical_results: List[List[int]] = None, 
+        draw_store: DrawStore = None,
+        cache: StatisticsCache = None,
+        seed: int = None,
+        instrument: bool = False
+    ):
         """
         Initialize the number generator with historical draw results.
         
         Args:
             historical_results (List[List[int]], optional): Past lottery draw numbers. 
-            Defaults to end-of-year draws from 2009 to 2023.
+            draw_store (DrawStore, optional): Memory-mapped draw history to use 
+                when historical_results is not given. Defaults to the store 
+                shipped at HistoricoSorteios.DEFAULT_PATH.
+            cache (StatisticsCache, optional): On-disk cache of the derived 
+                statistics. When given, they are memory-mapped from the cache 
+                if this history was seen before, or computed and stored.
+            seed (int, optional): Root seed of the generator's own random 
+                stream. Equal seeds give identical output; None seeds from 
+                the operating system.
+            instrument (bool): Collect counters and timings from the start 
+                (see enable_instrumentation)
         """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.instrumentation = None
+        if instrument:
+            self.enable_instrumentation()
+        
         if historical_results is None:
-            historical_results = [
-            [01, 17, 19, 29, 50, 57],  # 2024
-            [21, 24, 33, 41, 45, 56],  # 2023
-            [4, 5, 10, 34, 58, 59],    # 2022
-            [12, 15, 23, 32, 33, 46],  # 2021
-            [17, 20, 22, 35, 41, 42],  # 2020
-            [3, 35, 38, 40, 57, 58],   # 2019
-            [5, 10, 12, 18, 25, 33],   # 2018
-            [3, 6, 10, 17, 34, 37],    # 2017
-            [5, 11, 22, 24, 51, 53],   # 2016
-            [2, 18, 31, 42, 51, 56],   # 2015
-            [1, 5, 11, 16, 20, 56],    # 2014
-            [20, 30, 36, 38, 47, 53],  # 2013
-            [14, 32, 33, 36, 41, 52],  # 2012
-            [3, 4, 29, 36, 45, 55],    # 2011
-            [2, 10, 34, 37, 43, 50],   # 2010
-            [10, 27, 40, 46, 49, 58]   # 2009
-            ]
+            self.draw_store = draw_store if draw_store is not None else DrawStore()
+            self.historical_numbers = self.draw_store.numbers
+        else:
+            self._validate_historical_results(historical_results)
+            self.draw_store = None
+            self.historical_numbers = array(
+                'B', (num for results in historical_results for num in sorted(results))
+            )
+        
+        self.all_numbers = list(range(self.MIN_NUMBER, self.MAX_NUMBER + 1))
         
-        self._validate_historical_results(historical_results)
+        with timed(self.instrumentation, 'statistics'):
+            cached = cache.load(self.historical_numbers) if cache is not None else None
+            if cached is not None:
+                self.frequencies, self._cooccurrences = cached
+            else:
+                self.frequencies = FrequencyTable(self.historical_numbers)
+                self._cooccurrences = None
+                if cache is not None:
+                    cache.store(self.historical_numbers, self.frequencies, self.cooccurrences)
+            self._delays = None
+            if self.draw_store is not None:
+                self.contest_index = ContestIndex(
+                    self.historical_numbers, self.draw_store.contests, self.draw_store.dates
+                )
+            else:
+                self.contest_index = ContestIndex(self.historical_numbers)
+            # Part of the initial build: 'refresh' only times the rebuilds
+            type(self)._refresh_statistics(self)
+
+    @property
+    def cooccurrences(self) -> CooccurrenceTable:
+        """
+        Pair and triple co-occurrence counts of the history.
         
-        all_numbers_flat = [num for results in historical_results for num in results]
+        Built on first access (generation does not need them) and then kept 
+        up to date by add_draw / remove_draw.
+        """
+        if self._cooccurrences is None:
+            self._cooccurrences = CooccurrenceTable(self.historical_numbers)
+        return self._cooccurrences
+
+    @property
+    def delays(self) -> DelayTable:
+        """
+        Delays and recent-window counts of the history.
         
-        number_counts = Counter(all_numbers_flat)
+        Built on first access (only the 'hot', 'cold' and 'overdue' 
+        strategies need them) and then kept up to date by add_draw.
+        """
+        if self._delays is None:
+            self._delays = DelayTable(self.historical_numbers)
+        return self._delays
+
+    @property
+    def hot_numbers(self) -> List[int]:
+        """The TREND_POOL_SIZE numbers most drawn in the last TREND_WINDOW contests."""
+        return self.delays.hottest(TREND_POOL_SIZE, TREND_WINDOW)
+
+    @property
+    def cold_numbers(self) -> List[int]:
+        """The TREND_POOL_SIZE numbers least drawn in the last TREND_WINDOW contests."""
+        return self.delays.coldest(TREND_POOL_SIZE, TREND_WINDOW)
+
+    @property
+    def overdue_numbers(self) -> List[int]:
+        """The TREND_POOL_SIZE numbers with the longest current delay."""
+        return self.delays.most_overdue(TREND_POOL_SIZE)
+
+    def enable_instrumentation(self, count_rng_draws: bool = False) -> Instrumentation:
+        """
+        Start collecting counters and timings, read back through stats().
         
-        self.most_frequent_numbers = [
-            num for num, count in number_counts.most_common(self.COMBINATION_SIZE)
-        ]
+        generate_batch, generate_parallel, analyze_combinations and the 
+        statistics refresh are shadowed on this instance by timed wrappers; 
+        the class methods are untouched, so generators without 
+        instrumentation dispatch exactly as before.
         
-        self.least_frequent_numbers = [
-            num for num, count in number_counts.most_common()[:-7:-1]
-        ]
+        Args:
+            count_rng_draws (bool): Also count raw random draws. Replaces 
+                self.rng with an Instrumentacao.CountingRandom in the same 
+                state, so the output does not change, but every draw then 
+                costs an extra Python call.
         
-        self.all_numbers = list(range(self.MIN_NUMBER, self.MAX_NUMBER + 1))
+        Returns:
+            The new Instrumentation, replacing any previous one
+        """
+        self.disable_instrumentation()
+        rng = None
+        if count_rng_draws:
+            rng = CountingRandom()
+            rng.setstate(self.rng.getstate())
+            self.rng = rng
+        instrumentation = self.instrumentation = Instrumentation(rng)
+        cls = type(self)
+        clock = time.perf_counter
+        
+        def generate_batch(method='mixed', num_combinations=5, unique=False, constraints=None):
+            start = clock()
+            batch = cls.generate_batch(self, method, num_combinations, unique, constraints)
+            instrumentation.record_generation(method, num_combinations, clock() - start)
+            return batch
+        
+        def generate_parallel(method='mixed', num_combinations=5, workers=None, executor=None, constraints=None):
+            start = clock()
+            batch = cls.generate_parallel(self, method, num_combinations, workers, executor, constraints)
+            instrumentation.record_generation(method, num_combinations, clock() - start)
+            return batch
+        
+        def analyze_combinations(combinations):
+            start = clock()
+            analysis = cls.analyze_combinations(self, combinations)
+            instrumentation.record('analyze', clock() - start)
+            return analysis
+        
+        def refresh_statistics():
+            start = clock()
+            cls._refresh_statistics(self)
+            instrumentation.record('refresh', clock() - start)
+        
+        self.generate_batch = generate_batch
+        self.generate_parallel = generate_parallel
+        self.analyze_combinations = analyze_combinations
+        self._refresh_statistics = refresh_statistics
+        return instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """Stop collecting and restore the plain methods and random stream."""
+        for name in ('generate_batch', 'generate_parallel', 'analyze_combinations', '_refresh_statistics'):
+            self.__dict__.pop(name, None)
+        if isinstance(self.rng, CountingRandom):
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+            self.rng = rng
+        self.instrumentation = None
+
+    def stats(self) -> Dict[str, any]:
+        """
+        Return a snapshot of the instrumentation counters.
+        
+        Returns:
+            {'enabled': False} without instrumentation; otherwise 
+            'enabled': True plus the fields of Instrumentation.stats: 
+            per-method calls and tickets, per-operation timings ('generate', 
+            'analyze', 'statistics' for the initial build and 'refresh' for 
+            the rebuilds after add_draw / remove_draw) and rng_draws
+        """
+        if self.instrumentation is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.instrumentation.stats()}
+
+    def start_stats_dump(
+        self, 
+        interval: float = DEFAULT_DUMP_INTERVAL, 
+        path: str = None, 
+        logger=None
+    ) -> StatsDumper:
+        """
+        Write stats() snapshots periodically from a background thread.
+        
+        Enables instrumentation if needed. Call stop() on the returned 
+        dumper (or use it as a context manager) to end the dump.
+        
+        Args:
+            interval (float): Seconds between snapshots
+            path (str, optional): File the JSON lines are appended to; 
+                logged through logging otherwise
+            logger (logging.Logger, optional): Logger used without a path
+        
+        Returns:
+            The running Instrumentacao.StatsDumper
+        """
+        if self.instrumentation is None:
+            self.enable_instrumentation()
+        return StatsDumper(self.stats, interval, path, logger).start()
+
+    def _refresh_statistics(self) -> None:
+        """
+        Rebuild the tables derived from the frequency counts.
+        
+        Costs O(MAX_NUMBER) regardless of the history size. New objects are 
+        built first and then swapped in, so concurrent generation always 
+        sees a consistent set. The outcome tables of the pool strategies 
+        are dropped and rebuilt on their next use.
+        """
+        self.most_frequent_numbers = self.frequencies.most_frequent(self.COMBINATION_SIZE)
+        self.least_frequent_numbers = self.frequencies.least_frequent(self.COMBINATION_SIZE)
+        self._build_alias_tables(self.frequencies.counts)
+        self._outcome_tables = {}
+
+    def _outcome_table(self, method: str) -> List[bytes]:
+        """
+        Return the distinct tickets a pool strategy draws from.
+        
+        Built on first use after each refresh and then reused, so a call 
+        only pays for drawing its rows.
+        
+        Raises:
+            ValueError: If the strategy's pool is too small for a ticket
+        """
+        tables = self._outcome_tables
+        table = tables.get(method)
+        if table is None:
+            if method == 'mixed':
+                table = _mixed_table(
+                    self.most_frequent_numbers, self.least_frequent_numbers, self.COMBINATION_SIZE
+                )
+            else:
+                pool = {
+                    'most_frequent': self.most_frequent_numbers,
+                    'least_frequent': self.least_frequent_numbers,
+                    'hot': self.hot_numbers,
+                    'cold': self.cold_numbers,
+                    'overdue': self.overdue_numbers,
+                }[method]
+                table = _subset_table(pool, self.COMBINATION_SIZE)
+            tables[method] = table
+        return table
+
+    def _build_alias_tables(self, number_counts: Sequence[int]) -> None:
+        """
+        Build the alias tables of the frequency-weighted strategies.
+        
+        'weighted' draws numbers in proportion to their historical count; 
+        'inverse_weighted' in proportion to 1 / (count + 1), so numbers never 
+        drawn are the most likely.
+        
+        Args:
+            number_counts (Sequence[int]): Historical count of each number, 
+                indexed by number
+        """
+        counts = [number_counts[num] for num in self.all_numbers]
+        self._weighted_support = {
+            'weighted': sum(1 for count in counts if count > 0),
+            'inverse_weighted': len(counts),
+        }
+        self._alias_tables = {
+            'weighted': AliasTable(self.all_numbers, counts) if any(counts) else None,
+            'inverse_weighted': AliasTable(self.all_numbers, [1 / (count + 1) for count in counts]),
+        }
+
+    def add_draw(self, draw: Sequence[int], contest: int = None, draw_date: date = None) -> None:
+        """
+        Take in a newly published draw without rebuilding the generator.
+        
+        Updates the counts, the delays and recent-window counts, the contest 
+        index, the most / least frequent, hot, cold and overdue numbers and 
+        the alias tables in time independent of the history size. The draw 
+        store on disk is not modified; use DrawStore.append for that.
+        
+        Args:
+            draw (Sequence[int]): The six drawn numbers
+            contest (int, optional): Contest number. Defaults to the next one.
+            draw_date (date, optional): Draw date; required when the history 
+                comes from a DrawStore, whose contests are dated
+        
+        Raises:
+            ValueError: If the draw is invalid, the contest out of order or 
+                the draw date missing or out of order
+        """
+        self._validate_historical_results([draw])
+        self.contest_index.append(draw, contest, draw_date)
+        if not isinstance(self.historical_numbers, array):
+            self.historical_numbers = array('B', self.historical_numbers)
+        self.historical_numbers.extend(sorted(draw))
+        self.frequencies.add(draw)
+        if self._delays is not None:
+            self._delays.add(draw)
+        if self._cooccurrences is not None:
+            self._cooccurrences.add(draw)
+        self._refresh_statistics()
+
+    def remove_draw(self, draw: Sequence[int]) -> None:
+        """
+        Remove the most recent draw, undoing the last add_draw.
+        
+        Only the last contest can be removed: the delays and the contest 
+        index depend on the order of the contests, and stepping them back 
+        from the end keeps the cost independent of the history size, like 
+        add_draw. Remove draws one at a time, newest first, to go further 
+        back.
+        
+        Args:
+            draw (Sequence[int]): The six numbers of the last draw in the 
+                history, as a check against removing the wrong one
+        
+        Raises:
+            ValueError: If the history is empty or its last draw is not 
+                `draw`
+        """
+        row = sorted(draw)
+        last = list(self.historical_numbers[-self.COMBINATION_SIZE:])
+        if not last or sorted(last) != row:
+            raise ValueError(f"Draw {list(draw)} is not the last draw in the history")
+        
+        if not isinstance(self.historical_numbers, array):
+            self.historical_numbers = array('B', self.historical_numbers)
+        del self.historical_numbers[-self.COMBINATION_SIZE:]
+        self.frequencies.remove(row)
+        self.contest_index.remove_last()
+        if self._delays is not None:
+            self._delays.remove_last()
+        if self._cooccurrences is not None:
+            self._cooccurrences.remove(row)
+        self._refresh_statistics()
+
+    def range_statistics(
+        self, 
+        first_contest: int = None, 
+        last_contest: int = None,
+        start_date: date = None,
+        end_date: date = None,
+        k: int = COMBINATION_SIZE
+    ) -> Dict[str, any]:
+        """
+        Frequencies over a range of contests, e.g. one year.
+        
+        Read off the prefix sums of the contest index in O(MAX_NUMBER), 
+        whatever the size of the range. Bounds are inclusive and may be 
+        combined; omitted ones leave that side open.
+        
+        Args:
+            first_contest (int, optional): First contest number included
+            last_contest (int, optional): Last contest number included
+            start_date (date, optional): Earliest draw date included
+            end_date (date, optional): Latest draw date included
+            k (int): Size of the most / least frequent sets
+        
+        Returns:
+            IndiceConcursos.ContestIndex.summary of the range: draws, first 
+            and last contest and date, per-number counts and the k most / 
+            least frequent numbers
+        
+        Raises:
+            ValueError: If dates are given and the history has none
+        """
+        index = self.contest_index
+        start, stop = index.contest_positions(first_contest, last_contest)
+        if start_date is not None or end_date is not None:
+            date_start, date_stop = index.date_positions(start_date, end_date)
+            start, stop = max(start, date_start), min(stop, date_stop)
+        return index.summary(start, stop, k)
 
     def _validate_historical_results(self, results: List[List[int]]) -> None:
         """
@@ -80,89 +575,479 @@ class SorteadorMegaSena:
 
     def generate_combinations(
         self, 
-        method: Literal['most_frequent', 'least_frequent', 'mixed', 'random'] = 'mixed', 
-        num_combinations: int = 5
-    ) -> List[List[int]]:
+        method: GenerationMethod = 'mixed', 
+        num_combinations: int = 5,
+        as_ranks: bool = False,
+        unique: bool = False,
+        constraints: Constraints = None
+    ) -> Union[List[List[int]], array]:
         """
         Generate lottery number combinations using specified strategy.
         
+        Thin wrapper over generate_batch that unpacks the compact batch 
+        into lists of numbers.
+        
         Args:
             method (str): Strategy for number selection
             num_combinations (int): Number of combinations to generate
+            as_ranks (bool): Return a compact array of combination ranks
+                (see IndiceCombinacoes) instead of lists of numbers
+            unique (bool): Guarantee that no combination is repeated
+            constraints (Constraints, optional): Only produce combinations 
+                passing these filters (see generate_batch)
         
         Returns:
-            List of number combinations
+            List of number combinations, or an array of ranks if as_ranks is set
         
         Raises:
-            ValueError: If an invalid method is provided
+            ValueError: If an invalid method is provided, or if unique is set 
+                and the method cannot produce that many distinct combinations
+        """
+        batch = self.generate_batch(
+            method=method, 
+            num_combinations=num_combinations, 
+            unique=unique,
+            constraints=constraints
+        )
+        
+        if as_ranks:
+            return rank_rows(batch)
+        
+        return [list(row) for row in iter_rows(batch)]
+
+    def generate_batch(
+        self, 
+        method: GenerationMethod = 'mixed', 
+        num_combinations: int = 5,
+        unique: bool = False,
+        constraints: Constraints = None
+    ) -> array:
+        """
+        Generate many combinations at once as a compact byte matrix.
+        
+        Each strategy draws whole tickets from a precomputed table of its 
+        possible outcomes with a single bulk rng.choices call, so there is 
+        no per-ticket sampling or sorting in Python; the tables are cached 
+        until add_draw / remove_draw changes the statistics. The weighted strategies 
+        draw numbers in bulk from alias tables cached at construction. 'hot', 
+        'cold' and 'overdue' use pools of TREND_POOL_SIZE numbers read off 
+        the delay and recent-window vectors of Atrasos.DelayTable, which 
+        add_draw keeps up to date, so no history is rescanned per call.
+        
+        With unique set, tickets are instead sampled without replacement over 
+        the indices of the strategy's candidate space (its outcome table, or 
+        the combination ranks for 'random') with a sparse Fisher-Yates 
+        shuffle, in O(num_combinations) time with no rejection loop. The 
+        weighted strategies have no enumerable outcome table and skip 
+        repeated tickets instead.
+        
+        With constraints set, the outcome tables are filtered before 
+        drawing, and 'random' samples uniformly from the feasible 
+        combinations through Restricoes.ConstrainedSampler, so tight 
+        constraints cost no more than loose ones. The weighted strategies 
+        do not support constraints.
+        
+        Args:
+            method (str): Strategy for number selection
+            num_combinations (int): Number of combinations to generate
+            unique (bool): Guarantee that no combination is repeated
+            constraints (Constraints, optional): Filters every combination 
+                must pass (sum range, odd count, per-decade maximum, longest run)
+        
+        Returns:
+            Contiguous array('B') of num_combinations * COMBINATION_SIZE bytes, 
+            row-major, with each row sorted in ascending order
+        
+        Raises:
+            ValueError: If an invalid method is provided, if unique is set 
+                and the method cannot produce that many distinct combinations, 
+                or if no combination of the method passes the constraints
         """
         if num_combinations < 1:
             raise ValueError("Number of combinations must be at least 1")
         
         method_map = {
-            'most_frequent': self._generate_most_frequent_combination,
-            'least_frequent': self._generate_least_frequent_combination,
-            'mixed': self._generate_mixed_combination,
-            'random': self._generate_random_combination
+            'most_frequent': self._generate_most_frequent_batch,
+            'least_frequent': self._generate_least_frequent_batch,
+            'mixed': self._generate_mixed_batch,
+            'random': self._generate_random_batch,
+            'weighted': self._generate_weighted_batch,
+            'inverse_weighted': self._generate_inverse_weighted_batch,
+            'hot': self._generate_hot_batch,
+            'cold': self._generate_cold_batch,
+            'overdue': self._generate_overdue_batch
         }
         
         if method not in method_map:
             raise ValueError(f"Invalid method. Choose from {list(method_map.keys())}")
         
-        return [
-            sorted(method_map[method]())
-            for _ in range(num_combinations)
+        return array('B', b''.join(method_map[method](num_combinations, unique, constraints)))
+
+    def generate_tickets(
+        self, 
+        method: GenerationMethod = 'mixed', 
+        num_combinations: int = 5,
+        unique: bool = False,
+        constraints: Constraints = None
+    ) -> TicketArray:
+        """
+        Generate combinations as a Bilhetes.TicketArray of 60-bit masks.
+        
+        Same arguments and errors as generate_batch.
+        
+        Returns:
+            TicketArray with 8 bytes per combination
+        """
+        return TicketArray.from_rows(self.generate_batch(method, num_combinations, unique, constraints))
+
+    def iter_batches(
+        self, 
+        method: GenerationMethod = 'mixed', 
+        num_combinations: int = 5,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        constraints: Constraints = None
+    ) -> Iterator[array]:
+        """
+        Generate combinations lazily, one compact batch at a time.
+        
+        Memory use is bounded by chunk_size however many combinations are 
+        requested; pair with ExportarBilhetes.write_tickets or 
+        CombinationAnalyzer.consume to stream them.
+        
+        Args:
+            method (str): Strategy for number selection
+            num_combinations (int): Total number of combinations to generate
+            chunk_size (int): Maximum combinations per yielded batch
+            constraints (Constraints, optional): Filters, as in generate_batch
+        
+        Returns:
+            Iterator of array('B') batches as returned by generate_batch
+        
+        Raises:
+            ValueError: If an invalid method is provided
+        """
+        if num_combinations < 1:
+            raise ValueError("Number of combinations must be at least 1")
+        
+        remaining = num_combinations
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield self.generate_batch(method=method, num_combinations=size, constraints=constraints)
+            remaining -= size
+
+    def generate_parallel(
+        self, 
+        method: GenerationMethod = 'mixed', 
+        num_combinations: int = 5,
+        workers: int = None,
+        executor: Executor = None,
+        constraints: Constraints = None
+    ) -> array:
+        """
+        Generate a large batch across worker processes.
+        
+        The request is split into one contiguous share per worker and share 
+        i is drawn from its own child stream, child_seed(root, i), where the 
+        root is drawn from the generator's own stream. Shares never share 
+        random state, so throughput scales with the cores; successive calls 
+        differ, like generate_batch, and the sequence of outputs is 
+        bit-identical for a given constructor seed and worker count, 
+        whatever the scheduling.
+        
+        Args:
+            method (str): Strategy for number selection
+            num_combinations (int): Number of combinations to generate
+            workers (int, optional): Number of shares. Defaults to the CPU count.
+            executor (Executor, optional): Pool to run the shares on, e.g. 
+                one kept alive across calls. Defaults to a new 
+                ProcessPoolExecutor.
+            constraints (Constraints, optional): Filters, as in generate_batch
+        
+        Returns:
+            array('B') laid out as in generate_batch, shares in worker order
+        
+        Raises:
+            ValueError: If an invalid method is provided
+        """
+        if num_combinations < 1:
+            raise ValueError("Number of combinations must be at least 1")
+        if method not in METHODS:
+            raise ValueError(f"Invalid method. Choose from {list(METHODS)}")
+        
+        workers = workers or os.cpu_count() or 1
+        root_seed = self.rng.getrandbits(128)
+        history = bytes(self.historical_numbers)
+        bounds = [num_combinations * share // workers for share in range(workers + 1)]
+        jobs = [
+            (history, method, high - low, child_seed(root_seed, share), constraints)
+            for share, (low, high) in enumerate(zip(bounds, bounds[1:]))
+            if high > low
         ]
+        
+        if executor is not None:
+            shares = list(executor.map(_generate_share, jobs))
+        elif len(jobs) == 1:
+            shares = [_generate_share(jobs[0])]
+        else:
+            # Imported here: multiprocessing roughly doubles the import time
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                shares = list(pool.map(_generate_share, jobs))
+        return array('B', b''.join(shares))
+
+    def generate_wheel(
+        self, 
+        pool: Sequence[int], 
+        guarantee: int = 4, 
+        drawn: int = 6,
+        restarts: int = DEFAULT_RESTARTS,
+        workers: int = None
+    ) -> array:
+        """
+        Design a small ticket set with a "t if m" guarantee over a pool.
+        
+        E.g. pool = 15 chosen numbers, guarantee = 4, drawn = 6: if the six 
+        drawn numbers are all in the pool, some ticket hits a quadra. See 
+        Fechamentos.design_wheel; restarts are seeded from the generator's 
+        stream, and Fechamentos.verify_wheel checks the result.
+        
+        Args:
+            pool (Sequence[int]): Chosen numbers
+            guarantee (int): Matches t guaranteed on at least one ticket
+            drawn (int): Drawn numbers m that must fall in the pool
+            restarts (int): Independent randomized runs; the smallest wins
+            workers (int, optional): Worker processes. Defaults to the CPU count.
+        
+        Returns:
+            array('B') of sorted tickets, laid out as in generate_batch
+        
+        Raises:
+            ValueError: If the pool or the guarantee is invalid
+        """
+        root_seed = self.rng.getrandbits(128)
+        return design_wheel(pool, guarantee, drawn, restarts=restarts, workers=workers, seed=root_seed)
 
-    def _generate_most_frequent_combination(self) -> List[int]:
-        """Generate a combination using the most frequent numbers"""
-        return random.sample(self.most_frequent_numbers, self.COMBINATION_SIZE)
+    def _generate_most_frequent_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations using the most frequent numbers"""
+        table = self._outcome_table('most_frequent')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
 
-    def _generate_least_frequent_combination(self) -> List[int]:
-        """Generate a combination using the least frequent numbers"""
-        return random.sample(self.least_frequent_numbers, self.COMBINATION_SIZE)
+    def _generate_least_frequent_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations using the least frequent numbers"""
+        table = self._outcome_table('least_frequent')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
 
-    def _generate_mixed_combination(self) -> List[int]:
-        """Generate a mixed combination of most and least frequent numbers"""
-        combination = (
-            random.sample(self.most_frequent_numbers, self.COMBINATION_SIZE // 2) + 
-            random.sample(self.least_frequent_numbers, self.COMBINATION_SIZE // 2)
-        )
-        random.shuffle(combination)
-        return combination
+    def _generate_mixed_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate mixed combinations of most and least frequent numbers"""
+        table = self._outcome_table('mixed')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
+
+    def _generate_hot_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations from the numbers most drawn in the last TREND_WINDOW contests"""
+        table = self._outcome_table('hot')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
+
+    def _generate_cold_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations from the numbers least drawn in the last TREND_WINDOW contests"""
+        table = self._outcome_table('cold')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
+
+    def _generate_overdue_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations from the numbers with the longest current delay"""
+        table = self._outcome_table('overdue')
+        return _draw_rows(_filter_table(table, constraints), num_combinations, unique, self.rng)
 
-    def _generate_random_combination(self) -> List[int]:
-        """Generate a completely random combination"""
-        return random.sample(self.all_numbers, self.COMBINATION_SIZE)
+    def _generate_random_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate completely random combinations"""
+        if constraints is not None:
+            return constrained_sampler(constraints).sample(num_combinations, unique, self.rng)
+        
+        if unique:
+            if num_combinations > TOTAL_COMBINATIONS:
+                raise ValueError(
+                    f"Cannot generate {num_combinations} distinct combinations: "
+                    f"only {TOTAL_COMBINATIONS} exist"
+                )
+            return [
+                bytes(unrank_combination(rank))
+                for rank in sample_indices(TOTAL_COMBINATIONS, num_combinations, self.rng)
+            ]
+        
+        rng = self.rng
+        if num_combinations < SMALL_RANDOM_BATCH:
+            randrange = rng.randrange
+            return [bytes(unrank_combination(randrange(TOTAL_COMBINATIONS))) for _ in range(num_combinations)]
+        
+        compositions, cum_weights, block_tables = _uniform_block_tables()
+        rows = []
+        for index, count in Counter(
+            rng.choices(range(len(compositions)), cum_weights=cum_weights, k=num_combinations)
+        ).items():
+            parts = [
+                rng.choices(block_tables[block][size], k=count)
+                for block, size in enumerate(compositions[index])
+            ]
+            rows.extend(map(b''.join, zip(*parts)))
+        # Rows come out grouped by composition; restore exchangeable order
+        rng.shuffle(rows)
+        return rows
+
+    def _generate_weighted_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations drawing numbers in proportion to their frequency"""
+        return self._draw_weighted_rows('weighted', num_combinations, unique, constraints)
+
+    def _generate_inverse_weighted_batch(
+        self, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """Generate combinations favoring the least drawn numbers"""
+        return self._draw_weighted_rows('inverse_weighted', num_combinations, unique, constraints)
+
+    def _draw_weighted_rows(
+        self, 
+        method: str, 
+        num_combinations: int, 
+        unique: bool, 
+        constraints: Constraints = None
+    ) -> List[bytes]:
+        """
+        Draw combinations from a strategy's alias table, without replacement.
+        
+        Numbers are drawn in bulk from the alias table and a number already 
+        in the current ticket is skipped, which is exactly successive 
+        weighted sampling without replacement. Cost per ticket does not 
+        depend on the size of the history.
+        
+        With unique set, repeated tickets are rejected and redrawn, up to 
+        MAX_DRAWS_PER_UNIQUE tickets per requested one: weights concentrated 
+        on a few numbers can make new combinations too rare to find.
+        
+        Raises:
+            ValueError: If fewer than COMBINATION_SIZE numbers have a positive 
+                weight, if unique is set and the space is too small or too 
+                few distinct combinations turn up within the attempts, or if 
+                constraints are given
+        """
+        if constraints is not None:
+            raise ValueError(f"The {method} method does not support constraints")
+        support = self._weighted_support[method]
+        if support < self.COMBINATION_SIZE:
+            raise ValueError("Sample larger than population or is negative")
+        if unique and num_combinations > binomial(support, self.COMBINATION_SIZE):
+            raise ValueError(
+                f"Cannot generate {num_combinations} distinct combinations: "
+                f"this method only has {binomial(support, self.COMBINATION_SIZE)} possible combinations"
+            )
+        
+        table = self._alias_tables[method]
+        rows = []
+        seen = set()
+        current = set()
+        attempts = 0
+        max_attempts = MAX_DRAWS_PER_UNIQUE * num_combinations
+        while len(rows) < num_combinations:
+            if unique and attempts >= max_attempts:
+                raise ValueError(
+                    f"Found only {len(rows)} of {num_combinations} distinct combinations "
+                    f"in {max_attempts} tickets drawn: the {method} method's weights repeat "
+                    f"the same combinations too often; request fewer or drop unique"
+                )
+            for num in table.sample((num_combinations - len(rows)) * (self.COMBINATION_SIZE + 1), self.rng):
+                current.add(num)
+                if len(current) < self.COMBINATION_SIZE:
+                    continue
+                row = bytes(sorted(current))
+                current = set()
+                attempts += 1
+                if unique:
+                    if attempts > max_attempts:
+                        break
+                    if row in seen:
+                        continue
+                    seen.add(row)
+                rows.append(row)
+                if len(rows) == num_combinations:
+                    break
+        return rows
 
-    def analyze_combinations(self, combinations: List[List[int]]) -> Dict[str, any]:
+    def analyze_combinations(
+        self, 
+        combinations: Union[List[List[int]], Sequence[int]]
+    ) -> Dict[str, any]:
         """
         Provide basic analysis of generated combinations.
         
+        For chunked or streamed input use AnalisadorCombinacoes.CombinationAnalyzer 
+        directly; this is a one-shot wrapper over it.
+        
         Args:
-            combinations (List[List[int]]): List of number combinations to analyze
+            combinations (List[List[int]] | Sequence[int]): List of number 
+                combinations to analyze, a batch from generate_batch, or a 
+                sequence of combination ranks
         
         Returns:
             Dictionary with analysis details
         """
-        if not combinations:
-            return {
-                'total_combinations': 0,
-                'unique_combinations': 0,
-                'frequency_analysis': {}
-            }
-        
-        analysis = {
-            'total_combinations': len(combinations),
-            'unique_combinations': len(set(tuple(combo) for combo in combinations)),
-            'frequency_analysis': {}
-        }
-        
-        all_numbers_generated = [num for combo in combinations for num in combo]
+        if not isinstance(combinations, array) and combinations and isinstance(combinations[0], int):
+            combinations = array(RANK_TYPECODE, combinations)
         
-        for num in range(self.MIN_NUMBER, self.MAX_NUMBER + 1):
-            count = all_numbers_generated.count(num)
-            if count > 0:
-                analysis['frequency_analysis'][num] = count
-        
-        return analysis
+        return CombinationAnalyzer().update(combinations).result()
+
+
+def _generate_share(job) -> bytes:
+    """
+    Generate one share of SorteadorMegaSena.generate_parallel (runs inside 
+    a worker process).
+    
+    Args:
+        job: Flat history numbers, strategy, number of combinations, 
+            child seed and constraints
+    
+    Returns:
+        Packed rows of the share
+    """
+    history, method, num_combinations, seed, constraints = job
+    generator = SorteadorMegaSena(historical_results=list(iter_rows(history)), seed=seed)
+    return generator.generate_batch(method, num_combinations, constraints=constraints).tobytes()
@@ -0,0 +1,298 @@
+"""
+Historical Mega-Sena draw store.
+
+Draws are kept in a compact columnar binary file that is memory-mapped at
+load, so opening the full history costs a few syscalls regardless of its
+size. Layout (little-endian):
+
+    header   : magic b'MSDS', version (u16), reserved (u16),
+               count (u32), capacity (u32)
+    contests : capacity x u32 contest numbers
+    dates    : capacity x u32 proleptic Gregorian ordinals
+    numbers  : capacity x 6 x u8 sorted drawn numbers
+
+Columns are preallocated up to `capacity`, so appending a new contest only
+writes its slots and the header count. The file is rewritten with twice
+the capacity when it fills up.
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, NamedTuple, Sequence
+
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'historico_megasena.bin')
+
+_MAGIC = b'MSDS'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHII')
+_MIN_CAPACITY = 64
+
+
+class Draw(NamedTuple):
+    """A single historical contest."""
+    contest: int
+    date: date
+    numbers: List[int]
+
+
+def _validate_draw(numbers: Sequence[int]) -> List[int]:
+    """
+    Validate a drawn combination and return it sorted.
+
+    Raises:
+        ValueError: If the draw is invalid
+    """
+    if len(numbers) != COMBINATION_SIZE:
+        raise ValueError(f"Each draw must have exactly {COMBINATION_SIZE} numbers")
+    if any(num < MIN_NUMBER or num > MAX_NUMBER for num in numbers):
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+    if len(set(numbers)) != len(numbers):
+        raise ValueError("No duplicate numbers allowed in a single draw")
+    return sorted(numbers)
+
+
+def _column_offsets(capacity: int):
+    """Return the byte offsets of the contest, date and number columns."""
+    contests = _HEADER.size
+    dates = contests + 4 * capacity
+    numbers = dates + 4 * capacity
+    return contests, dates, numbers
+
+
+def _column(buffer: memoryview, offset: int, count: int) -> memoryview:
+    """View `count` little-endian u32 values starting at `offset`."""
+    view = buffer[offset:offset + 4 * count]
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    swapped = array('I', view.tobytes())
+    swapped.byteswap()
+    return memoryview(swapped)
+
+
+class DrawStore:
+    """
+    Memory-mapped, append-only store of historical Mega-Sena draws.
+
+    Columns are exposed as read-only views: `contests` and `dates` (u32
+    ordinals) hold one value per draw, `numbers` is a flat row-major buffer
+    with COMBINATION_SIZE sorted numbers per draw.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Open an existing draw store.
+
+        Args:
+            path (str): Path of the store file
+
+        Raises:
+            ValueError: If the file is not a draw store
+        """
+        self.path = path
+        self._load()
+
+    @classmethod
+    def create(cls, path: str, draws: Iterable[Draw] = (), capacity: int = _MIN_CAPACITY) -> 'DrawStore':
+        """
+        Create (or overwrite) a store file holding the given draws.
+
+        Args:
+            path (str): Path of the store file
+            draws (Iterable[Draw]): Draws in ascending contest order
+            capacity (int): Minimum number of preallocated draw slots
+
+        Returns:
+            The opened store
+        """
+        draws = list(draws)
+        _write_store(path, draws, max(capacity, _MIN_CAPACITY, 2 * len(draws)))
+        return cls(path)
+
+    def _load(self) -> None:
+        """Memory-map the store file and build the column views."""
+        with open(self.path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self._mmap)
+        magic, version, _, count, capacity = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not a draw store (version {_VERSION})")
+
+        contests_offset, dates_offset, numbers_offset = _column_offsets(capacity)
+        self._capacity = capacity
+        self.contests = _column(buffer, contests_offset, count)
+        self.dates = _column(buffer, dates_offset, count)
+        self.numbers = buffer[numbers_offset:numbers_offset + COMBINATION_SIZE * count]
+
+    def __len__(self) -> int:
+        return len(self.contests)
+
+    def __getitem__(self, index: int) -> Draw:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("draw index out of range")
+        start = index * COMBINATION_SIZE
+        return Draw(
+            self.contests[index],
+            date.fromordinal(self.dates[index]),
+            list(self.numbers[start:start + COMBINATION_SIZE])
+        )
+
+    def __iter__(self) -> Iterator[Draw]:
+        return (self[index] for index in range(len(self)))
+
+    def results(self) -> List[List[int]]:
+        """Return the drawn numbers of every contest, oldest first."""
+        numbers = self.numbers
+        return [
+            list(numbers[start:start + COMBINATION_SIZE])
+            for start in range(0, len(numbers), COMBINATION_SIZE)
+        ]
+
+    def append(self, contest: int, draw_date: date, numbers: Sequence[int]) -> None:
+        """
+        Append a newly published contest.
+
+        Only the new slots and the header count are written, unless the
+        preallocated capacity is exhausted and the file has to grow.
+
+        Args:
+            contest (int): Contest number, greater than the last stored one
+            draw_date (date): Date of the draw
+            numbers (Sequence[int]): The six drawn numbers
+
+        Raises:
+            ValueError: If the draw is invalid or out of order
+        """
+        numbers = _validate_draw(numbers)
+        count = len(self)
+        if count and contest <= self.contests[count - 1]:
+            raise ValueError(f"Contest {contest} must come after contest {self.contests[count - 1]}")
+
+        if count >= self._capacity:
+            _write_store(self.path, list(self) + [Draw(contest, draw_date, numbers)], 2 * self._capacity)
+        else:
+            contests_offset, dates_offset, numbers_offset = _column_offsets(self._capacity)
+            with open(self.path, 'r+b') as file:
+                file.seek(contests_offset + 4 * count)
+                file.write(struct.pack('<I', contest))
+                file.seek(dates_offset + 4 * count)
+                file.write(struct.pack('<I', draw_date.toordinal()))
+                file.seek(numbers_offset + COMBINATION_SIZE * count)
+                file.write(bytes(numbers))
+                file.seek(0)
+                file.write(_HEADER.pack(_MAGIC, _VERSION, 0, count + 1, self._capacity))
+        self._load()
+
+    def extend(self, draws: Iterable[Draw]) -> None:
+        """
+        Append several contests, rewriting the file at most once.
+
+        Args:
+            draws (Iterable[Draw]): New draws in ascending contest order
+        """
+        draws = list(self) + [Draw(d.contest, d.date, _validate_draw(d.numbers)) for d in draws]
+        for previous, current in zip(draws, draws[1:]):
+            if current.contest <= previous.contest:
+                raise ValueError(f"Contest {current.contest} must come after contest {previous.contest}")
+        _write_store(self.path, draws, max(self._capacity, 2 * len(draws)))
+        self._load()
+
+
+def _write_store(path: str, draws: List[Draw], capacity: int) -> None:
+    """Write a complete store file atomically."""
+    contests = array('I', [0] * capacity)
+    dates = array('I', [0] * capacity)
+    numbers = bytearray(COMBINATION_SIZE * capacity)
+    for index, draw in enumerate(draws):
+        contests[index] = draw.contest
+        dates[index] = draw.date.toordinal()
+        start = index * COMBINATION_SIZE
+        numbers[start:start + COMBINATION_SIZE] = bytes(_validate_draw(draw.numbers))
+    if sys.byteorder != 'little':
+        contests.byteswap()
+        dates.byteswap()
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(draws), capacity))
+        file.write(contests.tobytes())
+        file.write(dates.tobytes())
+        file.write(numbers)
+    os.replace(temporary, path)
+
+
+def parse_date(text: str) -> date:
+    """Parse a draw date in Caixa (dd/mm/yyyy) or ISO format."""
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {text!r}")
+
+
+def read_csv(path: str) -> List[Draw]:
+    """
+    Read draws from a results spreadsheet exported as CSV.
+
+    Expects the column order of the official Caixa results file:
+    contest, date, then the six numbers. Header rows and extra columns are
+    ignored; both ';' and ',' delimiters are accepted.
+
+    Args:
+        path (str): Path of the CSV file
+
+    Returns:
+        Draws sorted by contest number
+    """
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        sample = file.read(4096)
+        file.seek(0)
+        delimiter = ';' if sample.count(';') > sample.count(',') else ','
+        draws = [
+            Draw(int(row[0]), parse_date(row[1]), [int(num) for num in row[2:2 + COMBINATION_SIZE]])
+            for row in csv.reader(file, delimiter=delimiter)
+            if row and row[0].strip().isdigit()
+        ]
+    return sorted(draws, key=lambda draw: draw.contest)
+
+
+def main() -> None:
+    """Command line maintenance of the draw store."""
+    parser = argparse.ArgumentParser(description="Manutenção do histórico de sorteios da Mega-Sena")
+    parser.add_argument('--arquivo', default=DEFAULT_PATH, help="arquivo do histórico")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('importar', help="importa resultados de um CSV da Caixa")
+    import_parser.add_argument('csv')
+
+    add_parser = commands.add_parser('adicionar', help="adiciona um concurso")
+    add_parser.add_argument('concurso', type=int)
+    add_parser.add_argument('data', type=parse_date)
+    add_parser.add_argument('numeros', type=int, nargs=COMBINATION_SIZE)
+
+    commands.add_parser('listar', help="lista os concursos armazenados")
+
+    args = parser.parse_args()
+
+    if args.command == 'importar':
+        DrawStore.create(args.arquivo, read_csv(args.csv))
+    elif args.command == 'adicionar':
+        DrawStore(args.arquivo).append(args.concurso, args.data, args.numeros)
+    else:
+        for draw in DrawStore(args.arquivo):
+            print(f"{draw.contest} {draw.date:%d/%m/%Y} {' '.join(f'{num:02d}' for num in draw.numbers)}")
+
+
+if __name__ == '__main__':
+    main()
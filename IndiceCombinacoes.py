@@ -0,0 +1,291 @@
+"""
+Combinatorial index for Mega-Sena tickets.
+
+Maps every 6-of-60 combination to a single integer in
+[0, TOTAL_COMBINATIONS) using the colexicographic combinatorial number
+system, and back. A ranked ticket fits in a 4-byte unsigned int instead of
+a list of six Python ints.
+"""
+
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Sequence
+
+MIN_NUMBER = 1
+MAX_NUMBER = 60
+COMBINATION_SIZE = 6
+
+
+def _build_binomial_table() -> tuple:
+    """Build Pascal's triangle rows C(n, k) for k up to COMBINATION_SIZE."""
+    table = [[0] * (MAX_NUMBER + 1) for _ in range(COMBINATION_SIZE + 1)]
+    for n in range(MAX_NUMBER + 1):
+        table[0][n] = 1
+        for k in range(1, COMBINATION_SIZE + 1):
+            table[k][n] = table[k - 1][n - 1] + table[k][n - 1] if n > 0 else 0
+    return tuple(tuple(row) for row in table)
+
+
+# _BINOMIAL[k][n] == C(n, k) for 0 <= k <= COMBINATION_SIZE, 0 <= n <= MAX_NUMBER
+_BINOMIAL = _build_binomial_table()
+
+TOTAL_COMBINATIONS = _BINOMIAL[COMBINATION_SIZE][MAX_NUMBER]
+
+# _RANK_TERMS[k][num] is the rank contribution of num at sorted position k
+_RANK_TERMS = tuple(
+    (0,) + _BINOMIAL[k + 1][:MAX_NUMBER]
+    for k in range(COMBINATION_SIZE)
+)
+
+# _MASK_BITS[num] is the bitmask of a single number
+_MASK_BITS = (0,) + tuple(1 << (num - MIN_NUMBER) for num in range(MIN_NUMBER, MAX_NUMBER + 1))
+
+# Bytes of a 60-bit mask, and _MASK_BYTE_NUMBERS[i][value]: the numbers
+# encoded by `value` in byte i (little-endian) of a mask, as packed bytes
+MASK_BYTES = 8
+_MASK_BYTE_NUMBERS = tuple(
+    tuple(
+        bytes(MIN_NUMBER + 8 * i + bit for bit in range(8) if value >> bit & 1)
+        for value in range(256)
+    )
+    for i in range(MASK_BYTES)
+)
+
+# _BIT_TABLES[bit]: translate table mapping a byte to its bit `bit`
+_BIT_TABLES = tuple(bytes(value >> bit & 1 for value in range(256)) for bit in range(8))
+
+# Smallest unsigned typecode able to hold any rank (4 bytes on all mainstream platforms)
+RANK_TYPECODE = 'I' if array('I').itemsize >= 4 else 'L'
+
+
+def binomial(n: int, k: int) -> int:
+    """
+    Return C(n, k) from the precomputed table.
+
+    Args:
+        n (int): Population size, between 0 and MAX_NUMBER
+        k (int): Subset size, between 0 and COMBINATION_SIZE
+
+    Returns:
+        The binomial coefficient C(n, k)
+    """
+    return _BINOMIAL[k][n]
+
+
+def rank_combination(combination: Sequence[int]) -> int:
+    """
+    Map a combination to its colexicographic rank.
+
+    Args:
+        combination (Sequence[int]): Six distinct numbers between
+            MIN_NUMBER and MAX_NUMBER, in any order
+
+    Returns:
+        Integer rank in [0, TOTAL_COMBINATIONS)
+
+    Raises:
+        ValueError: If the combination is not a valid ticket
+    """
+    numbers = sorted(combination)
+    if len(numbers) != COMBINATION_SIZE:
+        raise ValueError(f"Each combination must have exactly {COMBINATION_SIZE} numbers")
+    if numbers[0] < MIN_NUMBER or numbers[-1] > MAX_NUMBER:
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+
+    rank = 0
+    previous = 0
+    for k, num in enumerate(numbers, 1):
+        if num == previous:
+            raise ValueError("No duplicate numbers allowed in a single combination")
+        rank += _BINOMIAL[k][num - 1]
+        previous = num
+    return rank
+
+
+def unrank_combination(rank: int) -> List[int]:
+    """
+    Map a rank back to its sorted combination.
+
+    Args:
+        rank (int): Integer rank in [0, TOTAL_COMBINATIONS)
+
+    Returns:
+        Sorted list of six numbers
+
+    Raises:
+        ValueError: If the rank is out of range
+    """
+    if not 0 <= rank < TOTAL_COMBINATIONS:
+        raise ValueError(f"Rank must be between 0 and {TOTAL_COMBINATIONS - 1}")
+
+    combination = [0] * COMBINATION_SIZE
+    upper = MAX_NUMBER
+    for k in range(COMBINATION_SIZE, 0, -1):
+        row = _BINOMIAL[k]
+        position = bisect_right(row, rank, 0, upper) - 1
+        combination[k - 1] = position + 1
+        rank -= row[position]
+        upper = position
+    return combination
+
+
+def rank_batch(combinations: Iterable[Sequence[int]]) -> array:
+    """
+    Rank many combinations at once.
+
+    Args:
+        combinations (Iterable[Sequence[int]]): Combinations to rank
+
+    Returns:
+        Compact array of ranks, one 4-byte unsigned int per combination
+    """
+    return array(RANK_TYPECODE, map(rank_combination, combinations))
+
+
+def rank_rows(batch: Sequence[int]) -> array:
+    """
+    Rank every ticket of a flat row-major batch of sorted numbers.
+
+    Faster than rank_batch for generated batches since rows are already
+    sorted and validated.
+
+    Args:
+        batch (Sequence[int]): Flat buffer with COMBINATION_SIZE sorted
+            numbers per ticket, such as the array('B') from generate_batch
+
+    Returns:
+        Compact array of ranks, one per ticket
+    """
+    t1, t2, t3, t4, t5, t6 = _RANK_TERMS
+    numbers = iter(batch)
+    return array(RANK_TYPECODE, [
+        t1[a] + t2[b] + t3[c] + t4[d] + t5[e] + t6[f]
+        for a, b, c, d, e, f in zip(*[numbers] * COMBINATION_SIZE)
+    ])
+
+
+def unrank_batch(ranks: Iterable[int]) -> List[List[int]]:
+    """
+    Unrank many ranks at once.
+
+    Args:
+        ranks (Iterable[int]): Ranks to convert back into combinations
+
+    Returns:
+        List of sorted combinations
+    """
+    return list(map(unrank_combination, ranks))
+
+
+def iter_rows(batch: Sequence[int]) -> Iterator[Sequence[int]]:
+    """
+    Iterate over the tickets of a flat row-major batch.
+
+    Args:
+        batch (Sequence[int]): Flat buffer with COMBINATION_SIZE numbers per
+            ticket, such as the array('B') returned by generate_batch
+
+    Returns:
+        Iterator of per-ticket slices
+    """
+    return (
+        batch[start:start + COMBINATION_SIZE]
+        for start in range(0, len(batch), COMBINATION_SIZE)
+    )
+
+
+def combination_mask(combination: Iterable[int]) -> int:
+    """
+    Encode a combination as a 60-bit mask with bit (num - 1) set per number.
+
+    Args:
+        combination (Iterable[int]): Numbers between MIN_NUMBER and MAX_NUMBER
+
+    Returns:
+        Integer bitmask of the combination
+    """
+    mask = 0
+    for num in combination:
+        mask |= 1 << (num - MIN_NUMBER)
+    return mask
+
+
+def mask_rows(batch: Sequence[int]) -> array:
+    """
+    Encode every ticket of a flat row-major batch as a 60-bit mask.
+
+    Args:
+        batch (Sequence[int]): Flat buffer with COMBINATION_SIZE numbers per
+            ticket, such as the array('B') from generate_batch
+
+    Returns:
+        array('Q') with one mask per ticket
+    """
+    bits = _MASK_BITS
+    numbers = iter(batch)
+    return array('Q', [
+        bits[a] | bits[b] | bits[c] | bits[d] | bits[e] | bits[f]
+        for a, b, c, d, e, f in zip(*[numbers] * COMBINATION_SIZE)
+    ])
+
+
+def _little_endian_masks(masks: array) -> bytes:
+    """Return the raw bytes of an array('Q') of masks in little-endian order."""
+    if sys.byteorder == 'little':
+        return masks.tobytes()
+    swapped = array('Q', masks)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def mask_numbers(mask: int) -> bytes:
+    """
+    Decode one 60-bit mask into its sorted numbers.
+
+    Args:
+        mask (int): Mask as built by combination_mask
+
+    Returns:
+        The numbers as packed bytes, ascending
+    """
+    raw = mask.to_bytes(MASK_BYTES, 'little')
+    return b''.join([table[value] for table, value in zip(_MASK_BYTE_NUMBERS, raw)])
+
+
+def unmask_rows(masks: array) -> array:
+    """
+    Decode 60-bit masks back into a flat row-major batch of sorted numbers.
+
+    Inverse of mask_rows: each byte of a mask is looked up in a table of
+    the numbers it encodes, so decoding costs eight lookups per ticket.
+
+    Args:
+        masks (array): array('Q') of masks with COMBINATION_SIZE bits each
+
+    Returns:
+        array('B') with COMBINATION_SIZE numbers per ticket
+    """
+    raw = _little_endian_masks(masks)
+    columns = [map(table.__getitem__, raw[i::MASK_BYTES]) for i, table in enumerate(_MASK_BYTE_NUMBERS)]
+    return array('B', b''.join(map(b''.join, zip(*columns))))
+
+
+def mask_number_counts(masks: array) -> List[int]:
+    """
+    Count how many masks contain each number, one C-level pass per number.
+
+    Args:
+        masks (array): array('Q') of masks
+
+    Returns:
+        Count of each number, indexed by number (MAX_NUMBER + 1 entries;
+        index 0 is unused)
+    """
+    raw = _little_endian_masks(masks)
+    counts = [0] * (MAX_NUMBER + 1)
+    for num in range(MIN_NUMBER, MAX_NUMBER + 1):
+        byte, bit = divmod(num - MIN_NUMBER, 8)
+        # Map every byte to its bit, then count the ones in C
+        counts[num] = raw[byte::MASK_BYTES].translate(_BIT_TABLES[bit]).count(1)
+    return counts
@@ -0,0 +1,206 @@
+"""
+Per-number frequencies over any range of contests.
+
+ContestIndex keeps the cumulative count of every number after each contest
+in a flat (draws + 1) x MAX_NUMBER array('I') of prefix sums: row i holds
+the counts over the first i contests. The counts over contests
+[start, stop) are row stop minus row start, 60 subtractions whatever the
+length of the range, so filtering by contest or by date never rescans the
+history. Contest numbers and dates (as ordinals) are kept alongside and
+ranges are located by bisection. The prefix sums are built in one pass on
+the first query, so an index nobody queries costs only a copy of the
+history; after that, appending a contest writes one row and removing the
+last one drops it.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import sub
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from Frequencias import FrequencyTable
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+
+class ContestIndex:
+    """
+    Prefix sums of the per-number counts, by contest.
+
+    Positions are 0-based contest indices in history order; contest
+    numbers default to 1, 2, ... when none are given.
+    """
+
+    def __init__(
+        self,
+        numbers: Iterable[int] = (),
+        contests: Sequence[int] = None,
+        dates: Sequence[int] = None
+    ):
+        """
+        Index an existing history.
+
+        Args:
+            numbers (Iterable[int]): Flat sequence of drawn numbers,
+                COMBINATION_SIZE per contest, oldest first
+            contests (Sequence[int], optional): Contest number of each draw,
+                increasing
+            dates (Sequence[int], optional): Date ordinal of each draw, e.g.
+                DrawStore.dates; without them date ranges are unavailable
+
+        Raises:
+            ValueError: If the history does not hold whole draws or the
+                contests / dates do not match it
+        """
+        self.numbers = array('B', numbers)
+        if len(self.numbers) % COMBINATION_SIZE:
+            raise ValueError(f"The history must hold {COMBINATION_SIZE} numbers per draw")
+        draws = len(self.numbers) // COMBINATION_SIZE
+        self.contests = array('I', contests if contests is not None else range(1, draws + 1))
+        self.dates = array('I', dates) if dates is not None else None
+        if len(self.contests) != draws or (self.dates is not None and len(self.dates) != draws):
+            raise ValueError("Contests and dates need one entry per draw")
+        self._prefix = None
+
+    @property
+    def prefix(self) -> array:
+        """The (draws + 1) x MAX_NUMBER prefix sums, built on first access."""
+        if self._prefix is None:
+            prefix = array('I', bytes(4 * MAX_NUMBER))
+            running = [0] * MAX_NUMBER
+            numbers = self.numbers
+            for start in range(0, len(numbers), COMBINATION_SIZE):
+                for num in numbers[start:start + COMBINATION_SIZE]:
+                    running[num - MIN_NUMBER] += 1
+                prefix.extend(running)
+            self._prefix = prefix
+        return self._prefix
+
+    def __len__(self) -> int:
+        return len(self.contests)
+
+    def append(self, draw: Iterable[int], contest: int = None, draw_date: date = None) -> None:
+        """
+        Add the next contest's row.
+
+        Args:
+            draw (Iterable[int]): Drawn numbers
+            contest (int, optional): Contest number. Defaults to the next one.
+            draw_date (date, optional): Draw date; required when the index
+                has dates, ignored otherwise
+
+        Raises:
+            ValueError: If the contest does not come after the last one, or
+                the index has dates and the draw date is missing or earlier
+                than the last one
+        """
+        last = self.contests[-1] if self.contests else 0
+        if contest is None:
+            contest = last + 1
+        elif contest <= last:
+            raise ValueError(f"Contest {contest} must come after contest {last}")
+        if self.dates is not None:
+            if draw_date is None:
+                raise ValueError(f"Contest {contest} needs a draw date: this history is dated")
+            if self.dates and draw_date.toordinal() < self.dates[-1]:
+                raise ValueError(f"The draw date of contest {contest} is earlier than the last one")
+            self.dates.append(draw_date.toordinal())
+        draw = sorted(draw)
+        if self._prefix is not None:
+            row = self._prefix[-MAX_NUMBER:]
+            for num in draw:
+                row[num - MIN_NUMBER] += 1
+            self._prefix.extend(row)
+        self.numbers.extend(draw)
+        self.contests.append(contest)
+
+    def remove_last(self) -> None:
+        """
+        Drop the most recent contest, undoing append.
+
+        Raises:
+            ValueError: If the index is empty
+        """
+        if not self.contests:
+            raise ValueError("The history is empty")
+        if self._prefix is not None:
+            del self._prefix[-MAX_NUMBER:]
+        del self.numbers[-COMBINATION_SIZE:]
+        self.contests.pop()
+        if self.dates is not None:
+            self.dates.pop()
+
+    def counts(self, start: int = 0, stop: int = None) -> List[int]:
+        """
+        Return each number's count over contest positions [start, stop).
+
+        Args:
+            start (int): First position included
+            stop (int, optional): First position excluded. Defaults to the
+                end of the history.
+
+        Returns:
+            Counts indexed by number (MAX_NUMBER + 1 entries; index 0 is
+            unused), like FrequencyTable.counts
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        high = self.prefix[stop * MAX_NUMBER:(stop + 1) * MAX_NUMBER]
+        low = self.prefix[start * MAX_NUMBER:(start + 1) * MAX_NUMBER]
+        return [0] + list(map(sub, high, low))
+
+    def contest_positions(self, first: int = None, last: int = None) -> Tuple[int, int]:
+        """
+        Return the positions [start, stop) of contests first..last, inclusive.
+
+        Either bound may be None for an open range.
+        """
+        start = bisect_left(self.contests, first) if first is not None else 0
+        stop = bisect_right(self.contests, last) if last is not None else len(self)
+        return start, max(start, stop)
+
+    def date_positions(self, start_date: date = None, end_date: date = None) -> Tuple[int, int]:
+        """
+        Return the positions [start, stop) of the draws between two dates,
+        inclusive. Either bound may be None for an open range.
+
+        Raises:
+            ValueError: If the index has no dates
+        """
+        if self.dates is None:
+            raise ValueError("This history has no draw dates")
+        start = bisect_left(self.dates, start_date.toordinal()) if start_date is not None else 0
+        stop = bisect_right(self.dates, end_date.toordinal()) if end_date is not None else len(self)
+        return start, max(start, stop)
+
+    def frequencies(self, start: int = 0, stop: int = None) -> FrequencyTable:
+        """Return a FrequencyTable of positions [start, stop), e.g. for its rankings."""
+        return FrequencyTable.from_counts(self.counts(start, stop))
+
+    def summary(self, start: int = 0, stop: int = None, k: int = COMBINATION_SIZE) -> Dict[str, object]:
+        """
+        Describe the frequencies over positions [start, stop).
+
+        Returns:
+            Dictionary with 'draws', 'first_contest' / 'last_contest' and
+            'first_date' / 'last_date' (None when empty or undated),
+            per-number 'counts' and the k 'most_frequent' and
+            'least_frequent' numbers, ranked as by FrequencyTable
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        table = self.frequencies(start, stop)
+        empty = start == stop
+        return {
+            'draws': stop - start,
+            'first_contest': None if empty else self.contests[start],
+            'last_contest': None if empty else self.contests[stop - 1],
+            'first_date': self._date(start) if not empty else None,
+            'last_date': self._date(stop - 1) if not empty else None,
+            'counts': {num: table.counts[num] for num in range(MIN_NUMBER, MAX_NUMBER + 1)},
+            'most_frequent': table.most_frequent(k),
+            'least_frequent': table.least_frequent(k),
+        }
+
+    def _date(self, position: int) -> Optional[date]:
+        return date.fromordinal(self.dates[position]) if self.dates is not None else None
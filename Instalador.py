@@ -14,7 +14,7 @@
 #       ⠀⠀⠀⣿⣙⡆⠀⠀⡇⠀⢸⠀⠀⢸⠀⠀ ⢸⡇⠀⠀⢸⣏⡉  ⠙⡏⠁⠀ 
 #       ⠀⠀⠀⣿⣉⡷⠀⠀⢧⣀⣼ ⠀⢸⣀  ⢸⣇⡀ ⢸⣏⣁⠀ ⠀⡇⠀ 
 
-from setuptools import setup, find_packages # type: ignore
+from setuptools import setup # type: ignore
 
 setup(
     name='SorteadorMegaSena',
@@ -22,11 +22,35 @@ setup(
     description='Gerador de números para Mega-Sena com análise estatística',
     author='Michael Bullet',
     author_email='contato@michaelbullet.com',
-    packages=find_packages(),
+    py_modules=[
+        'app',
+        'AnalisadorCombinacoes',
+        'CacheEstatisticas',
+        'Amostragem',
+        'Atrasos',
+        'Bilhetes',
+        'ConferirBilhetes',
+        'Coocorrencias',
+        'Desempenho',
+        'ExportarBilhetes',
+        'Fechamentos',
+        'Frequencias',
+        'GerarNumeros',
+        'HistoricoSorteios',
+        'IndiceCombinacoes',
+        'IndiceConcursos',
+        'Instrumentacao',
+        'Metodos',
+        'Probabilidades',
+        'Restricoes',
+        'ServidorHTTP',
+        'SimuladorHistorico',
+        'SorteadorMega',
+    ],
     install_requires=[],
     entry_points={
         'console_scripts': [
-            'SorteadorMegaSena=SorteadorMegaSena.app:main',
+            'SorteadorMegaSena=app:main',
         ],
     },
     classifiers=[
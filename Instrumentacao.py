@@ -0,0 +1,229 @@
+"""
+Optional instrumentation of the generator's hot paths.
+
+Instrumentation collects call and ticket counts per generation method,
+latency statistics per operation (generation, analysis, statistics
+rebuilds) and, optionally, the number of raw draws taken from the random
+number generator. SorteadorMegaSena only installs it on request, by
+shadowing the instrumented methods on the instance: a generator without
+instrumentation runs the plain class methods, with no flag checks on the
+dispatch path.
+
+Latency percentiles are computed over a ring buffer of the most recent
+SAMPLE_SIZE calls per operation, so memory stays bounded however long the
+process runs; totals, counts and maxima cover every call.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Optional
+
+# Latencies kept per operation for the percentiles
+SAMPLE_SIZE = 1024
+
+DEFAULT_DUMP_INTERVAL = 60.0
+
+_random = random.Random.random
+_getrandbits = random.Random.getrandbits
+
+
+class CountingRandom(random.Random):
+    """
+    random.Random that counts the raw draws it hands out.
+
+    Every value produced by random() or getrandbits() counts as one draw;
+    choices, sample, shuffle and randrange are built on those two, so the
+    stream (and hence every generated ticket) is identical to a plain
+    random.Random with the same state. Each draw costs one extra Python
+    call, which is why draw counting is opt-in.
+    """
+
+    draws = 0
+
+    def random(self) -> float:
+        self.draws += 1
+        return _random(self)
+
+    def getrandbits(self, k: int) -> int:
+        self.draws += 1
+        return _getrandbits(self, k)
+
+
+class TimingStats:
+    """Call count, total, maximum and recent-call percentiles of one operation."""
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples = array('d', [0.0]) * sample_size
+
+    def add(self, elapsed: float) -> None:
+        """Record one call that took `elapsed` seconds."""
+        self._samples[self.calls % len(self._samples)] = elapsed
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the statistics in seconds (percentiles over recent calls)."""
+        recent = sorted(self._samples[:min(self.calls, len(self._samples))])
+        summary = {'calls': self.calls, 'total_s': self.total, 'max_s': self.max}
+        for name, fraction in (('p50_s', 0.50), ('p90_s', 0.90), ('p99_s', 0.99)):
+            summary[name] = recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else 0.0
+        return summary
+
+
+class Instrumentation:
+    """
+    Counters and timings of one generator.
+
+    Recording takes a lock, so snapshots stay consistent while a worker
+    thread generates; it happens once per batch, not per ticket.
+    """
+
+    def __init__(self, rng: CountingRandom = None):
+        """
+        Args:
+            rng (CountingRandom, optional): Generator whose draws are
+                reported; None leaves rng_draws out of the snapshots
+        """
+        self.rng = rng
+        self.started = time.time()
+        self.calls = Counter()
+        self.tickets = Counter()
+        self.timings: Dict[str, TimingStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, elapsed: float) -> None:
+        """
+        Record one timed call.
+
+        Args:
+            operation (str): E.g. 'generate', 'analyze' or 'statistics'
+            elapsed (float): Duration in seconds
+        """
+        with self._lock:
+            timing = self.timings.get(operation)
+            if timing is None:
+                timing = self.timings[operation] = TimingStats()
+            timing.add(elapsed)
+
+    def record_generation(self, method: str, tickets: int, elapsed: float) -> None:
+        """Record one generation call of a method."""
+        with self._lock:
+            self.calls[method] += 1
+            self.tickets[method] += tickets
+        self.record('generate', elapsed)
+
+    @contextmanager
+    def timed(self, operation: str):
+        """Context manager recording the duration of its block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable snapshot.
+
+        Returns:
+            Dictionary with 'uptime_s', per-method 'calls' and 'tickets',
+            their 'total_tickets', per-operation 'timings' and 'rng_draws'
+            (None when draws are not counted)
+        """
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.started,
+                'calls': dict(self.calls),
+                'tickets': dict(self.tickets),
+                'total_tickets': sum(self.tickets.values()),
+                'timings': {operation: timing.snapshot() for operation, timing in self.timings.items()},
+                'rng_draws': self.rng.draws if self.rng is not None else None,
+            }
+
+
+def timed(instrumentation: Optional[Instrumentation], operation: str):
+    """Time a block when instrumentation is enabled; a no-op context otherwise."""
+    return instrumentation.timed(operation) if instrumentation is not None else nullcontext()
+
+
+class StatsDumper:
+    """
+    Background thread writing stats snapshots at a fixed interval.
+
+    Each snapshot is one JSON line, appended to a file or logged at INFO
+    level. A final snapshot is written on stop.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Dict[str, Any]],
+        interval: float = DEFAULT_DUMP_INTERVAL,
+        path: str = None,
+        logger: logging.Logger = None
+    ):
+        """
+        Args:
+            source (Callable[[], dict]): Returns the snapshot, e.g.
+                SorteadorMegaSena.stats
+            interval (float): Seconds between snapshots
+            path (str, optional): File the JSON lines are appended to
+            logger (logging.Logger, optional): Logger used when no path is
+                given. Defaults to the 'sorteador.stats' logger.
+
+        Raises:
+            ValueError: If the interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError("The dump interval must be positive")
+        self.source = source
+        self.interval = interval
+        self.path = path
+        self.logger = logger or logging.getLogger('sorteador.stats')
+        self._stop = threading.Event()
+        self._thread = None
+
+    def dump(self) -> None:
+        """Write one snapshot now."""
+        line = json.dumps(self.source(), sort_keys=True)
+        if self.path is None:
+            self.logger.info(line)
+            return
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(line + '\n')
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def start(self) -> 'StatsDumper':
+        """Start the background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stats-dump', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread and write a final snapshot."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.dump()
+
+    def __enter__(self) -> 'StatsDumper':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,17 @@
+"""
+Names of the generation strategies.
+
+Kept apart from GerarNumeros, with no dependencies beyond typing, so the
+command line and the backtester can list the strategies without importing
+the engine.
+"""
+
+from typing import Literal, get_args
+
+GenerationMethod = Literal[
+    'most_frequent', 'least_frequent', 'mixed', 'random', 'weighted', 'inverse_weighted',
+    'hot', 'cold', 'overdue'
+]
+
+# Every strategy, in declaration order
+METHODS = get_args(GenerationMethod)
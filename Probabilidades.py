@@ -0,0 +1,284 @@
+"""
+Exact prize probabilities of a set of tickets.
+
+Every result is an exact Fraction computed from hypergeometric counts over
+the C(60, 6) equally likely draws, instead of an estimate from generating
+and checking tickets:
+
+- per ticket, the chance of each prize tier (exactly k matches);
+- for the set, the expected number of winning tickets per tier (linear in
+  the tickets) and its variance, which depends on how much the tickets
+  overlap;
+- the chance that at least one ticket wins each tier or better.
+
+Overlaps enter through the histogram of |T1 & T2| over all ticket pairs,
+obtained without comparing every pair: the number of pairs sharing each
+j-subset of numbers is counted from the tickets' 60-bit masks, and the
+pair counts per overlap follow by binomial inversion (inclusion-exclusion
+over the shared subsets). The chance of at least one winner is counted
+exactly over the draws restricted to the numbers the tickets use; when
+that enumeration would exceed MAX_ENUMERATION, bounds from the first two
+inclusion-exclusion terms (built on the same pair histogram) are reported
+instead.
+"""
+
+from collections import Counter
+from fractions import Fraction
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from Bilhetes import TicketArray
+from ConferirBilhetes import PRIZE_TIERS
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, TOTAL_COMBINATIONS, binomial, mask_number_counts
+
+# Most candidate draws enumerated for an exact "at least one winner"
+MAX_ENUMERATION = 1_000_000
+
+_UNIVERSE = range(MAX_NUMBER)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+# int.bit_count is Python 3.10+
+_popcount = getattr(int, 'bit_count', _popcount)
+
+
+@lru_cache(maxsize=None)
+def _choose(n: int, k: int) -> int:
+    """C(n, k), zero outside 0 <= k <= n."""
+    if k < 0 or n < 0 or k > n:
+        return 0
+    if k == 0:
+        return 1
+    if k <= COMBINATION_SIZE and n <= MAX_NUMBER:
+        return binomial(n, k)
+    return _choose(n - 1, k - 1) * n // k
+
+
+@lru_cache(maxsize=None)
+def match_count(matches: int) -> int:
+    """Number of draws sharing exactly `matches` numbers with a ticket."""
+    return _choose(COMBINATION_SIZE, matches) * _choose(MAX_NUMBER - COMBINATION_SIZE, COMBINATION_SIZE - matches)
+
+
+def match_probability(matches: int) -> Fraction:
+    """
+    Chance that one ticket shares exactly `matches` numbers with the draw.
+
+    Args:
+        matches (int): Number of matches, 0 to COMBINATION_SIZE
+
+    Returns:
+        Exact hypergeometric probability
+    """
+    return Fraction(match_count(matches), TOTAL_COMBINATIONS)
+
+
+@lru_cache(maxsize=None)
+def _joint_count(overlap: int, first: int, second: int) -> int:
+    """
+    Number of draws matching one ticket exactly `first` times and another
+    exactly `second` times, when the two tickets share `overlap` numbers.
+    """
+    own = COMBINATION_SIZE - overlap
+    rest = MAX_NUMBER - COMBINATION_SIZE - own
+    return sum(
+        _choose(overlap, shared) * _choose(own, first - shared) * _choose(own, second - shared)
+        * _choose(rest, COMBINATION_SIZE - first - second + shared)
+        for shared in range(overlap + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def _joint_at_least(overlap: int, threshold: int) -> int:
+    """Draws giving both tickets of a pair at least `threshold` matches."""
+    return sum(
+        _joint_count(overlap, first, second)
+        for first in range(threshold, COMBINATION_SIZE + 1)
+        for second in range(threshold, COMBINATION_SIZE + 1)
+    )
+
+
+def overlap_histogram(masks: Sequence[int]) -> List[int]:
+    """
+    Count the ticket pairs by how many numbers they share.
+
+    For each j, the pairs sharing a given j-subset are C(m, 2) where m
+    tickets contain it; summed over the subsets this is
+    sum_o C(o, j) * pairs[o], which is inverted from o = 6 down.
+
+    Args:
+        masks (Sequence[int]): Ticket masks (repeated tickets allowed)
+
+    Returns:
+        pairs[o] for o in 0..COMBINATION_SIZE, over all i < j
+    """
+    masks = TicketArray.from_masks(masks).masks
+    shared = [0] * (COMBINATION_SIZE + 1)
+    shared[0] = len(masks) * (len(masks) - 1) // 2
+    shared[1] = sum(count * (count - 1) // 2 for count in mask_number_counts(masks))
+    subsets = [Counter() for _ in range(COMBINATION_SIZE + 1)]
+    for mask in masks:
+        bits = [1 << bit for bit in _UNIVERSE if mask >> bit & 1]
+        for size in range(2, COMBINATION_SIZE):
+            subsets[size].update(map(sum, combinations(bits, size)))
+    subsets[COMBINATION_SIZE].update(masks)
+    for size in range(2, COMBINATION_SIZE + 1):
+        shared[size] = sum(count * (count - 1) // 2 for count in subsets[size].values() if count > 1)
+
+    pairs = [0] * (COMBINATION_SIZE + 1)
+    for overlap in range(COMBINATION_SIZE, -1, -1):
+        pairs[overlap] = shared[overlap] - sum(
+            _choose(larger, overlap) * pairs[larger]
+            for larger in range(overlap + 1, COMBINATION_SIZE + 1)
+        )
+    return pairs
+
+
+def _draws_hitting(masks: Sequence[int], threshold: int, max_enumeration: int) -> Optional[int]:
+    """
+    Count the draws giving at least one ticket `threshold` matches or more.
+
+    A draw splits into the numbers it takes from U, the union of the
+    tickets, and the rest; only the first part decides a hit. The hitting
+    parts are enumerated as a threshold-subset of some ticket plus up to
+    6 - threshold more numbers of U, and each is weighted by the ways to
+    complete it outside U.
+
+    Returns:
+        The count, or None if the enumeration exceeds max_enumeration
+    """
+    union = 0
+    for mask in masks:
+        union |= mask
+    used = _popcount(union)
+    outside = MAX_NUMBER - used
+    extra = COMBINATION_SIZE - threshold
+
+    cores = set()
+    for mask in masks:
+        bits = [1 << bit for bit in _UNIVERSE if mask >> bit & 1]
+        cores.update(map(sum, combinations(bits, threshold)))
+    cost = len(cores) * sum(_choose(used - threshold, size) for size in range(extra + 1))
+    if cost > max_enumeration:
+        return None
+
+    union_bits = [1 << bit for bit in _UNIVERSE if union >> bit & 1]
+    hits = set(cores)
+    if extra:
+        for core in cores:
+            rest = [bit for bit in union_bits if not core & bit]
+            for size in range(1, extra + 1):
+                hits.update(map(core.__or__, map(sum, combinations(rest, size))))
+
+    by_size = Counter(map(_popcount, hits))
+    return sum(count * _choose(outside, COMBINATION_SIZE - size) for size, count in by_size.items())
+
+
+def _union_bounds(first_order: Fraction, second_order: Fraction, events: int) -> Tuple[Fraction, Fraction]:
+    """
+    Best bounds on P(A_1 | ... | A_n) knowing only S1 = sum P(A_i) and
+    S2 = sum_{i<j} P(A_i & A_j): Dawson-Sankoff below, Kwerel above.
+    """
+    if not first_order:
+        return Fraction(0), Fraction(0)
+    degree = 1 + int(2 * second_order / first_order)
+    lower = 2 * first_order / (degree + 1) - 2 * second_order / (degree * (degree + 1))
+    upper = first_order - 2 * second_order / events
+    return max(lower, first_order / events), min(upper, Fraction(1))
+
+
+def probability_report(tickets: Any, max_enumeration: int = MAX_ENUMERATION) -> Dict[str, Any]:
+    """
+    Compute the exact prize probabilities of a set of tickets.
+
+    Args:
+        tickets: A TicketArray, an array('Q') of masks, a flat batch of
+            sorted rows (array('B') / bytes), or a list of combinations
+        max_enumeration (int): Most candidate draws enumerated for an
+            exact 'at_least_one'; beyond it only bounds are given
+
+    Returns:
+        Dictionary with 'total_tickets', 'distinct_tickets',
+        'expected_prizes' (expected winning tickets over all tiers) and,
+        per tier in PRIZE_TIERS, 'matches', 'probability' (per ticket),
+        'expected_winners', 'variance' (of the number of winners),
+        'at_least_one' (chance that some ticket matches at least that
+        many numbers; None when too costly to enumerate) and
+        'at_least_one_bounds' (the best bounds from the pairwise
+        inclusion-exclusion terms, or the exact value twice). Every number is an exact Fraction or int.
+    """
+    if isinstance(tickets, TicketArray):
+        masks = tickets.masks
+    elif isinstance(tickets, (bytes, bytearray, memoryview)) or getattr(tickets, 'typecode', None) == 'B':
+        masks = TicketArray.from_rows(tickets).masks
+    elif getattr(tickets, 'typecode', None) == 'Q':
+        masks = tickets
+    else:
+        masks = TicketArray(tickets).masks
+
+    total = len(masks)
+    distinct = list(dict.fromkeys(masks))
+    pairs = overlap_histogram(masks)
+    distinct_pairs = pairs if len(distinct) == total else overlap_histogram(distinct)
+
+    tiers = {}
+    for tier, matches in PRIZE_TIERS.items():
+        probability = match_probability(matches)
+        expected = total * probability
+        covariance = sum(
+            count * (Fraction(_joint_count(overlap, matches, matches), TOTAL_COMBINATIONS) - probability * probability)
+            for overlap, count in enumerate(pairs)
+        )
+        variance = total * probability * (1 - probability) + 2 * covariance
+
+        single = Fraction(sum(match_count(k) for k in range(matches, COMBINATION_SIZE + 1)), TOTAL_COMBINATIONS)
+        first_order = len(distinct) * single
+        second_order = sum(
+            count * Fraction(_joint_at_least(overlap, matches), TOTAL_COMBINATIONS)
+            for overlap, count in enumerate(distinct_pairs)
+        )
+        hitting = _draws_hitting(distinct, matches, max_enumeration) if distinct else 0
+        if hitting is not None:
+            at_least_one = Fraction(hitting, TOTAL_COMBINATIONS)
+            bounds = (at_least_one, at_least_one)
+        else:
+            at_least_one = None
+            bounds = _union_bounds(first_order, second_order, len(distinct))
+
+        tiers[tier] = {
+            'matches': matches,
+            'probability': probability,
+            'expected_winners': expected,
+            'variance': variance,
+            'at_least_one': at_least_one,
+            'at_least_one_bounds': bounds,
+        }
+
+    return {
+        'total_tickets': total,
+        'distinct_tickets': len(distinct),
+        'expected_prizes': sum(tier['expected_winners'] for tier in tiers.values()),
+        'tiers': tiers,
+    }
+
+
+def report_as_floats(report: Any) -> Any:
+    """Convert the Fractions of a report to floats, e.g. for JSON."""
+    if isinstance(report, Fraction):
+        return float(report)
+    if isinstance(report, dict):
+        return {key: report_as_floats(value) for key, value in report.items()}
+    if isinstance(report, (list, tuple)):
+        return [report_as_floats(value) for value in report]
+    return report
+
+
+def odds(probability: Fraction) -> str:
+    """Format a probability as '1 em N' (Portuguese 'one in N')."""
+    if probability <= 0:
+        return "impossível"
+    return f"1 em {float(1 / probability):,.0f}".replace(',', '.')
@@ -0,0 +1,263 @@
+"""
+Constraint-filtered ticket generation.
+
+Supports the usual ticket filters: sum range, number of odd numbers, most
+numbers per decade (1-10, 11-20, ..., 51-60) and longest run of
+consecutive numbers. Rather than generating and discarding tickets, the
+feasible combinations are counted with a dynamic program that decides the
+numbers 1..60 in order; its state is (numbers chosen, odd numbers chosen,
+numbers chosen in the current decade, current run length), and each state
+holds an array of completion counts indexed by the partial sum. A
+uniformly random feasible index is then unranked by walking the same
+table, so every feasible ticket is equally likely and the cost per ticket
+does not depend on how rare the constraints are. The walk jumps straight
+to the next chosen number by bisecting cumulative counts cached per
+(number, state, partial sum), so a ticket costs six bisections.
+"""
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import groupby
+from operator import add
+import random
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from Amostragem import sample_indices
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+DECADE_SIZE = 10
+
+_MIN_SUM = sum(range(MIN_NUMBER, MIN_NUMBER + COMBINATION_SIZE))
+_MAX_SUM = sum(range(MAX_NUMBER - COMBINATION_SIZE + 1, MAX_NUMBER + 1))
+
+# Cached jump tables per sampler (each at most MAX_NUMBER entries)
+_JUMP_CACHE_SIZE = 1 << 15
+
+
+class Constraints(NamedTuple):
+    """
+    Ticket filters; the defaults accept every combination.
+
+    Example: sum between 150 and 220, three odd numbers, at most two per
+    decade and no runs of three consecutive numbers is
+    Constraints(150, 220, 3, 3, 2, 2).
+    """
+    min_sum: int = _MIN_SUM
+    max_sum: int = _MAX_SUM
+    min_odd: int = 0
+    max_odd: int = COMBINATION_SIZE
+    max_per_decade: int = COMBINATION_SIZE
+    max_run: int = COMBINATION_SIZE
+
+
+def _decade(num: int) -> int:
+    return (num - MIN_NUMBER) // DECADE_SIZE
+
+
+def satisfies(ticket: Sequence[int], constraints: Constraints) -> bool:
+    """
+    Check one ticket against the constraints directly.
+
+    Args:
+        ticket (Sequence[int]): The six numbers of a ticket
+        constraints (Constraints): Filters to apply
+
+    Returns:
+        True if the ticket passes every filter
+    """
+    ticket = sorted(ticket)
+    odd = sum(num & 1 for num in ticket)
+    per_decade = max(len(list(group)) for _, group in groupby(ticket, _decade))
+    run = longest = 1
+    for previous, current in zip(ticket, ticket[1:]):
+        run = run + 1 if current == previous + 1 else 1
+        longest = max(longest, run)
+    return (
+        constraints.min_sum <= sum(ticket) <= constraints.max_sum
+        and constraints.min_odd <= odd <= constraints.max_odd
+        and per_decade <= constraints.max_per_decade
+        and longest <= constraints.max_run
+    )
+
+
+State = Tuple[int, int, int, int]
+
+
+class ConstrainedSampler:
+    """
+    Uniform sampler over the combinations satisfying a set of constraints.
+
+    `count` is the exact size of the feasible set; unrank maps every index
+    in range(count) to a distinct feasible ticket.
+    """
+
+    def __init__(self, constraints: Constraints):
+        """
+        Build the completion-count tables.
+
+        Args:
+            constraints (Constraints): Filters to apply
+
+        Raises:
+            ValueError: If no combination satisfies the constraints
+        """
+        self.constraints = constraints
+        self._low = max(constraints.min_sum, _MIN_SUM)
+        self._high = min(constraints.max_sum, _MAX_SUM)
+        # Dimensions of a constraint that cannot bind are not tracked
+        self._track_odd = constraints.min_odd > 0 or constraints.max_odd < COMBINATION_SIZE
+        self._track_decade = constraints.max_per_decade < COMBINATION_SIZE
+        self._track_run = constraints.max_run < COMBINATION_SIZE
+
+        self._layers: List[Dict[State, array]] = [{} for _ in range(MAX_NUMBER + 2)]
+        self._jumps: Dict[Tuple[int, State, int], Tuple[List[int], List[int], List[State]]] = {}
+        self._build()
+        start = self._layers[MIN_NUMBER].get((0, 0, 0, 0))
+        self.count = start[0] if start is not None else 0
+        if self.count == 0:
+            raise ValueError("No combination satisfies the constraints")
+
+    def _transitions(self, pos: int, state: State) -> Tuple[State, Optional[State]]:
+        """
+        Return the states at pos + 1 after skipping and after choosing pos
+        (None when choosing it would break a constraint).
+        """
+        chosen, odd, in_decade, run = state
+        last = pos == MAX_NUMBER
+        same_decade = not last and _decade(pos + 1) == _decade(pos)
+
+        skip = (chosen, odd, in_decade if same_decade else 0, 0)
+        if (
+            chosen == COMBINATION_SIZE
+            or in_decade + 1 > self.constraints.max_per_decade
+            or run + 1 > self.constraints.max_run
+        ):
+            return skip, None
+        take = (
+            chosen + 1,
+            odd + (pos & 1) if self._track_odd else 0,
+            in_decade + 1 if self._track_decade and same_decade else 0,
+            run + 1 if self._track_run and not last else 0,
+        )
+        return skip, take
+
+    def _build(self) -> None:
+        """Fill the layers from the last number down to the first."""
+        high = self._high
+        width = high + 1
+        zeros = array('I', [0]) * width
+
+        terminal = array('I', [0]) * width
+        for total in range(self._low, width):
+            terminal[total] = 1
+        odd_range = range(self.constraints.min_odd, self.constraints.max_odd + 1) if self._track_odd else (0,)
+        self._layers[MAX_NUMBER + 1] = {(COMBINATION_SIZE, odd, 0, 0): terminal for odd in odd_range}
+
+        for pos in range(MAX_NUMBER, MIN_NUMBER - 1, -1):
+            following = self._layers[pos + 1]
+            layer = self._layers[pos]
+            for state in self._states(pos):
+                skip, take = self._transitions(pos, state)
+                counts = following.get(skip)
+                taken = following.get(take) if take is not None else None
+                if taken is not None:
+                    # Choosing pos moves the partial sum from s to s + pos
+                    shifted = taken[pos:] + zeros[:pos] if pos < width else zeros
+                    counts = shifted if counts is None else array('I', map(add, counts, shifted))
+                if counts is not None and any(counts):
+                    layer[state] = counts
+
+    def _states(self, pos: int):
+        """Yield every state that can occur before deciding number pos."""
+        decided = pos - MIN_NUMBER
+        decade_start = MIN_NUMBER + _decade(pos) * DECADE_SIZE
+        for chosen in range(min(decided, COMBINATION_SIZE) + 1):
+            for odd in range(chosen + 1) if self._track_odd else (0,):
+                for in_decade in range(min(chosen, pos - decade_start) + 1) if self._track_decade else (0,):
+                    for run in range(min(chosen, decided) + 1) if self._track_run else (0,):
+                        yield chosen, odd, in_decade, run
+
+    def _jump(self, pos: int, state: State, partial: int) -> Tuple[List[int], List[int], List[State]]:
+        """
+        Return the numbers that can be chosen next from a state, with the
+        cumulative counts of the tickets continuing through each of them
+        and the state right after choosing each one.
+        """
+        key = (pos, state, partial)
+        jump = self._jumps.get(key)
+        if jump is None:
+            cumulative, numbers, states = [], [], []
+            total = 0
+            for num in range(pos, MAX_NUMBER + 1):
+                skip, take = self._transitions(num, state)
+                counts = self._layers[num + 1].get(take) if take is not None else None
+                if counts is not None and partial + num <= self._high and counts[partial + num]:
+                    total += counts[partial + num]
+                    cumulative.append(total)
+                    numbers.append(num)
+                    states.append(take)
+                state = skip
+            if len(self._jumps) >= _JUMP_CACHE_SIZE:
+                self._jumps.clear()
+            jump = self._jumps[key] = (cumulative, numbers, states)
+        return jump
+
+    def unrank(self, index: int) -> bytes:
+        """
+        Return the feasible ticket with the given index.
+
+        Args:
+            index (int): Position in range(count)
+
+        Returns:
+            Packed sorted row of COMBINATION_SIZE numbers
+        """
+        state = (0, 0, 0, 0)
+        partial = 0
+        pos = MIN_NUMBER
+        row = bytearray()
+        while state[0] < COMBINATION_SIZE:
+            cumulative, numbers, states = self._jump(pos, state, partial)
+            choice = bisect_right(cumulative, index)
+            if choice:
+                index -= cumulative[choice - 1]
+            num = numbers[choice]
+            state = states[choice]
+            partial += num
+            pos = num + 1
+            row.append(num)
+        return bytes(row)
+
+    def sample(self, num_combinations: int, unique: bool = False, rng: random.Random = random) -> List[bytes]:
+        """
+        Draw feasible tickets uniformly at random.
+
+        Args:
+            num_combinations (int): Number of tickets
+            unique (bool): Draw distinct tickets
+            rng (random.Random): Source of randomness
+
+        Returns:
+            List of packed sorted rows
+
+        Raises:
+            ValueError: If unique is set and fewer tickets are feasible
+        """
+        if unique:
+            if num_combinations > self.count:
+                raise ValueError(
+                    f"Cannot generate {num_combinations} distinct combinations: "
+                    f"only {self.count} satisfy the constraints"
+                )
+            indices = sample_indices(self.count, num_combinations, rng)
+        else:
+            randrange = rng.randrange
+            indices = [randrange(self.count) for _ in range(num_combinations)]
+        return [self.unrank(index) for index in indices]
+
+
+@lru_cache(maxsize=16)
+def constrained_sampler(constraints: Constraints) -> ConstrainedSampler:
+    """Return a (cached) sampler for the given constraints."""
+    return ConstrainedSampler(constraints)
@@ -0,0 +1,617 @@
+"""
+Local HTTP/JSON ticket service.
+
+An asyncio HTTP/1.1 server around one SorteadorMegaSena, with keep-alive
+connections, so other applications can request tickets without starting a
+Python process per request:
+
+    GET  /generate?method=mixed&count=5        (also unique, seed, format
+    POST /generate  {"method": ..., "count": ...} and Constraints fields)
+    POST /analyze   {"tickets": [[...], ...]} or packed rows
+    POST /check     {"draw": [...], "tickets": [...]} or packed rows with
+                    ?draw=1,2,3,4,5,6
+    POST /probability  {"tickets": [...]} or packed rows: exact prize
+                    probabilities of the set (see Probabilidades)
+    GET  /frequency?first=..&last=..&start=..&end=..  number frequencies
+                    over a contest and / or date range (dd/mm/yyyy or ISO)
+    GET  /stats     server counters and the generator's stats()
+
+Packed rows are the 'bin' export format (COMBINATION_SIZE bytes per sorted
+ticket, Content-Type application/octet-stream); /generate answers with
+them instead of JSON for format=bin or Accept: application/octet-stream.
+
+Small unseeded /generate requests that arrive in the same event loop
+iteration are coalesced per (method, constraints) into one generate_batch
+call and the rows are split between them, so a burst of requests costs
+one batch instead of one call each. Batches, analyses and checks of at
+least PROCESS_THRESHOLD tickets run in a process pool and never block the
+event loop. Invalid parameters are answered with 400 and unexpected
+failures with 500, both with a JSON error message. `python ServidorHTTP.py
+carga` is a keep-alive load-test client.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import Executor
+from http import HTTPStatus
+from operator import lt
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from AnalisadorCombinacoes import CombinationAnalyzer
+from ConferirBilhetes import check_pool
+from GerarNumeros import SorteadorMegaSena
+from HistoricoSorteios import parse_date
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, iter_rows, rank_combination
+from Metodos import METHODS
+from Probabilidades import probability_report, report_as_floats
+from Restricoes import Constraints
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Idle seconds before a keep-alive connection is closed
+KEEP_ALIVE_TIMEOUT = 15.0
+
+MAX_BODY_BYTES = 64 << 20
+MAX_TICKETS = 10_000_000
+
+# Requests up to this many tickets are coalesced, into calls of at most
+# COALESCE_MAX_BATCH tickets
+COALESCE_MAX_TICKETS = 1024
+COALESCE_MAX_BATCH = 1 << 16
+
+# Work on at least this many tickets goes to the process pool
+PROCESS_THRESHOLD = 100_000
+# Probability reports cost far more per ticket
+PROBABILITY_PROCESS_THRESHOLD = 1_000
+
+JSON_TYPE = 'application/json'
+BINARY_TYPE = 'application/octet-stream'
+
+_CONSTRAINT_FIELDS = frozenset(Constraints._fields)
+
+_logger = logging.getLogger('sorteador.http')
+
+
+class _HTTPError(Exception):
+    """Request failure answered with `status` and a JSON error message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params: Dict[str, Any], name: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    Read an integer parameter from the query string or the JSON body.
+
+    Accepts ints, integral floats (JSON 5.0) and decimal strings.
+
+    Raises:
+        ValueError: For anything else, including infinite or huge JSON
+            numbers (1e400 parses as inf)
+    """
+    value = params.get(name, default)
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('+-').isdecimal():
+        return int(value)
+    raise ValueError(f"'{name}' must be an integer")
+
+
+def _validate_rows(data: bytes) -> None:
+    """
+    Check that a body holds packed sorted tickets.
+
+    Raises:
+        ValueError: If it does not
+    """
+    if len(data) % COMBINATION_SIZE:
+        raise ValueError(f"Packed tickets must have {COMBINATION_SIZE} bytes each")
+    if data and (min(data) < MIN_NUMBER or max(data) > MAX_NUMBER):
+        raise ValueError(f"Numbers must be between {MIN_NUMBER} and {MAX_NUMBER}")
+    # Strictly increasing columns: sorted rows without repeated numbers
+    columns = [data[position::COMBINATION_SIZE] for position in range(COMBINATION_SIZE)]
+    if not all(all(map(lt, left, right)) for left, right in zip(columns, columns[1:])):
+        raise ValueError("Packed tickets must be sorted with distinct numbers")
+
+
+def _pack(tickets: Any) -> bytes:
+    """
+    Validate a JSON list of tickets and pack it into sorted rows.
+
+    Raises:
+        ValueError: If the list or a ticket is invalid
+    """
+    if not isinstance(tickets, list):
+        raise ValueError("'tickets' must be a list of combinations")
+    if len(tickets) > MAX_TICKETS:
+        raise ValueError(f"At most {MAX_TICKETS} tickets per request")
+    rows = bytearray()
+    for ticket in tickets:
+        if not isinstance(ticket, list) or not all(isinstance(num, int) for num in ticket):
+            raise ValueError("Each ticket must be a list of numbers")
+        rank_combination(ticket)
+        rows.extend(sorted(ticket))
+    return bytes(rows)
+
+
+def _analyze(rows: bytes) -> Dict[str, Any]:
+    """Analyze packed rows (runs in the process pool for large bodies)."""
+    return CombinationAnalyzer().update(array('B', rows)).result()
+
+
+def _probabilities(rows: bytes) -> Dict[str, Any]:
+    """Probability report of packed rows, as floats for JSON."""
+    return report_as_floats(probability_report(rows))
+
+
+def _generate(job: Tuple[bytes, str, int, bool, Optional[int], Optional[Constraints]]) -> bytes:
+    """
+    Generate tickets with a fresh seeded generator (runs in the process pool).
+
+    The output equals SorteadorMegaSena(seed=seed).generate_batch on the
+    same history, so seeded requests do not depend on where they run.
+    """
+    history, method, count, unique, seed, constraints = job
+    generator = SorteadorMegaSena(historical_results=list(iter_rows(history)), seed=seed)
+    return generator.generate_batch(method, count, unique=unique, constraints=constraints).tobytes()
+
+
+class GenerationCoalescer:
+    """
+    Merge small generation requests into batched generate_batch calls.
+
+    Requests submitted during one event loop iteration are grouped by
+    (method, constraints) and flushed by a callback scheduled for the next
+    iteration, so coalescing adds no waiting time.
+    """
+
+    def __init__(self, generator: SorteadorMegaSena, max_batch: int = COALESCE_MAX_BATCH):
+        """
+        Args:
+            generator (SorteadorMegaSena): Generator of the merged batches
+            max_batch (int): Most tickets per merged call
+        """
+        self.generator = generator
+        self.max_batch = max_batch
+        self.requests = 0
+        self.batches = 0
+        self._pending: Dict[Tuple[str, Optional[Constraints]], List[Tuple[int, asyncio.Future]]] = {}
+        self._scheduled = False
+
+    def submit(self, method: str, count: int, constraints: Constraints = None) -> asyncio.Future:
+        """
+        Queue a request.
+
+        Returns:
+            Future resolving to the packed rows of the request
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault((method, constraints), []).append((count, future))
+        self.requests += 1
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """Serve every queued request with as few batches as possible."""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        for (method, constraints), requests in pending.items():
+            start = 0
+            while start < len(requests):
+                end, total = start, 0
+                while end < len(requests) and (end == start or total + requests[end][0] <= self.max_batch):
+                    total += requests[end][0]
+                    end += 1
+                self._serve(method, constraints, requests[start:end], total)
+                start = end
+
+    def _serve(self, method: str, constraints: Optional[Constraints], requests, total: int) -> None:
+        """Generate one batch and split it between its requests."""
+        self.batches += 1
+        try:
+            rows = self.generator.generate_batch(method, total, constraints=constraints).tobytes()
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for count, future in requests:
+            end = offset + count * COMBINATION_SIZE
+            if not future.done():
+                future.set_result(rows[offset:end])
+            offset = end
+
+
+class TicketServer:
+    """HTTP front end of a SorteadorMegaSena."""
+
+    def __init__(
+        self,
+        generator: SorteadorMegaSena = None,
+        workers: int = None,
+        coalesce: bool = True
+    ):
+        """
+        Args:
+            generator (SorteadorMegaSena, optional): Generator to serve.
+                Defaults to an instrumented one over the shipped history.
+            workers (int, optional): Process pool size for large jobs.
+                Defaults to the CPU count; 0 runs them in the event loop.
+            coalesce (bool): Merge small concurrent requests
+        """
+        self.generator = generator if generator is not None else SorteadorMegaSena(instrument=True)
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.coalescer = GenerationCoalescer(self.generator) if coalesce else None
+        self.counters = Counter()
+        self.started = time.time()
+        self._pool: Optional[Executor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            '/generate': ({'GET', 'POST'}, self._handle_generate),
+            '/analyze': ({'POST'}, self._handle_analyze),
+            '/check': ({'POST'}, self._handle_check),
+            '/probability': ({'POST'}, self._handle_probability),
+            '/frequency': ({'GET', 'POST'}, self._handle_frequency),
+            '/stats': ({'GET'}, self._handle_stats),
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Start listening; returns the asyncio server."""
+        self._server = await asyncio.start_server(self._connection, host, port)
+        return self._server
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Listen and serve until cancelled."""
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop listening and shut the process pool down."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    async def _offload(self, function, *args):
+        """Run CPU-heavy work in the process pool (inline without one)."""
+        if self.workers < 1:
+            return function(*args)
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.counters['offloaded'] += 1
+        return await asyncio.get_running_loop().run_in_executor(self._pool, function, *args)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one keep-alive connection in order."""
+        self.counters['connections'] += 1
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                keep_alive = await self._request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _request(self, request_line: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Read one request, answer it, and tell whether to keep the connection."""
+        self.counters['requests'] += 1
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            verb, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            self._write(writer, HTTPStatus.BAD_REQUEST, JSON_TYPE, b'{"error": "Malformed request line"}', False)
+            return False
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        body_read = False
+        try:
+            if 'transfer-encoding' in headers:
+                raise _HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported")
+            length = headers.get('content-length', '0')
+            if not length.isdecimal():
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+            length = int(length)
+            if length > MAX_BODY_BYTES:
+                raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Bodies are limited to {MAX_BODY_BYTES} bytes")
+            body = await reader.readexactly(length) if length else b''
+            body_read = True
+            status, content_type, payload = await self._dispatch(verb, target, headers, body)
+        except _HTTPError as e:
+            self.counters['errors'] += 1
+            status, content_type = e.status, JSON_TYPE
+            payload = json.dumps({'error': str(e)}).encode()
+            # An unread body would be parsed as the next request
+            keep_alive = keep_alive and body_read
+        self._write(writer, status, content_type, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: HTTPStatus, content_type: str, payload: bytes, keep_alive: bool) -> None:
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + payload)
+
+    async def _dispatch(self, verb: str, target: str, headers: Dict[str, str], body: bytes):
+        """Route a request; returns (status, content type, payload)."""
+        url = urlsplit(target)
+        route = self._routes.get(url.path)
+        if route is None:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        verbs, handler = route
+        if verb not in verbs:
+            raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{url.path} accepts {', '.join(sorted(verbs))}")
+
+        params: Dict[str, Any] = dict(parse_qsl(url.query))
+        binary_body = headers.get('content-type', '').startswith(BINARY_TYPE)
+        if body and not binary_body:
+            try:
+                document = json.loads(body)
+            except ValueError:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON")
+            if not isinstance(document, dict):
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+            params.update(document)
+
+        try:
+            result = await handler(params, headers, body if binary_body else None)
+        except (ValueError, TypeError, OverflowError) as e:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            _logger.exception("Error serving %s %s", verb, url.path)
+            raise _HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+        self.counters[url.path] += 1
+        if isinstance(result, bytes):
+            return HTTPStatus.OK, BINARY_TYPE, result
+        return HTTPStatus.OK, JSON_TYPE, json.dumps(result).encode()
+
+    async def _handle_generate(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        method = params.get('method', 'mixed')
+        if method not in METHODS:
+            raise ValueError(f"Invalid method. Choose from {list(METHODS)}")
+        count = _int_param(params, 'count', 5)
+        if not 1 <= count <= MAX_TICKETS:
+            raise ValueError(f"'count' must be between 1 and {MAX_TICKETS}")
+        unique = str(params.get('unique', '')).lower() in ('1', 'true', 'yes')
+        seed = _int_param(params, 'seed')
+        fields = {name: _int_param(params, name) for name in _CONSTRAINT_FIELDS.intersection(params)}
+        constraints = Constraints(**fields) if fields else None
+
+        if seed is None and not unique and count <= COALESCE_MAX_TICKETS and self.coalescer is not None:
+            batch = await self.coalescer.submit(method, count, constraints)
+        elif count >= PROCESS_THRESHOLD:
+            if seed is None:
+                seed = self.generator.rng.getrandbits(64)
+            # The current history, so draws added since startup are included
+            history = bytes(self.generator.historical_numbers)
+            batch = await self._offload(_generate, (history, method, count, unique, seed, constraints))
+        elif seed is None:
+            batch = self.generator.generate_batch(method, count, unique, constraints).tobytes()
+        else:
+            # Same stream as a fresh generator with this seed, without building one
+            state = self.generator.rng.getstate()
+            self.generator.rng.seed(seed)
+            try:
+                batch = self.generator.generate_batch(method, count, unique, constraints).tobytes()
+            finally:
+                self.generator.rng.setstate(state)
+
+        if params.get('format') == 'bin' or BINARY_TYPE in headers.get('accept', ''):
+            return batch
+        return {'method': method, 'tickets': [list(row) for row in iter_rows(batch)]}
+
+    async def _handle_analyze(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        if rows is None:
+            rows = _pack(params.get('tickets'))
+        else:
+            _validate_rows(rows)
+        if len(rows) // COMBINATION_SIZE >= PROCESS_THRESHOLD:
+            return await self._offload(_analyze, rows)
+        return _analyze(rows)
+
+    async def _handle_check(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        draw = params.get('draw')
+        if isinstance(draw, str):
+            draw = [int(num) for num in draw.split(',')]
+        if not isinstance(draw, list):
+            raise ValueError("'draw' must list the six drawn numbers")
+        rank_combination(draw)
+        if rows is None:
+            rows = _pack(params.get('tickets'))
+        else:
+            _validate_rows(rows)
+        if len(rows) // COMBINATION_SIZE >= PROCESS_THRESHOLD:
+            return await self._offload(check_pool, draw, rows)
+        return check_pool(draw, rows)
+
+    async def _handle_probability(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        if rows is None:
+            rows = _pack(params.get('tickets'))
+        else:
+            _validate_rows(rows)
+        if len(rows) // COMBINATION_SIZE >= PROBABILITY_PROCESS_THRESHOLD:
+            return await self._offload(_probabilities, rows)
+        return _probabilities(rows)
+
+    async def _handle_frequency(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        bounds = {}
+        for name, key in (('first_contest', 'first'), ('last_contest', 'last')):
+            if params.get(key) is not None:
+                bounds[name] = _int_param(params, key)
+        for name, key in (('start_date', 'start'), ('end_date', 'end')):
+            if params.get(key) is not None:
+                bounds[name] = parse_date(str(params[key]))
+        period = self.generator.range_statistics(**bounds, k=_int_param(params, 'k', COMBINATION_SIZE))
+        for name in ('first_date', 'last_date'):
+            if period[name] is not None:
+                period[name] = period[name].isoformat()
+        return period
+
+    async def _handle_stats(self, params: Dict[str, Any], headers: Dict[str, str], rows: Optional[bytes]):
+        server = dict(self.counters, uptime_s=time.time() - self.started)
+        if self.coalescer is not None:
+            server['coalesced_requests'] = self.coalescer.requests
+            server['coalesced_batches'] = self.coalescer.batches
+        return {'server': server, 'generator': self.generator.stats()}
+
+
+async def _load_connection(
+    host: str,
+    port: int,
+    request: bytes,
+    remaining: List[int],
+    latencies: List[float],
+    statuses: Counter
+) -> None:
+    """Send requests over one keep-alive connection until none remain."""
+    reader, writer = await asyncio.open_connection(host, port)
+    clock = time.perf_counter
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = clock()
+            writer.write(request)
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head.split(b' ', 2)[1])
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line[:15].lower() == b'content-length:':
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            latencies.append(clock() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+
+async def load_test(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    requests: int = 10_000,
+    connections: int = 64,
+    path: str = '/generate?method=mixed&count=5',
+    body: bytes = b'',
+    content_type: str = JSON_TYPE
+) -> Dict[str, Any]:
+    """
+    Measure the throughput and latency of a running server.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        requests (int): Total requests sent
+        connections (int): Concurrent keep-alive connections
+        path (str): Request target; sent as GET without a body, POST with one
+        body (bytes): Request body
+        content_type (str): Content-Type of the body
+
+    Returns:
+        Dictionary with the request count, responses per status, elapsed
+        seconds, requests per second and latency percentiles in ms
+    """
+    verb = 'POST' if body else 'GET'
+    head = f"{verb} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+    if body:
+        head += f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+    request = (head + "\r\n").encode('latin-1') + body
+
+    remaining = [requests]
+    latencies: List[float] = []
+    statuses = Counter()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _load_connection(host, port, request, remaining, latencies, statuses)
+        for _ in range(max(1, min(connections, requests)))
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    report = {
+        'requests': len(latencies),
+        'statuses': dict(statuses),
+        'seconds': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else 0.0,
+    }
+    for name, fraction in (('p50_ms', 0.50), ('p90_ms', 0.90), ('p99_ms', 0.99), ('max_ms', 1.0)):
+        report[name] = latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000 if latencies else 0.0
+    return report
+
+
+def main() -> None:
+    """Run the server or the load-test client from the command line."""
+    parser = argparse.ArgumentParser(description="Serviço HTTP de geração de bilhetes da Mega-Sena")
+    parser.add_argument('--endereco', default=DEFAULT_HOST, help="endereço do servidor")
+    parser.add_argument('--porta', type=int, default=DEFAULT_PORT, help="porta do servidor")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('servir', help="inicia o servidor")
+    serve_parser.add_argument('--processos', type=int, default=None, help="processos para lotes grandes (0: nenhum)")
+    serve_parser.add_argument('--sem-agrupamento', action='store_true', help="não agrupar requisições pequenas")
+
+    load_parser = commands.add_parser('carga', help="mede a vazão de um servidor em execução")
+    load_parser.add_argument('--requisicoes', type=int, default=10_000, help="total de requisições")
+    load_parser.add_argument('--conexoes', type=int, default=64, help="conexões simultâneas")
+    load_parser.add_argument('--caminho', default='/generate?method=mixed&count=5', help="alvo das requisições")
+
+    args = parser.parse_args()
+
+    if args.command == 'servir':
+        server = TicketServer(workers=args.processos, coalesce=not args.sem_agrupamento)
+        print(f"Servindo em http://{args.endereco}:{args.porta}")
+        try:
+            asyncio.run(server.serve_forever(args.endereco, args.porta))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(load_test(
+            args.endereco, args.porta, args.requisicoes, args.conexoes, args.caminho
+        ))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
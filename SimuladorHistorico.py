@@ -0,0 +1,157 @@
+"""
+Strategy backtesting over the draw history.
+
+Replays the history contest by contest: before each contest the generator
+statistics reflect the prior draws only, K tickets are generated per
+strategy and scored against the actual result. Each worker builds its
+generator once for the first contest of a contiguous range and then takes
+in one draw at a time with add_draw. Every contest uses its own seed, so
+results do not depend on the number of workers.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+from Amostragem import child_seed
+from ConferirBilhetes import PRIZE_TIERS, match_counts, tier_counts
+from GerarNumeros import SorteadorMegaSena
+from HistoricoSorteios import DrawStore
+from IndiceCombinacoes import COMBINATION_SIZE, iter_rows
+from Metodos import METHODS
+
+
+def _empty_report() -> Dict[str, int]:
+    """Return a zeroed per-strategy report."""
+    report = {'contests': 0, 'tickets': 0}
+    report.update((tier, 0) for tier in PRIZE_TIERS)
+    return report
+
+
+def _run_contests(job: Tuple[bytes, range, Sequence[str], int, int]) -> Dict[str, Dict[str, int]]:
+    """
+    Backtest a contiguous range of contests (runs inside a worker process).
+
+    Args:
+        job: Flat history numbers, contest indices to replay, strategies,
+            tickets per contest and root seed
+
+    Returns:
+        Per-strategy report for the range
+    """
+    history, indices, methods, tickets_per_contest, seed = job
+    reports = {method: _empty_report() for method in methods}
+    if not indices:
+        return reports
+
+    generator = SorteadorMegaSena(
+        historical_results=list(iter_rows(history[:indices[0] * COMBINATION_SIZE]))
+    )
+    for index in indices:
+        start = index * COMBINATION_SIZE
+        draw = history[start:start + COMBINATION_SIZE]
+        generator.rng.seed(child_seed(seed, index))
+
+        for method in methods:
+            batch = generator.generate_batch(method=method, num_combinations=tickets_per_contest)
+            report = reports[method]
+            report['contests'] += 1
+            report['tickets'] += tickets_per_contest
+            for tier, hits in tier_counts(match_counts(batch, draw)).items():
+                report[tier] += hits
+
+        generator.add_draw(draw)
+
+    return reports
+
+
+def backtest(
+    history: Union[DrawStore, Iterable[Sequence[int]]] = None,
+    methods: Sequence[str] = METHODS,
+    tickets_per_contest: int = 1000,
+    min_history: int = 1,
+    workers: int = None,
+    seed: int = 0
+) -> Dict[str, Dict[str, int]]:
+    """
+    Replay the history and score every strategy contest by contest.
+
+    Args:
+        history (DrawStore | Iterable[Sequence[int]], optional): Draws in
+            chronological order. Defaults to the shipped draw store.
+        methods (Sequence[str]): Strategies accepted by generate_batch
+        tickets_per_contest (int): Tickets generated per strategy and contest
+        min_history (int): Number of initial draws used only as history
+        workers (int, optional): Worker processes. Defaults to the CPU count;
+            1 runs in the current process.
+        seed (int): Root seed; each contest derives its own stream from it
+
+    Returns:
+        Dictionary mapping each strategy to its contests, tickets and hits
+        per prize tier (sena, quina, quadra)
+
+    Raises:
+        ValueError: If min_history is smaller than 1
+    """
+    if min_history < 1:
+        raise ValueError("At least one prior draw is needed to build statistics")
+
+    if history is None:
+        history = DrawStore()
+    numbers = bytes(history.numbers) if isinstance(history, DrawStore) else bytes(
+        num for draw in history for num in sorted(draw)
+    )
+
+    indices = range(min_history, len(numbers) // COMBINATION_SIZE)
+    workers = workers or os.cpu_count() or 1
+    # Contiguous ranges: each one pays for a single generator build
+    chunk_count = min(len(indices), workers) or 1
+    bounds = [len(indices) * part // chunk_count for part in range(chunk_count + 1)]
+    jobs = [
+        (numbers, indices[low:high], tuple(methods), tickets_per_contest, seed)
+        for low, high in zip(bounds, bounds[1:])
+    ]
+
+    if workers == 1:
+        partials = map(_run_contests, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(_run_contests, jobs))
+
+    reports = {method: _empty_report() for method in methods}
+    for partial in partials:
+        for method, report in partial.items():
+            for key, value in report.items():
+                reports[method][key] += value
+    return reports
+
+
+def main() -> None:
+    """Run a backtest from the command line and print the results."""
+    parser = argparse.ArgumentParser(description="Simulação histórica das estratégias de geração")
+    parser.add_argument('--bilhetes', type=int, default=1000, help="bilhetes por estratégia e concurso")
+    parser.add_argument('--historico-minimo', type=int, default=1, help="concursos usados apenas como histórico")
+    parser.add_argument('--processos', type=int, default=None, help="processos paralelos")
+    parser.add_argument('--semente', type=int, default=0, help="semente da simulação")
+    parser.add_argument('--metodos', nargs='+', default=list(METHODS), choices=METHODS)
+    args = parser.parse_args()
+
+    reports = backtest(
+        methods=args.metodos,
+        tickets_per_contest=args.bilhetes,
+        min_history=args.historico_minimo,
+        workers=args.processos,
+        seed=args.semente
+    )
+
+    print(f"{'Método':<18}{'Concursos':>10}{'Bilhetes':>14}{'Senas':>8}{'Quinas':>8}{'Quadras':>9}")
+    for method, report in reports.items():
+        print(
+            f"{method:<18}{report['contests']:>10}{report['tickets']:>14}"
+            f"{report['sena']:>8}{report['quina']:>8}{report['quadra']:>9}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,119 @@
+import queue
+import threading
 import tkinter as tk
+import tkinter.font as tkfont
+from array import array
 from tkinter import ttk, messagebox
-from typing import List, Dict
+from typing import Callable, List, Dict, Sequence, Union
 
+from AnalisadorCombinacoes import CombinationAnalyzer
 from GerarNumeros import SorteadorMegaSena
+from HistoricoSorteios import parse_date
+from Instrumentacao import timed
+from Probabilidades import odds, probability_report
+
+MAX_COMBINATIONS = 1_000_000
+
+# Combinations generated between two progress updates / cancel checks
+GENERATION_CHUNK_SIZE = 1 << 14
+
+# Interval, in milliseconds, between polls of the generation worker
+POLL_INTERVAL_MS = 50
+
+# Interval, in milliseconds, between refreshes of the statistics status bar
+STATS_INTERVAL_MS = 1000
+
+# Largest result whose exact prize probabilities are computed and shown
+PROBABILITY_MAX_COMBINATIONS = 10_000
+
+
+class VirtualResultsView(ttk.Frame):
+    """
+    Scrollable text view that only renders the rows currently visible.
+    
+    The content is described by a row count and a function returning the 
+    text of a row, so showing a million combinations costs the same as 
+    showing ten.
+    """
+    
+    def __init__(self, master: tk.Misc, font=("Courier", 12), **kwargs):
+        """
+        Initialize an empty results view.
+        
+        Args:
+            master (tk.Misc): Parent widget
+            font: Font of the rows
+        """
+        super().__init__(master, **kwargs)
+        self._row_count = 0
+        self._row_text: Callable[[int], str] = str
+        self._first_row = 0
+        self._line_height = tkfont.Font(font=font).metrics('linespace')
+        
+        self.text = tk.Text(self, height=15, width=50, font=font, wrap=tk.NONE, state=tk.DISABLED)
+        self.text.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.text.bind("<Configure>", lambda event: self._render())
+        self.text.bind("<MouseWheel>", lambda event: self._scroll_by(-event.delta // 120 * 3))
+        self.text.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda event: self._scroll_by(3))
+    
+    def set_rows(self, row_count: int, row_text: Callable[[int], str]) -> None:
+        """
+        Replace the content of the view.
+        
+        Args:
+            row_count (int): Total number of rows
+            row_text (Callable[[int], str]): Returns the text of a row index
+        """
+        self._row_count = row_count
+        self._row_text = row_text
+        self._first_row = 0
+        self._render()
+    
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.set_rows(0, str)
+    
+    def _visible_rows(self) -> int:
+        """Number of rows that fit in the text widget."""
+        return max(1, self.text.winfo_height() // self._line_height)
+    
+    def _scroll_by(self, rows: int) -> None:
+        """Scroll the view by a number of rows."""
+        self._first_row += rows
+        self._render()
+    
+    def _on_scroll(self, action: str, amount: str, unit: str = None) -> None:
+        """Handle scrollbar commands ('moveto' fraction or 'scroll' steps)."""
+        if action == 'moveto':
+            self._first_row = int(float(amount) * self._row_count)
+        elif unit == 'pages':
+            self._first_row += int(amount) * self._visible_rows()
+        else:
+            self._first_row += int(amount)
+        self._render()
+    
+    def _render(self) -> None:
+        """Draw the visible rows and update the scrollbar."""
+        visible = self._visible_rows()
+        self._first_row = max(0, min(self._first_row, self._row_count - visible))
+        last_row = min(self._row_count, self._first_row + visible)
+        
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(
+            self._row_text(row) for row in range(self._first_row, last_row)
+        ))
+        self.text.configure(state=tk.DISABLED)
+        
+        if self._row_count:
+            self.scrollbar.set(self._first_row / self._row_count, last_row / self._row_count)
+        else:
+            self.scrollbar.set(0, 1)
 
 class MegaSenaGeneratorApp:
     """
@@ -22,13 +133,17 @@ class MegaSenaGeneratorApp:
         self.master = master
         self._setup_window()
         
-        self.generator = SorteadorMegaSena()
+        self.generator = SorteadorMegaSena(instrument=True)
+        self._worker = None
+        self._cancel_event = threading.Event()
+        self._updates = queue.Queue()
         self._create_widgets()
+        self._update_stats_bar()
 
     def _setup_window(self) -> None:
         """Configure the main application window."""
         self.master.title("Gerador de Números da Mega-Sena")
-        self.master.geometry("600x700")
+        self.master.geometry("600x820")
         self.master.resizable(False, False)
         
         # Configure styles
@@ -43,8 +158,14 @@ class MegaSenaGeneratorApp:
         
         self._create_combinations_selection()
         
+        self._create_period_filter()
+        
         self._create_generate_button()
         
+        self._create_progress_display()
+        
+        self._create_stats_bar()
+        
         self._create_results_display()
 
     def _create_method_selection(self) -> None:
@@ -60,7 +181,12 @@ class MegaSenaGeneratorApp:
             ("Números Mais Frequentes", "most_frequent"),
             ("Números Menos Frequentes", "least_frequent"),
             ("Método Misto", "mixed"),
-            ("Aleatório", "random")
+            ("Aleatório", "random"),
+            ("Ponderado pela Frequência", "weighted"),
+            ("Inversamente Ponderado", "inverse_weighted"),
+            ("Quentes (últimos concursos)", "hot"),
+            ("Frios (últimos concursos)", "cold"),
+            ("Mais Atrasados", "overdue")
         ]
         
         for label, method in methods:
@@ -84,104 +210,326 @@ class MegaSenaGeneratorApp:
         num_combinations_spinbox = ttk.Spinbox(
             self.master, 
             from_=1, 
-            to=10, 
+            to=MAX_COMBINATIONS, 
             textvariable=self.num_combinations_var, 
             width=5
         )
         num_combinations_spinbox.pack(pady=5)
 
+    def _create_period_filter(self) -> None:
+        """Create the date range inputs of the per-period frequencies."""
+        period_frame = ttk.Frame(self.master)
+        period_frame.pack(pady=10)
+        
+        ttk.Label(period_frame, text="Período (dd/mm/aaaa):").pack(side=tk.LEFT, padx=5)
+        self.period_start_var = tk.StringVar(value="")
+        ttk.Entry(period_frame, textvariable=self.period_start_var, width=11).pack(side=tk.LEFT)
+        ttk.Label(period_frame, text="a").pack(side=tk.LEFT, padx=5)
+        self.period_end_var = tk.StringVar(value="")
+        ttk.Entry(period_frame, textvariable=self.period_end_var, width=11).pack(side=tk.LEFT)
+        ttk.Button(
+            period_frame, 
+            text="Frequência no Período", 
+            command=self._show_period_frequencies
+        ).pack(side=tk.LEFT, padx=5)
+
+    def _show_period_frequencies(self) -> None:
+        """
+        Display the number frequencies between the chosen dates.
+        
+        Read off the generator's contest index in O(MAX_NUMBER), so it runs 
+        on the main thread; an empty date leaves that side open.
+        """
+        try:
+            start, end = (
+                parse_date(text) if text.strip() else None
+                for text in (self.period_start_var.get(), self.period_end_var.get())
+            )
+            period = self.generator.range_statistics(start_date=start, end_date=end)
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
+        
+        if not period['draws']:
+            lines = ["Nenhum concurso no período."]
+        else:
+            lines = [
+                f"Concursos {period['first_contest']} a {period['last_contest']} "
+                f"({period['first_date']:%d/%m/%Y} a {period['last_date']:%d/%m/%Y})",
+                f"Sorteios no período: {period['draws']}",
+                f"Mais frequentes: {period['most_frequent']}",
+                f"Menos frequentes: {period['least_frequent']}",
+                "",
+                "Frequência dos Números:",
+            ] + [
+                f"Número {num}: {count} vezes" 
+                for num, count in sorted(period['counts'].items(), key=lambda x: x[1], reverse=True)
+            ]
+        self.results_view.set_rows(len(lines), lines.__getitem__)
+
     def _create_generate_button(self) -> None:
-        """Create the generate combinations button."""
-        generate_button = ttk.Button(
-            self.master, 
+        """Create the generate and cancel buttons."""
+        buttons_frame = ttk.Frame(self.master)
+        buttons_frame.pack(pady=20)
+        
+        self.generate_button = ttk.Button(
+            buttons_frame, 
             text="Gerar Combinações", 
             command=self._generate_and_display
         )
-        generate_button.pack(pady=20)
-
-    def _create_results_display(self) -> None:
-        """Create the results display area with scrollbar."""
-        self.results_frame = ttk.Frame(self.master)
-        self.results_frame.pack(pady=10, expand=True, fill=tk.BOTH)
-        
-        self.results_text = tk.Text(
-            self.results_frame, 
-            height=15, 
-            width=50, 
-            font=("Courier", 12)
-        )
-        self.results_text.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self.generate_button.pack(side=tk.LEFT, padx=5)
         
-        scrollbar = ttk.Scrollbar(
-            self.results_frame, 
-            orient=tk.VERTICAL, 
-            command=self.results_text.yview
+        self.cancel_button = ttk.Button(
+            buttons_frame, 
+            text="Cancelar", 
+            command=self._cancel_generation, 
+            state=tk.DISABLED
         )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+    def _create_progress_display(self) -> None:
+        """Create the generation progress bar and status line."""
+        self.progress_var = tk.IntVar(value=0)
+        self.progress_bar = ttk.Progressbar(
+            self.master, 
+            variable=self.progress_var, 
+            maximum=1, 
+            length=400
+        )
+        self.progress_bar.pack(pady=5)
         
-        self.results_text.configure(yscrollcommand=scrollbar.set)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self.master, textvariable=self.status_var).pack()
+
+    def _create_stats_bar(self) -> None:
+        """Create the status bar with the generator's instrumentation."""
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(
+            self.master, 
+            textvariable=self.stats_var, 
+            relief=tk.SUNKEN, 
+            anchor=tk.W, 
+            font=("Arial", 9)
+        ).pack(side=tk.BOTTOM, fill=tk.X)
+
+    def _update_stats_bar(self) -> None:
+        """Show the latest stats() snapshot and schedule the next refresh."""
+        stats = self.generator.stats()
+        if stats['enabled']:
+            calls = sum(stats['calls'].values())
+            tickets = f"{stats['total_tickets']:,}".replace(',', '.')
+            parts = [f"Gerações: {calls}", f"Bilhetes: {tickets}"]
+            for operation, label in (('generate', "Geração"), ('analyze', "Análise")):
+                timing = stats['timings'].get(operation)
+                if timing is not None:
+                    parts.append(
+                        f"{label} p50 {timing['p50_s'] * 1000:.1f} ms, "
+                        f"p99 {timing['p99_s'] * 1000:.1f} ms"
+                    )
+            self.stats_var.set(" | ".join(parts))
+        self.master.after(STATS_INTERVAL_MS, self._update_stats_bar)
+
+    def _create_results_display(self) -> None:
+        """Create the virtualized results display area with scrollbar."""
+        self.results_view = VirtualResultsView(self.master, font=("Courier", 12))
+        self.results_view.pack(pady=10, expand=True, fill=tk.BOTH)
 
     def _generate_and_display(self) -> None:
         """
         Generate lottery number combinations and display results.
         
-        Handles the generation process, including error handling 
-        and result display.
+        Generation and analysis run on a worker thread; progress, errors 
+        and the final results are handed back to the Tk main loop through 
+        a queue polled with after().
         """
-        self.results_text.delete(1.0, tk.END)
+        if self._worker is not None:
+            return
         
         method = self.method_var.get()
-        num_combinations = self.num_combinations_var.get()
+        try:
+            num_combinations = self.num_combinations_var.get()
+        except tk.TclError:
+            messagebox.showerror("Erro", "Número de combinações inválido")
+            return
+        
+        self.results_view.clear()
+        self.progress_bar.configure(maximum=max(num_combinations, 1))
+        self.progress_var.set(0)
+        self.status_var.set("Gerando combinações...")
+        self.generate_button.configure(state=tk.DISABLED)
+        self.cancel_button.configure(state=tk.NORMAL)
+        
+        self._cancel_event = threading.Event()
+        self._updates = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run_generation, 
+            args=(method, num_combinations, self._cancel_event, self._updates), 
+            daemon=True
+        )
+        self._worker.start()
+        self.master.after(POLL_INTERVAL_MS, self._poll_generation)
+
+    def _run_generation(
+        self, 
+        method: str, 
+        num_combinations: int, 
+        cancel_event: threading.Event, 
+        updates: queue.Queue
+    ) -> None:
+        """
+        Generate and analyze combinations chunk by chunk (worker thread).
         
+        Never touches Tk widgets; everything is reported through `updates`.
+        """
         try:
-            combinations = self.generator.generate_combinations(
+            batch = array('B')
+            analyzer = CombinationAnalyzer()
+            for chunk in self.generator.iter_batches(
                 method=method, 
-                num_combinations=num_combinations
-            )
+                num_combinations=num_combinations, 
+                chunk_size=GENERATION_CHUNK_SIZE
+            ):
+                if cancel_event.is_set():
+                    updates.put(('cancelled', None))
+                    return
+                batch.extend(chunk)
+                with timed(self.generator.instrumentation, 'analyze'):
+                    analyzer.update(chunk)
+                updates.put(('progress', analyzer.total_combinations))
+            probabilities = None
+            if num_combinations <= PROBABILITY_MAX_COMBINATIONS:
+                with timed(self.generator.instrumentation, 'probability'):
+                    probabilities = probability_report(batch)
+            updates.put(('done', (method, num_combinations, batch, analyzer.result(), probabilities)))
+        except Exception as e:
+            updates.put(('error', e))
+
+    def _poll_generation(self) -> None:
+        """Apply the worker's updates on the main thread."""
+        while True:
+            try:
+                kind, payload = self._updates.get_nowait()
+            except queue.Empty:
+                self.master.after(POLL_INTERVAL_MS, self._poll_generation)
+                return
             
-            analysis = self.generator.analyze_combinations(combinations)
+            if kind == 'progress':
+                self.progress_var.set(payload)
+                self.status_var.set(f"Geradas {payload} combinações...")
+                continue
             
-            self._display_results(method, num_combinations, combinations, analysis)
-        
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
+            self._finish_generation()
+            if kind == 'done':
+                self.status_var.set("")
+                self._display_results(*payload)
+            elif kind == 'cancelled':
+                self.status_var.set("Geração cancelada")
+            else:
+                self.status_var.set("")
+                messagebox.showerror("Erro", str(payload))
+            return
+
+    def _cancel_generation(self) -> None:
+        """Ask the worker to stop at the next chunk."""
+        self._cancel_event.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+
+    def _finish_generation(self) -> None:
+        """Restore the controls once the worker is done."""
+        self._worker = None
+        self.generate_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
 
     def _display_results(
         self, 
         method: str, 
         num_combinations: int, 
-        combinations: List[List[int]], 
-        analysis: Dict[str, any]
+        combinations: Union[List[List[int]], Sequence[int]], 
+        analysis: Dict[str, any],
+        probabilities: Dict[str, any] = None
     ) -> None:
         """
         Format and display the generated combinations and analysis.
         
+        Rows are formatted on demand by the virtualized view, so only the 
+        visible ones are ever rendered.
+        
         Args:
             method (str): Generation method used
             num_combinations (int): Number of combinations generated
-            combinations (List[List[int]]): Generated number combinations
+            combinations (List[List[int]] | Sequence[int]): Generated number 
+                combinations, or a flat batch from generate_batch
             analysis (Dict[str, any]): Analysis of the generated combinations
+            probabilities (Dict[str, any], optional): Report from
+                Probabilidades.probability_report, shown after the analysis
         """
-        self.results_text.insert(tk.END, f"Método: {method}\n")
-        self.results_text.insert(tk.END, f"Número de Combinações: {num_combinations}\n\n")
+        size = SorteadorMegaSena.COMBINATION_SIZE
+        if isinstance(combinations, array):
+            combination_count = len(combinations) // size
+        else:
+            combination_count = len(combinations)
         
-        self.results_text.insert(tk.END, "Combinações Geradas:\n")
-        for idx, combo in enumerate(combinations, 1):
-            self.results_text.insert(tk.END, f"{idx}. {combo}\n")
+        def combination_at(idx: int) -> List[int]:
+            if isinstance(combinations, array):
+                return combinations[idx * size:(idx + 1) * size].tolist()
+            return combinations[idx]
         
-        self.results_text.insert(tk.END, "\nAnálise das Combinações:\n")
-        self.results_text.insert(tk.END, 
-            f"Total de Combinações Únicas: {analysis['unique_combinations']}\n\n"
-        )
+        header = [
+            f"Método: {method}",
+            f"Número de Combinações: {num_combinations}",
+            "",
+            "Combinações Geradas:",
+        ]
         
-        self.results_text.insert(tk.END, "Frequência dos Números:\n")
         sorted_frequency = sorted(
             analysis['frequency_analysis'].items(), 
             key=lambda x: x[1], 
             reverse=True
         )
-        for num, freq in sorted_frequency:
-            self.results_text.insert(tk.END, f"Número {num}: {freq} vezes\n")
+        footer = [
+            "",
+            "Análise das Combinações:",
+            f"Total de Combinações Únicas: {analysis['unique_combinations']}",
+            "",
+            "Frequência dos Números:",
+        ] + [f"Número {num}: {freq} vezes" for num, freq in sorted_frequency]
+        if probabilities is not None:
+            footer += self._probability_lines(probabilities)
+        
+        footer_start = len(header) + combination_count
+        
+        def row_text(row: int) -> str:
+            if row < len(header):
+                return header[row]
+            if row < footer_start:
+                idx = row - len(header)
+                return f"{idx + 1}. {combination_at(idx)}"
+            return footer[row - footer_start]
+        
+        self.results_view.set_rows(footer_start + len(footer), row_text)
+
+    @staticmethod
+    def _probability_lines(probabilities: Dict[str, any]) -> List[str]:
+        """Format a probability report as footer lines."""
+        lines = [
+            "",
+            "Probabilidades Exatas por Sorteio:",
+            f"Prêmios esperados: {float(probabilities['expected_prizes']):.4g}",
+        ]
+        for tier, report in probabilities['tiers'].items():
+            at_least_one = report['at_least_one']
+            if at_least_one is not None:
+                chance = f"{odds(at_least_one)} ({float(at_least_one):.6%})"
+            else:
+                low, high = report['at_least_one_bounds']
+                chance = f"entre {float(low):.6%} e {float(high):.6%}"
+            lines += [
+                f"{tier.capitalize()} ({report['matches']} acertos): {odds(report['probability'])} por bilhete",
+                f"  Ganhadores esperados: {float(report['expected_winners']):.4g}"
+                f" (desvio padrão {float(report['variance']) ** 0.5:.4g})",
+                f"  Ao menos um bilhete com {report['matches']}+ acertos: {chance}",
+            ]
+        return lines
 
 def main():
     """
@@ -0,0 +1,243 @@
+"""
+Command line entry point for the Mega-Sena generator.
+
+Runs the GerarNumeros engine headless. Only argparse and the strategy
+names (Metodos) are imported up front: the engine is imported once the
+arguments are parsed, and tkinter only when the GUI is requested with
+--gui.
+"""
+
+import argparse
+import os
+import sys
+
+from Metodos import METHODS
+
+FORMATS = ('texto', 'json', 'csv', 'jsonl', 'bin')
+
+# Formats written chunk by chunk through ExportarBilhetes, in constant memory
+STREAM_FORMATS = ('csv', 'jsonl', 'bin')
+
+# Budget for a fresh interpreter to import the CLI and the generation engine
+IMPORT_TIME_BUDGET_MS = 50.0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog='SorteadorMegaSena',
+        description="Gerador de números da Mega-Sena"
+    )
+    parser.add_argument('-m', '--metodo', choices=METHODS, default='mixed', help="método de geração")
+    parser.add_argument('-n', '--quantidade', type=int, default=5, help="número de combinações")
+    parser.add_argument('-s', '--semente', type=int, default=None, help="semente para resultados reproduzíveis")
+    parser.add_argument('-f', '--formato', choices=FORMATS, default='texto', help="formato de saída")
+    parser.add_argument('-o', '--saida', default=None, help="arquivo de saída (padrão: saída padrão)")
+    parser.add_argument('-p', '--processos', type=int, default=1, help="processos paralelos de geração")
+    parser.add_argument('--unicos', action='store_true', help="não repetir combinações")
+    parser.add_argument('--soma', nargs=2, type=int, metavar=('MIN', 'MAX'), help="faixa da soma das dezenas")
+    parser.add_argument('--impares', nargs=2, type=int, metavar=('MIN', 'MAX'), help="faixa da quantidade de dezenas ímpares")
+    parser.add_argument('--max-por-dezena', type=int, default=None, help="máximo de dezenas por faixa (1-10, 11-20, ...)")
+    parser.add_argument('--max-sequencia', type=int, default=None, help="maior sequência de dezenas consecutivas")
+    parser.add_argument('--analise', action='store_true', help="incluir a análise das combinações")
+    parser.add_argument('--sem-cache', action='store_true', help="não usar o cache de estatísticas em disco")
+    parser.add_argument('--estatisticas', metavar='ARQUIVO', default=None,
+                        help="gravar contadores e tempos de execução (JSON por linha) neste arquivo")
+    parser.add_argument('--intervalo-estatisticas', type=float, default=60.0, metavar='SEGUNDOS',
+                        help="intervalo entre gravações das estatísticas (padrão: %(default)s)")
+    parser.add_argument('--gui', action='store_true', help="abrir a interface gráfica")
+    parser.add_argument(
+        '--medir-importacao',
+        action='store_true',
+        help=f"medir o tempo de importação (orçamento: {IMPORT_TIME_BUDGET_MS:.0f} ms)"
+    )
+    return parser
+
+
+def measure_import_time(repeat: int = 5) -> float:
+    """
+    Measure how long a fresh interpreter takes to import the CLI and engine.
+
+    Args:
+        repeat (int): Number of fresh interpreters to time
+
+    Returns:
+        Best import time in milliseconds
+    """
+    import subprocess
+
+    code = (
+        "import time; start = time.perf_counter(); "
+        "import app, GerarNumeros; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    return min(
+        float(subprocess.run(
+            [sys.executable, '-c', code],
+            capture_output=True, check=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout)
+        for _ in range(repeat)
+    )
+
+
+def _write_analysis(output, analysis) -> None:
+    """Write the analysis of the generated combinations as text."""
+    output.write(f"\nTotal de Combinações Únicas: {analysis['unique_combinations']}\n")
+    for num, freq in sorted(analysis['frequency_analysis'].items(), key=lambda x: x[1], reverse=True):
+        output.write(f"Número {num}: {freq} vezes\n")
+
+
+def _write_output(output, combinations, analysis, output_format: str) -> None:
+    """Write the generated combinations (and analysis) as text or JSON."""
+    if output_format == 'json':
+        import json
+
+        document = {'combinations': combinations}
+        if analysis is not None:
+            document['analysis'] = analysis
+        json.dump(document, output)
+        output.write('\n')
+    else:
+        output.writelines(f"{idx}. {combo}\n" for idx, combo in enumerate(combinations, 1))
+        if analysis is not None:
+            _write_analysis(output, analysis)
+
+
+def _constraints(args):
+    """Build the Restricoes.Constraints requested on the command line, if any."""
+    if not (args.soma or args.impares or args.max_por_dezena or args.max_sequencia):
+        return None
+
+    from Restricoes import Constraints
+
+    defaults = Constraints()
+    return Constraints(
+        min_sum=args.soma[0] if args.soma else defaults.min_sum,
+        max_sum=args.soma[1] if args.soma else defaults.max_sum,
+        min_odd=args.impares[0] if args.impares else defaults.min_odd,
+        max_odd=args.impares[1] if args.impares else defaults.max_odd,
+        max_per_decade=args.max_por_dezena or defaults.max_per_decade,
+        max_run=args.max_sequencia or defaults.max_run
+    )
+
+
+def _stream_output(parser, generator, args, constraints) -> None:
+    """Generate and write tickets chunk by chunk in one of STREAM_FORMATS."""
+    from AnalisadorCombinacoes import CombinationAnalyzer
+    from ExportarBilhetes import format_chunk, write_tickets
+
+    if args.saida is None and args.formato == 'bin':
+        parser.error("o formato bin requer --saida")
+
+    if args.unicos:
+        chunks = iter([generator.generate_batch(args.metodo, args.quantidade, unique=True, constraints=constraints)])
+    elif args.processos > 1:
+        chunks = iter([generator.generate_parallel(
+            args.metodo, args.quantidade, workers=args.processos, constraints=constraints
+        )])
+    else:
+        chunks = generator.iter_batches(args.metodo, args.quantidade, constraints=constraints)
+
+    analyzer = CombinationAnalyzer() if args.analise else None
+    if analyzer is not None:
+        chunks = (analyzer.update(chunk) and chunk for chunk in chunks)
+
+    if args.saida is None:
+        for chunk in chunks:
+            sys.stdout.write(format_chunk(chunk, args.formato).decode('ascii'))
+    else:
+        write_tickets(chunks, args.saida, args.formato)
+
+    if analyzer is not None:
+        # Keep the analysis out of the data when the data goes to stdout
+        _write_analysis(sys.stdout if args.saida else sys.stderr, analyzer.result())
+
+
+def main(argv=None) -> int:
+    """
+    Main entry point for the command line interface.
+
+    Args:
+        argv (List[str], optional): Arguments; defaults to sys.argv[1:]
+
+    Returns:
+        Process exit status
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        from SorteadorMega import main as gui_main
+
+        gui_main()
+        return 0
+
+    if args.medir_importacao:
+        elapsed = measure_import_time()
+        print(f"Tempo de importação: {elapsed:.1f} ms (orçamento: {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+        return 0 if elapsed <= IMPORT_TIME_BUDGET_MS else 1
+
+    from CacheEstatisticas import StatisticsCache
+    from GerarNumeros import SorteadorMegaSena
+
+    if args.processos < 1:
+        parser.error("--processos deve ser pelo menos 1")
+    if args.processos > 1 and args.unicos:
+        parser.error("--unicos não pode ser combinado com --processos")
+    if args.intervalo_estatisticas <= 0:
+        parser.error("--intervalo-estatisticas deve ser positivo")
+
+    constraints = _constraints(args)
+    generator = SorteadorMegaSena(
+        cache=None if args.sem_cache else StatisticsCache(),
+        seed=args.semente,
+        instrument=args.estatisticas is not None
+    )
+    if args.estatisticas is None:
+        return _generate(parser, generator, args, constraints)
+    dumper = generator.start_stats_dump(args.intervalo_estatisticas, args.estatisticas)
+    try:
+        return _generate(parser, generator, args, constraints)
+    finally:
+        dumper.stop()
+
+
+def _generate(parser, generator, args, constraints) -> int:
+    """Generate the requested tickets and write them out."""
+    from IndiceCombinacoes import iter_rows
+
+    if args.formato in STREAM_FORMATS:
+        try:
+            _stream_output(parser, generator, args, constraints)
+        except ValueError as e:
+            parser.error(str(e))
+        return 0
+
+    try:
+        if args.processos > 1:
+            batch = generator.generate_parallel(
+                args.metodo, args.quantidade, workers=args.processos, constraints=constraints
+            )
+            combinations = [list(row) for row in iter_rows(batch)]
+        else:
+            combinations = generator.generate_combinations(
+                method=args.metodo,
+                num_combinations=args.quantidade,
+                unique=args.unicos,
+                constraints=constraints
+            )
+    except ValueError as e:
+        parser.error(str(e))
+    analysis = generator.analyze_combinations(combinations) if args.analise else None
+
+    if args.saida is None:
+        _write_output(sys.stdout, combinations, analysis, args.formato)
+    else:
+        with open(args.saida, 'w', encoding='utf-8', newline='') as output:
+            _write_output(output, combinations, analysis, args.formato)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
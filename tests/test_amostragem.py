@@ -0,0 +1,80 @@
+"""Tests of the sampling primitives of Amostragem."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from Amostragem import AliasTable, sample_indices
+
+
+@pytest.mark.parametrize('population, k', [(1, 1), (10, 10), (1000, 1000), (1000, 3), (10 ** 12, 500)])
+def test_sample_indices_are_distinct_and_in_range(population, k):
+    sample = sample_indices(population, k, random.Random(1))
+    assert len(sample) == len(set(sample)) == k
+    assert all(0 <= index < population for index in sample)
+
+
+def test_sample_indices_of_the_whole_population_is_a_permutation():
+    assert sorted(sample_indices(500, 500, random.Random(2))) == list(range(500))
+
+
+def test_sample_indices_are_uniform():
+    # Every ordered pair of 5 indices should come up about equally often
+    rng = random.Random(3)
+    counts = Counter(tuple(sample_indices(5, 2, rng)) for _ in range(20000))
+    assert len(counts) == 20
+    expected = 20000 / 20
+    chi_square = sum((count - expected) ** 2 / expected for count in counts.values())
+    # 19 degrees of freedom: p = 0.001 at 43.8
+    assert chi_square < 43.8
+
+
+@pytest.mark.parametrize('population, k', [(5, 6), (0, 1), (5, -1)])
+def test_sample_indices_beyond_the_population(population, k):
+    with pytest.raises(ValueError):
+        sample_indices(population, k)
+
+
+def _alias_probabilities(table):
+    """Exact probability of each item: its own column share plus the aliased ones."""
+    size = len(table)
+    shares = Counter()
+    for item, probability, alias in zip(table._items, table._probabilities, table._aliases):
+        shares[item] += probability / size
+        shares[alias] += (1 - probability) / size
+    return shares
+
+
+@pytest.mark.parametrize('weights', [
+    [1, 1, 1, 1],
+    [5, 1, 0, 3, 0.5, 10],
+    [1 / (count + 1) for count in range(60)],
+    [0, 0, 7],
+])
+def test_alias_table_matches_its_weights(weights):
+    items = [f'item{index}' for index in range(len(weights))]
+    shares = _alias_probabilities(AliasTable(items, weights))
+    total = sum(weights)
+    for item, weight in zip(items, weights):
+        assert shares[item] == pytest.approx(weight / total, abs=1e-12)
+
+
+def test_alias_table_samples_follow_the_weights():
+    weights = [5, 1, 0, 3, 0.5, 10, 2, 2]
+    draws = 100000
+    counts = Counter(AliasTable(range(len(weights)), weights).sample(draws, random.Random(4)))
+    assert counts[2] == 0
+    total = sum(weights)
+    chi_square = sum(
+        (counts[item] - draws * weight / total) ** 2 / (draws * weight / total)
+        for item, weight in enumerate(weights) if weight
+    )
+    # 6 degrees of freedom: p = 0.001 at 22.46
+    assert chi_square < 22.46
+
+
+@pytest.mark.parametrize('items, weights', [([1, 2], [1]), ([1, 2], [0, 0]), ([1, 2], [1, -1])])
+def test_alias_table_rejects_invalid_weights(items, weights):
+    with pytest.raises(ValueError):
+        AliasTable(items, weights)
@@ -0,0 +1,81 @@
+"""Tests of the streaming CombinationAnalyzer against a dict-based analysis."""
+
+import random
+from array import array
+from collections import Counter
+
+import pytest
+
+from AnalisadorCombinacoes import CombinationAnalyzer
+from Bilhetes import TicketArray
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, RANK_TYPECODE, mask_rows, rank_combination
+
+NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+
+
+def _reference(combinations):
+    """The v1.0 analysis, with tickets compared as sets of numbers."""
+    counts = Counter(num for combo in combinations for num in combo)
+    return {
+        'total_combinations': len(combinations),
+        'unique_combinations': len({tuple(sorted(combo)) for combo in combinations}),
+        'frequency_analysis': {num: counts[num] for num in NUMBERS if counts[num]}
+    }
+
+
+def _tickets(seed, size):
+    """Random tickets in shuffled order, with repeats."""
+    rng = random.Random(seed)
+    tickets = [rng.sample(NUMBERS, COMBINATION_SIZE) for _ in range(size)]
+    tickets += [rng.sample(ticket, COMBINATION_SIZE) for ticket in rng.sample(tickets, size // 4)]
+    rng.shuffle(tickets)
+    return tickets
+
+
+def _shapes(tickets):
+    """The same tickets as every chunk type update accepts."""
+    rows = [num for ticket in tickets for num in ticket]
+    ordered = [num for ticket in tickets for num in sorted(ticket)]
+    return {
+        'bytes': bytes(rows),
+        'bytearray': bytearray(rows),
+        'memoryview': memoryview(bytes(rows)),
+        'array B': array('B', rows),
+        'sorted array B': array('B', ordered),
+        'ranks': array(RANK_TYPECODE, map(rank_combination, tickets)),
+        'masks': mask_rows(bytes(ordered)),
+        'TicketArray': TicketArray(tickets),
+        'list': tickets,
+        'generator': (ticket for ticket in tickets),
+    }
+
+
+def test_unsorted_rows_are_one_combination():
+    analyzer = CombinationAnalyzer().update(bytes([6, 5, 4, 3, 2, 1, 1, 2, 3, 4, 5, 6, 2, 1, 3, 4, 6, 5]))
+    assert analyzer.result() == _reference([[1, 2, 3, 4, 5, 6]] * 3)
+
+
+@pytest.mark.parametrize('shape', list(_shapes([])))
+def test_every_shape_matches_the_reference(shape):
+    tickets = _tickets(1, 400)
+    assert CombinationAnalyzer().update(_shapes(tickets)[shape]).result() == _reference(tickets)
+
+
+def test_mixed_chunks_match_the_reference():
+    tickets = _tickets(2, 1200)
+    analyzer = CombinationAnalyzer()
+    shapes = list(_shapes([]))
+    for index, start in enumerate(range(0, len(tickets), 100)):
+        analyzer.update(_shapes(tickets[start:start + 100])[shapes[index % len(shapes)]])
+    assert analyzer.result() == _reference(tickets)
+
+
+@pytest.mark.parametrize('rows', [
+    bytes([1, 2, 3, 4, 5]),
+    bytes([1, 1, 2, 3, 4, 5]),
+    bytes([0, 1, 2, 3, 4, 5]),
+    array('B', [1, 2, 3, 4, 5, 61]),
+])
+def test_invalid_rows_are_rejected(rows):
+    with pytest.raises(ValueError):
+        CombinationAnalyzer().update(rows)
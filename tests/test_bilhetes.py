@@ -0,0 +1,140 @@
+"""Tests of the Bilhetes containers against Python sets of ranks."""
+
+import random
+from array import array
+
+import pytest
+
+from Bilhetes import Ticket, TicketArray, TicketSet
+from IndiceCombinacoes import COMBINATION_SIZE, RANK_TYPECODE, TOTAL_COMBINATIONS, unrank_combination
+
+
+def _ranks(seed, size):
+    """Random ranks, including both ends of the rank space."""
+    rng = random.Random(seed)
+    return {rng.randrange(TOTAL_COMBINATIONS) for _ in range(size)} | {0, TOTAL_COMBINATIONS - 1}
+
+
+def _rows(ranks, seed):
+    """Flat batch of the tickets of some ranks, in shuffled number order."""
+    rng = random.Random(seed)
+    return bytes(num for rank in ranks for num in rng.sample(unrank_combination(rank), COMBINATION_SIZE))
+
+
+def test_construction_matches_a_set_of_ranks():
+    ranks = _ranks(1, 500)
+    expected = array(RANK_TYPECODE, sorted(ranks))
+    tickets = [unrank_combination(rank) for rank in ranks]
+    for built in (TicketSet(tickets), TicketSet.from_ranks(ranks), TicketSet.from_rows(_rows(ranks, 1))):
+        assert built.ranks() == expected
+        assert len(built) == len(ranks)
+    rows = TicketSet.from_ranks(ranks).to_rows()
+    assert rows.tobytes() == bytes(num for rank in sorted(ranks) for num in unrank_combination(rank))
+
+
+def test_set_algebra_matches_python_sets():
+    left = _ranks(2, 800)
+    right = _ranks(3, 800) | set(sorted(left)[:300])
+    a, b = TicketSet.from_ranks(left), TicketSet.from_ranks(right)
+    for result, expected in ((a | b, left | right), (a & b, left & right), (a - b, left - right), (a ^ b, left ^ right)):
+        assert set(result.ranks()) == expected
+        assert len(result) == len(expected)
+    assert a.isdisjoint(b) == left.isdisjoint(right)
+    assert (a & b).issubset(a) and not a.issubset(a & b)
+
+    c = TicketSet.from_ranks(left)
+    c |= b
+    c -= TicketSet.from_ranks(left & right)
+    assert set(c.ranks()) == (left | right) - (left & right)
+    assert c == a ^ b
+
+
+def test_membership_add_and_discard():
+    tickets = TicketSet()
+    assert not tickets and [1, 2, 3, 4, 5, 6] not in tickets
+    tickets.add([6, 5, 4, 3, 2, 1])
+    assert [1, 2, 3, 4, 5, 6] in tickets and len(tickets) == 1
+    assert [1, 2, 3] not in tickets and [0, 1, 2, 3, 4, 5] not in tickets
+    tickets.discard([1, 2, 3, 4, 5, 6])
+    assert not tickets
+
+
+def test_new_rows_and_dedupe_keep_first_appearances():
+    rng = random.Random(4)
+    played = _ranks(5, 200)
+    stream = [rng.randrange(TOTAL_COMBINATIONS) for _ in range(2000)] + rng.sample(sorted(played), 100)
+    stream += rng.sample(stream, 500)
+    rng.shuffle(stream)
+
+    seen, expected = set(played), []
+    for rank in stream:
+        if rank not in seen:
+            seen.add(rank)
+            expected.append(rank)
+
+    tickets = TicketSet.from_ranks(played)
+    batches = [_rows(stream[start:start + 300], start) for start in range(0, len(stream), 300)]
+    fresh = b''.join(batch.tobytes() for batch in tickets.dedupe(batches))
+    assert fresh == bytes(num for rank in expected for num in unrank_combination(rank))
+    assert set(tickets.ranks()) == seen
+    assert len(TicketSet.from_ranks(played).new_rows(_rows(sorted(played), 6))) == 0
+
+
+def test_save_and_open_round_trip(tmp_path):
+    ranks = _ranks(7, 1000)
+    path = str(tmp_path / 'tickets.set')
+    TicketSet.from_ranks(ranks).save(path)
+
+    with TicketSet.open(path) as loaded:
+        assert set(loaded.ranks()) == ranks
+        assert loaded == TicketSet.from_ranks(ranks)
+        # Copy-on-write: changes stay in memory
+        loaded.add_ranks([1, 2, 3])
+        assert len(loaded) == len(ranks | {1, 2, 3})
+    with TicketSet.open(path) as loaded:
+        assert set(loaded.ranks()) == ranks
+
+    with TicketSet.open(path, writable=True) as loaded:
+        loaded.discard(unrank_combination(0))
+    with TicketSet.open(path) as loaded:
+        assert set(loaded.ranks()) == ranks - {0}
+
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * 100)
+    with pytest.raises(ValueError):
+        TicketSet.open(str(path))
+
+
+@pytest.mark.parametrize('rows', [bytes([1, 2, 3, 4, 5]), bytes([1, 1, 2, 3, 4, 5]), bytes([1, 2, 3, 4, 5, 61])])
+def test_invalid_rows_are_rejected(rows):
+    with pytest.raises(ValueError):
+        TicketSet().add_rows(rows)
+
+
+def test_ticket_order_is_the_rank_order():
+    rng = random.Random(8)
+    tickets = [Ticket(unrank_combination(rank)) for rank in _ranks(8, 2000)]
+    rng.shuffle(tickets)
+    assert [ticket.rank for ticket in sorted(tickets)] == sorted(ticket.rank for ticket in tickets)
+    for first, second in zip(tickets, tickets[1:]):
+        assert (first < second) == (first.rank < second.rank)
+        assert (first >= second) == (first.rank >= second.rank)
+    assert Ticket([6, 5, 4, 3, 2, 1]) == Ticket([1, 2, 3, 4, 5, 6])
+    assert Ticket([1, 2, 3, 4, 5, 6]).rank == 0
+    assert Ticket(range(55, 61)).rank == TOTAL_COMBINATIONS - 1
+
+
+def test_ticket_array_round_trips_rows():
+    ranks = sorted(_ranks(9, 700))
+    rows = bytes(num for rank in ranks for num in unrank_combination(rank))
+    tickets = TicketArray.from_rows(rows)
+    assert len(tickets) == len(ranks)
+    assert tickets.to_rows().tobytes() == rows
+    assert [ticket.rank for ticket in tickets] == ranks
+    assert tickets.tolist() == [unrank_combination(rank) for rank in ranks]
+    assert TicketArray(tickets.tolist()) == tickets
+    assert TicketArray.from_rows(_rows(ranks, 9)) == tickets
+    assert tickets[10:20].to_rows().tobytes() == rows[10 * COMBINATION_SIZE:20 * COMBINATION_SIZE]
+    assert TicketSet(tickets).ranks() == array(RANK_TYPECODE, ranks)
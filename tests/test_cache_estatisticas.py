@@ -0,0 +1,110 @@
+"""Tests of the on-disk StatisticsCache."""
+
+import os
+import random
+
+import pytest
+
+import CacheEstatisticas
+from CacheEstatisticas import StatisticsCache
+from Coocorrencias import CooccurrenceTable
+from Frequencias import FrequencyTable
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, iter_rows
+
+
+def _numbers(seed, draws):
+    rng = random.Random(seed)
+    numbers = range(MIN_NUMBER, MAX_NUMBER + 1)
+    return bytes(num for _ in range(draws) for num in sorted(rng.sample(numbers, COMBINATION_SIZE)))
+
+
+def _store(cache, numbers):
+    cache.store(numbers, FrequencyTable(numbers), CooccurrenceTable(numbers))
+    return cache._path(numbers)
+
+
+def _assert_tables(loaded, numbers):
+    frequencies, cooccurrences = loaded
+    expected = CooccurrenceTable(numbers)
+    assert list(frequencies.counts) == list(FrequencyTable(numbers).counts)
+    assert cooccurrences.draws == expected.draws
+    assert list(cooccurrences.pairs) == list(expected.pairs)
+    assert list(cooccurrences.triples) == list(expected.triples)
+
+
+def test_store_then_load(tmp_path):
+    cache = StatisticsCache(str(tmp_path))
+    numbers = _numbers(1, 50)
+    assert cache.load(numbers) is None
+    _store(cache, numbers)
+    _assert_tables(cache.load(numbers), numbers)
+
+
+def test_a_new_draw_misses(tmp_path):
+    cache = StatisticsCache(str(tmp_path))
+    numbers = _numbers(2, 50)
+    _store(cache, numbers)
+    assert cache.load(numbers + bytes([3, 14, 15, 26, 53, 58])) is None
+    assert cache.load(numbers[:-COMBINATION_SIZE]) is None
+
+
+def test_a_code_change_misses(tmp_path, monkeypatch):
+    cache = StatisticsCache(str(tmp_path))
+    numbers = _numbers(3, 50)
+    _store(cache, numbers)
+    monkeypatch.setattr(CacheEstatisticas, '_code_version', b'\0' * 16)
+    assert cache.load(numbers) is None
+
+
+def test_least_recently_used_entries_are_trimmed(tmp_path):
+    cache = StatisticsCache(str(tmp_path), max_bytes=2 * CacheEstatisticas._FILE_SIZE)
+    histories = [_numbers(seed, 20) for seed in range(4)]
+    paths = [_store(cache, numbers) for numbers in histories[:2]]
+    os.utime(paths[0], (1_000_000, 1_000_000))
+    os.utime(paths[1], (2_000_000, 2_000_000))
+    # Loading the oldest entry makes the other one the least recently used
+    assert cache.load(histories[0]) is not None
+    paths.append(_store(cache, histories[2]))
+    assert [os.path.exists(path) for path in paths] == [True, False, True]
+    assert sum(os.path.getsize(path) for path, _, _ in cache._entries()) <= cache.max_bytes
+
+
+@pytest.mark.parametrize('damage', ['truncate', 'magic', 'version'])
+def test_damaged_entries_are_dropped(tmp_path, damage):
+    cache = StatisticsCache(str(tmp_path))
+    numbers = _numbers(4, 30)
+    path = _store(cache, numbers)
+    with open(path, 'r+b') as file:
+        if damage == 'truncate':
+            file.truncate(CacheEstatisticas._FILE_SIZE - 4)
+        elif damage == 'magic':
+            file.write(b'XXXX')
+        else:
+            file.seek(4)
+            file.write(b'\xff\xff')
+    assert cache.load(numbers) is None
+    assert not os.path.exists(path)
+
+
+def test_updates_of_loaded_tables_leave_the_file_unchanged(tmp_path):
+    cache = StatisticsCache(str(tmp_path))
+    numbers = _numbers(5, 80)
+    history = [list(row) for row in iter_rows(numbers)]
+    SorteadorMegaSena(history, seed=0, cache=cache)
+    path, = (path for path, _, _ in cache._entries())
+    with open(path, 'rb') as file:
+        stored = file.read()
+
+    generator = SorteadorMegaSena(history, seed=0, cache=cache)
+    extra = [[1, 2, 3, 4, 5, 6], [7, 18, 29, 40, 51, 60]]
+    for draw in extra:
+        generator.add_draw(draw)
+    with open(path, 'rb') as file:
+        assert file.read() == stored
+
+    rebuilt = SorteadorMegaSena(history + extra, seed=0)
+    assert generator.frequencies.counts == rebuilt.frequencies.counts
+    assert generator.cooccurrences.pairs == rebuilt.cooccurrences.pairs
+    assert generator.cooccurrences.triples == rebuilt.cooccurrences.triples
+    _assert_tables(cache.load(numbers), numbers)
@@ -0,0 +1,84 @@
+"""Tests of the ticket checking kernels of ConferirBilhetes against brute force."""
+
+import random
+from array import array
+
+import pytest
+
+from Bilhetes import TicketArray
+from ConferirBilhetes import PRIZE_TIERS, check_pool, mask_match_counts, match_counts, rank_prize_matches
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, mask_rows, rank_rows
+
+NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+
+
+def _pool(seed, size, draw):
+    """Random tickets, with a few sharing 4, 5 and 6 numbers with the draw."""
+    rng = random.Random(seed)
+    tickets = [sorted(rng.sample(NUMBERS, COMBINATION_SIZE)) for _ in range(size)]
+    others = [num for num in NUMBERS if num not in draw]
+    for matches in range(COMBINATION_SIZE + 1):
+        tickets.append(sorted(rng.sample(draw, matches) + rng.sample(others, COMBINATION_SIZE - matches)))
+    rng.shuffle(tickets)
+    return tickets
+
+
+def _brute_force(draw, tickets):
+    report = {'total_tickets': len(tickets), 'hits': {}, 'winners': {}}
+    for tier, matches in PRIZE_TIERS.items():
+        winners = [index for index, ticket in enumerate(tickets) if len(set(ticket) & set(draw)) == matches]
+        report['hits'][tier] = len(winners)
+        report['winners'][tier] = winners
+    return report
+
+
+DRAW = [4, 11, 23, 37, 48, 59]
+
+
+@pytest.mark.parametrize('chunk_tickets', [1, 7, 1 << 20])
+@pytest.mark.parametrize('encoding', ['list', 'rows', 'bytes', 'masks', 'ticket_array', 'ranks'])
+def test_check_pool_matches_brute_force(encoding, chunk_tickets):
+    tickets = _pool(3, 300, DRAW)
+    rows = array('B', [num for ticket in tickets for num in ticket])
+    pool = {
+        'list': tickets,
+        'rows': rows,
+        'bytes': rows.tobytes(),
+        'masks': mask_rows(rows),
+        'ticket_array': TicketArray.from_rows(rows),
+        'ranks': rank_rows(rows),
+    }[encoding]
+    assert check_pool(DRAW, pool, chunk_tickets) == _brute_force(DRAW, tickets)
+
+
+def test_kernels_count_every_match():
+    tickets = _pool(4, 200, DRAW)
+    rows = array('B', [num for ticket in tickets for num in ticket])
+    expected = bytes(len(set(ticket) & set(DRAW)) for ticket in tickets)
+    assert match_counts(rows, DRAW) == expected
+    assert mask_match_counts(mask_rows(rows), DRAW) == expected
+    # The rank kernel only resolves prize-winning counts
+    prizes = set(PRIZE_TIERS.values())
+    assert rank_prize_matches(rank_rows(rows), DRAW) == bytes(count if count in prizes else 0 for count in expected)
+
+
+@pytest.mark.parametrize('typecode', ['i', 'I', 'l', 'L', 'q'])
+def test_rank_arrays_of_any_integer_typecode(typecode):
+    tickets = _pool(5, 50, DRAW)
+    ranks = rank_rows(bytes(num for ticket in tickets for num in ticket))
+    assert check_pool(DRAW, array(typecode, ranks)) == _brute_force(DRAW, tickets)
+
+
+@pytest.mark.parametrize('typecode', ['b', 'f', 'd'])
+def test_other_arrays_are_rejected(typecode):
+    with pytest.raises(TypeError):
+        check_pool(DRAW, array(typecode, [1, 2, 3, 4, 5, 6]))
+
+
+def test_empty_pool():
+    assert check_pool(DRAW, array('B')) == _brute_force(DRAW, [])
+
+
+def test_invalid_draw():
+    with pytest.raises(ValueError):
+        check_pool([1, 2, 3], [[1, 2, 3, 4, 5, 6]])
@@ -0,0 +1,78 @@
+"""Tests of the pair and triple counts of Coocorrencias against brute force."""
+
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from Coocorrencias import CooccurrenceTable, triple_rank, unrank_triple
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+
+
+def _history(seed, draws, pool_size=MAX_NUMBER):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(MIN_NUMBER, pool_size + 1), COMBINATION_SIZE)) for _ in range(draws)]
+
+
+def _brute_force(history, size):
+    return Counter(subset for draw in history for subset in combinations(draw, size))
+
+
+def _assert_counts(table, history):
+    pairs, triples = _brute_force(history, 2), _brute_force(history, 3)
+    assert table.draws == len(history)
+    for a, b in combinations(NUMBERS, 2):
+        assert table.pair_count(a, b) == table.pair_count(b, a) == pairs[a, b]
+    assert sum(table.triples) == sum(triples.values())
+    for triple, count in triples.items():
+        assert table.triple_count(*triple) == count
+
+
+@pytest.mark.parametrize('seed, pool_size', [(1, MAX_NUMBER), (2, 12)])
+def test_counts_match_brute_force(seed, pool_size):
+    history = _history(seed, 300, pool_size)
+    table = CooccurrenceTable(bytes(num for draw in history for num in draw))
+    _assert_counts(table, history)
+
+    ticket = history[0]
+    assert table.pair_score(ticket) == sum(_brute_force(history, 2)[pair] for pair in combinations(ticket, 2))
+    batch = bytes(num for draw in history[:50] for num in draw)
+    assert list(table.pair_scores(batch)) == [table.pair_score(draw) for draw in history[:50]]
+
+
+def test_add_and_remove_match_brute_force():
+    history = _history(3, 200)
+    table = CooccurrenceTable(bytes(num for draw in history[:100] for num in draw))
+    for draw in history[100:]:
+        table.add(draw)
+    _assert_counts(table, history)
+    for draw in reversed(history[150:]):
+        table.remove(draw)
+    _assert_counts(table, history[:150])
+
+
+def test_triple_ranks_round_trip():
+    triples = list(combinations(NUMBERS, 3))
+    ranks = [triple_rank(triple) for triple in triples]
+    assert sorted(ranks) == list(range(len(triples)))
+    assert [tuple(unrank_triple(rank)) for rank in ranks] == triples
+
+
+def test_save_and_load(tmp_path):
+    history = _history(4, 120)
+    table = CooccurrenceTable(bytes(num for draw in history for num in draw))
+    path = str(tmp_path / 'cooccurrences.bin')
+    table.save(path)
+    loaded = CooccurrenceTable.load(path)
+    assert loaded.draws == table.draws
+    assert loaded.pairs == table.pairs
+    assert loaded.triples == table.triples
+    _assert_counts(loaded, history)
+
+    with open(path, 'r+b') as file:
+        file.write(b'XXXX')
+    with pytest.raises(ValueError):
+        CooccurrenceTable.load(path)
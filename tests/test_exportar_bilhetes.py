@@ -0,0 +1,71 @@
+"""Tests of the streaming ticket export and of checking exported pools."""
+
+import json
+import random
+
+import pytest
+
+from ConferirBilhetes import check_file, check_pool
+from ExportarBilhetes import COMPRESSIONS, FORMATS, format_chunk, open_ticket_file, read_tickets, write_tickets
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, iter_rows
+
+SUFFIXES = [''] + list(COMPRESSIONS)
+
+
+def _chunks(seed, sizes):
+    rng = random.Random(seed)
+    history = [sorted(rng.sample(range(MIN_NUMBER, MAX_NUMBER + 1), COMBINATION_SIZE)) for _ in range(50)]
+    generator = SorteadorMegaSena(history, seed=seed)
+    return [generator.generate_batch('random', size) for size in sizes]
+
+
+def _read_back(path, file_format):
+    """Rows of an exported file, as a list of lists of numbers."""
+    if file_format == 'bin':
+        return [list(row) for chunk in read_tickets(path, chunk_tickets=100) for row in iter_rows(chunk)]
+    with open_ticket_file(path, 'rb') as file:
+        lines = file.read().decode('ascii').splitlines()
+    if file_format == 'csv':
+        return [[int(num) for num in line.split(',')] for line in lines]
+    return [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+@pytest.mark.parametrize('file_format', FORMATS)
+def test_write_then_read(tmp_path, file_format, suffix):
+    chunks = _chunks(1, [250, 1, 333])
+    path = str(tmp_path / f'tickets.{file_format}{suffix}')
+    assert write_tickets(iter(chunks), path) == 584
+    assert _read_back(path, file_format) == [list(row) for chunk in chunks for row in iter_rows(chunk)]
+    if suffix:
+        with open(path, 'rb') as file:
+            assert file.read() != b''.join(format_chunk(chunk, file_format) for chunk in chunks)
+
+
+def test_explicit_format_overrides_the_suffix(tmp_path):
+    chunks = _chunks(2, [20])
+    path = str(tmp_path / 'tickets.txt.gz')
+    write_tickets(chunks, path, file_format='jsonl')
+    assert _read_back(path, 'jsonl') == [list(row) for row in iter_rows(chunks[0])]
+    with pytest.raises(ValueError):
+        write_tickets(chunks, str(tmp_path / 'tickets.txt'))
+
+
+def test_truncated_files_are_reported(tmp_path):
+    path = tmp_path / 'tickets.bin'
+    path.write_bytes(bytes(range(1, 14)))
+    with pytest.raises(ValueError):
+        list(read_tickets(str(path)))
+
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+def test_check_file_matches_check_pool(tmp_path, suffix):
+    chunks = _chunks(3, [4000, 3000])
+    draw = list(iter_rows(chunks[1]))[17]
+    path = str(tmp_path / f'pool.bin{suffix}')
+    write_tickets(chunks, path)
+    pool = b''.join(chunk.tobytes() for chunk in chunks)
+    expected = check_pool(draw, pool)
+    assert expected['hits']['sena'] >= 1
+    assert check_file(draw, path, chunk_tickets=1000) == expected
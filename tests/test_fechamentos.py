@@ -0,0 +1,60 @@
+"""Tests of the wheel designer of Fechamentos and its guarantee."""
+
+from itertools import combinations
+
+import pytest
+
+from Fechamentos import design_wheel, find_uncovered, verify_wheel, wheel_size_bound
+from IndiceCombinacoes import COMBINATION_SIZE, iter_rows
+
+
+def _brute_force_covered(pool, tickets, guarantee, drawn):
+    """Check every m-subset of the pool against every ticket directly."""
+    tickets = [set(ticket) for ticket in iter_rows(tickets)]
+    return all(
+        any(len(ticket & set(draw)) >= guarantee for ticket in tickets)
+        for draw in combinations(pool, drawn)
+    )
+
+
+@pytest.mark.parametrize('pool, guarantee, drawn', [
+    (list(range(1, 9)), 3, 3),
+    (list(range(1, 11)), 4, 6),
+    ([2, 7, 13, 19, 24, 31, 38, 42, 47, 55, 60], 3, 6),
+    (list(range(10, 22)), 4, 5),
+])
+def test_designed_wheels_keep_their_guarantee(pool, guarantee, drawn):
+    tickets = design_wheel(pool, guarantee, drawn, restarts=2, workers=1, seed=7)
+    rows = list(iter_rows(tickets))
+    assert all(len(set(row)) == COMBINATION_SIZE and set(row) <= set(pool) for row in rows)
+    assert len(rows) >= wheel_size_bound(len(pool), guarantee, drawn)
+    assert verify_wheel(pool, tickets, guarantee, drawn)
+    assert _brute_force_covered(pool, tickets, guarantee, drawn)
+
+
+def test_design_is_reproducible():
+    pool = list(range(1, 13))
+    assert design_wheel(pool, 4, 6, restarts=3, workers=1, seed=1) == design_wheel(pool, 4, 6, restarts=3, workers=1, seed=1)
+
+
+def test_incomplete_wheel_is_rejected():
+    pool = list(range(1, 11))
+    tickets = design_wheel(pool, 4, 6, restarts=1, workers=1, seed=3)
+    # Without any one ticket, the checkers must agree with brute force
+    for drop in range(len(tickets) // COMBINATION_SIZE):
+        start = drop * COMBINATION_SIZE
+        partial = tickets[:start] + tickets[start + COMBINATION_SIZE:]
+        uncovered = find_uncovered(pool, partial, 4, 6)
+        assert verify_wheel(pool, partial, 4, 6) == (uncovered is None)
+        assert (uncovered is None) == _brute_force_covered(pool, partial, 4, 6)
+        if uncovered is not None:
+            assert all(len(set(row) & set(uncovered)) < 4 for row in iter_rows(partial))
+
+
+def test_empty_wheel_covers_nothing():
+    assert find_uncovered(list(range(1, 9)), b'', 3, 6) == list(range(1, 7))
+
+
+def test_invalid_guarantee():
+    with pytest.raises(ValueError):
+        design_wheel(list(range(1, 11)), 7, 6, workers=1)
@@ -0,0 +1,232 @@
+"""Tests of the GerarNumeros generator and of its incremental statistics against full rebuilds."""
+
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from Amostragem import child_seed
+from GerarNumeros import SorteadorMegaSena
+from HistoricoSorteios import Draw, DrawStore
+from IndiceCombinacoes import (
+    COMBINATION_SIZE,
+    MAX_NUMBER,
+    MIN_NUMBER,
+    TOTAL_COMBINATIONS,
+    iter_rows,
+    rank_combination,
+    rank_rows,
+)
+from Restricoes import Constraints, constrained_sampler
+from Metodos import METHODS
+
+
+def _history(seed, draws, pool_size=MAX_NUMBER):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(MIN_NUMBER, pool_size + 1), COMBINATION_SIZE)) for _ in range(draws)]
+
+
+def _build_everything(generator):
+    """Touch the lazily built tables so the updates have to maintain them."""
+    assert generator.delays is not None
+    assert generator.cooccurrences is not None
+    assert generator.contest_index.prefix is not None
+
+
+def _assert_same_statistics(generator, rebuilt):
+    assert list(generator.historical_numbers) == list(rebuilt.historical_numbers)
+    assert generator.frequencies.counts == rebuilt.frequencies.counts
+    assert generator.most_frequent_numbers == rebuilt.most_frequent_numbers
+    assert generator.least_frequent_numbers == rebuilt.least_frequent_numbers
+    assert generator.delays.delays == rebuilt.delays.delays
+    assert generator.delays.longest_gaps == rebuilt.delays.longest_gaps
+    assert generator.delays.window_counts == rebuilt.delays.window_counts
+    assert generator.hot_numbers == rebuilt.hot_numbers
+    assert generator.cold_numbers == rebuilt.cold_numbers
+    assert generator.overdue_numbers == rebuilt.overdue_numbers
+    assert generator.cooccurrences.pairs == rebuilt.cooccurrences.pairs
+    assert generator.cooccurrences.triples == rebuilt.cooccurrences.triples
+    assert list(generator.contest_index.contests) == list(rebuilt.contest_index.contests)
+    assert generator.contest_index.prefix == rebuilt.contest_index.prefix
+    for method in METHODS:
+        generator.rng.seed(11)
+        rebuilt.rng.seed(11)
+        assert generator.generate_batch(method, 20) == rebuilt.generate_batch(method, 20)
+
+
+@pytest.mark.parametrize('seed, pool_size', [(1, MAX_NUMBER), (2, 14), (3, 8)])
+def test_add_draw_matches_rebuild(seed, pool_size):
+    history = _history(seed, 150, pool_size)
+    generator = SorteadorMegaSena(history[:40], seed=0)
+    _build_everything(generator)
+    for draw in history[40:]:
+        generator.add_draw(draw)
+    _assert_same_statistics(generator, SorteadorMegaSena(history, seed=0))
+
+
+@pytest.mark.parametrize('seed, pool_size', [(4, MAX_NUMBER), (5, 14), (6, 8)])
+def test_remove_draw_matches_rebuild(seed, pool_size):
+    history = _history(seed, 150, pool_size)
+    generator = SorteadorMegaSena(history, seed=0)
+    _build_everything(generator)
+    for draw in reversed(history[60:]):
+        generator.remove_draw(draw)
+    _assert_same_statistics(generator, SorteadorMegaSena(history[:60], seed=0))
+
+
+def test_add_then_remove_restores_statistics():
+    history = _history(7, 80)
+    generator = SorteadorMegaSena(history, seed=0)
+    _build_everything(generator)
+    extra = _history(8, 30)
+    for draw in extra:
+        generator.add_draw(draw)
+    for draw in reversed(extra):
+        generator.remove_draw(draw)
+    _assert_same_statistics(generator, SorteadorMegaSena(history, seed=0))
+
+
+def test_remove_draw_only_takes_the_last_draw():
+    generator = SorteadorMegaSena([[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]])
+    with pytest.raises(ValueError):
+        generator.remove_draw([1, 2, 3, 4, 5, 6])
+    generator.remove_draw([12, 11, 10, 9, 8, 7])
+    assert list(generator.historical_numbers) == [1, 2, 3, 4, 5, 6]
+
+
+def test_dated_history_needs_draw_dates(tmp_path):
+    history = _history(10, 12)
+    path = str(tmp_path / 'draws.bin')
+    first = date(2020, 1, 4)
+    DrawStore.create(path, (
+        Draw(contest, first + timedelta(days=7 * contest), draw) for contest, draw in enumerate(history, 1)
+    ))
+    generator = SorteadorMegaSena(draw_store=DrawStore(path), seed=0)
+    _build_everything(generator)
+
+    draw = [3, 14, 15, 26, 53, 58]
+    with pytest.raises(ValueError):
+        generator.add_draw(draw)
+    last_date = first + timedelta(days=7 * len(history))
+    with pytest.raises(ValueError):
+        generator.add_draw(draw, draw_date=last_date - timedelta(days=1))
+    generator.add_draw(draw, draw_date=last_date + timedelta(days=3))
+    period = generator.range_statistics(start_date=last_date + timedelta(days=1))
+    assert period['draws'] == 1 and period['last_contest'] == len(history) + 1
+
+    generator.remove_draw(draw)
+    rebuilt = SorteadorMegaSena([list(row) for row in iter_rows(bytes(DrawStore(path).numbers))], seed=0)
+    assert generator.frequencies.counts == rebuilt.frequencies.counts
+    assert generator.contest_index.prefix == rebuilt.contest_index.prefix
+    assert list(generator.contest_index.dates) == list(DrawStore(path).dates)
+
+
+@pytest.mark.parametrize('history', [
+    [[1, 2, 3, 4, 5, 6]],
+    [[1, 2, 3, 4, 5, 6], [1, 2, 3, 7, 8, 9]],
+    [[1, 2, 3, 4, 5, 6], [4, 5, 6, 7, 8, 9], [7, 8, 9, 10, 11, 12]],
+])
+def test_short_histories_give_valid_tickets(history):
+    generator = SorteadorMegaSena(history, seed=0)
+    for method in ('most_frequent', 'least_frequent', 'mixed', 'random'):
+        batch = generator.generate_batch(method, 2000)
+        rows = list(iter_rows(batch))
+        assert all(len(set(row)) == COMBINATION_SIZE and list(row) == sorted(row) for row in rows)
+        # rank_combination rejects repeated numbers that rank_rows would not notice
+        assert list(rank_rows(batch)) == [rank_combination(row) for row in rows]
+
+
+def test_outcome_tables_are_cached_until_the_statistics_change():
+    history = _history(11, 40)
+    generator = SorteadorMegaSena(history, seed=0)
+    generator.generate_batch('mixed', 5)
+    table = generator._outcome_table('mixed')
+    generator.generate_batch('mixed', 5)
+    assert generator._outcome_table('mixed') is table
+
+    draw = [2, 17, 23, 38, 44, 51]
+    generator.add_draw(draw)
+    rebuilt = SorteadorMegaSena(history + [draw], seed=0)
+    for method in ('most_frequent', 'least_frequent', 'mixed', 'hot', 'cold', 'overdue'):
+        assert generator._outcome_table(method) == rebuilt._outcome_table(method)
+
+
+@pytest.mark.parametrize('count', [1, 10, 47, 48, 500])
+def test_random_batches_of_any_size(count):
+    generator = SorteadorMegaSena(_history(12, 20), seed=0)
+    batch = generator.generate_batch('random', count)
+    assert len(batch) == count * COMBINATION_SIZE
+    assert list(rank_rows(batch)) == [rank_combination(row) for row in iter_rows(batch)]
+
+
+TABLE_METHODS = ('most_frequent', 'least_frequent', 'mixed', 'hot', 'cold', 'overdue')
+
+
+@pytest.mark.parametrize('method', TABLE_METHODS)
+def test_unique_batches_cover_the_whole_space(method):
+    generator = SorteadorMegaSena(_history(13, 100), seed=0)
+    space = generator._outcome_table(method)
+    batch = generator.generate_batch(method, len(space), unique=True)
+    rows = [bytes(row) for row in iter_rows(batch)]
+    assert len(set(rows)) == len(rows) == len(space)
+    assert set(rows) == set(space)
+    with pytest.raises(ValueError, match='distinct combinations'):
+        generator.generate_batch(method, len(space) + 1, unique=True)
+
+
+def test_unique_random_batches():
+    generator = SorteadorMegaSena(_history(14, 100), seed=0)
+    batch = generator.generate_batch('random', 5000, unique=True)
+    assert len(set(rank_rows(batch))) == 5000
+    with pytest.raises(ValueError, match='distinct combinations'):
+        generator.generate_batch('random', TOTAL_COMBINATIONS + 1, unique=True)
+
+    # With constraints the space is the feasible combinations
+    constraints = Constraints(max_sum=25)
+    space = constrained_sampler(constraints).count
+    batch = generator.generate_batch('random', space, unique=True, constraints=constraints)
+    assert len(set(rank_rows(batch))) == space
+    with pytest.raises(ValueError):
+        generator.generate_batch('random', space + 1, unique=True, constraints=constraints)
+
+
+def test_unique_weighted_batches_cover_the_whole_space():
+    # Eight numbers ever drawn: the weighted space is C(8, 6) = 28 tickets
+    generator = SorteadorMegaSena(_history(15, 60, pool_size=8), seed=0)
+    batch = generator.generate_batch('weighted', 28, unique=True)
+    rows = {bytes(row) for row in iter_rows(batch)}
+    assert len(rows) == 28 and max(max(row) for row in rows) <= 8
+    with pytest.raises(ValueError, match='distinct combinations'):
+        generator.generate_batch('weighted', 29, unique=True)
+
+    batch = generator.generate_batch('inverse_weighted', 2000, unique=True)
+    assert len(set(rank_rows(batch))) == 2000
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_generate_parallel_is_reproducible(workers):
+    history = _history(16, 80)
+
+    def outputs(executor):
+        generator = SorteadorMegaSena(history, seed=5)
+        methods = ('mixed', 'mixed', 'random')
+        return [generator.generate_parallel(method, 301, workers, executor).tobytes() for method in methods]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        threaded = outputs(pool)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        processes = outputs(pool)
+    assert outputs(None) == threaded == processes
+    # Successive calls continue the stream
+    assert threaded[0] != threaded[1]
+    assert all(len(batch) == 301 * COMBINATION_SIZE for batch in threaded)
+
+    # Each share is a generator seeded with its child seed
+    root_seed = SorteadorMegaSena(history, seed=5).rng.getrandbits(128)
+    bounds = [301 * share // workers for share in range(workers + 1)]
+    shares = [
+        SorteadorMegaSena(history, seed=child_seed(root_seed, share)).generate_batch('mixed', high - low).tobytes()
+        for share, (low, high) in enumerate(zip(bounds, bounds[1:]))
+    ]
+    assert threaded[0] == b''.join(shares)
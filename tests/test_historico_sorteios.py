@@ -0,0 +1,127 @@
+"""Tests of the memory-mapped DrawStore."""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+import HistoricoSorteios
+from HistoricoSorteios import Draw, DrawStore, read_csv
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+
+FIRST_DATE = date(1996, 3, 11)
+
+
+def _draws(seed, count):
+    rng = random.Random(seed)
+    numbers = range(MIN_NUMBER, MAX_NUMBER + 1)
+    return [
+        Draw(contest, FIRST_DATE + timedelta(days=3 * contest), sorted(rng.sample(numbers, COMBINATION_SIZE)))
+        for contest in range(1, count + 1)
+    ]
+
+
+def _file_size(capacity):
+    """Size of a store file with `capacity` slots: u32 contest and date plus the numbers."""
+    return HistoricoSorteios._HEADER.size + capacity * (4 + 4 + COMBINATION_SIZE)
+
+
+def _assert_holds(store, draws):
+    assert len(store) == len(draws)
+    assert list(store) == draws
+    assert list(store.contests) == [draw.contest for draw in draws]
+    assert list(store.dates) == [draw.date.toordinal() for draw in draws]
+    assert bytes(store.numbers) == bytes(num for draw in draws for num in draw.numbers)
+    assert store.results() == [draw.numbers for draw in draws]
+
+
+def test_create_and_reopen(tmp_path):
+    path = str(tmp_path / 'draws.bin')
+    draws = _draws(1, 10)
+    _assert_holds(DrawStore.create(path, draws), draws)
+    reopened = DrawStore(path)
+    _assert_holds(reopened, draws)
+    assert reopened[-1] == draws[-1]
+    with pytest.raises(IndexError):
+        reopened[10]
+
+
+def test_create_sorts_the_numbers_of_each_draw(tmp_path):
+    store = DrawStore.create(str(tmp_path / 'draws.bin'), [Draw(1, FIRST_DATE, [60, 5, 33, 1, 12, 47])])
+    assert store[0].numbers == [1, 5, 12, 33, 47, 60]
+
+
+def test_append_past_capacity_doubles_the_file(tmp_path):
+    path = str(tmp_path / 'draws.bin')
+    draws = _draws(2, 130)
+    store = DrawStore.create(path, draws[:10])
+    for count, draw in enumerate(draws[10:], 11):
+        store.append(*draw)
+        # 64 preallocated slots, then 128, then 256
+        capacity = 64 if count <= 64 else 128 if count <= 128 else 256
+        assert os.path.getsize(path) == _file_size(capacity)
+    _assert_holds(DrawStore(path), draws)
+
+
+def test_append_keeps_the_file_size_while_slots_are_free(tmp_path):
+    path = str(tmp_path / 'draws.bin')
+    draws = _draws(3, 20)
+    store = DrawStore.create(path, draws[:5])
+    assert os.path.getsize(path) == _file_size(64)
+    for draw in draws[5:]:
+        store.append(*draw)
+    assert os.path.getsize(path) == _file_size(64)
+    _assert_holds(DrawStore(path), draws)
+
+
+def test_extend(tmp_path):
+    path = str(tmp_path / 'draws.bin')
+    draws = _draws(4, 200)
+    store = DrawStore.create(path, draws[:30])
+    store.extend(draws[30:])
+    _assert_holds(store, draws)
+    _assert_holds(DrawStore(path), draws)
+
+
+@pytest.mark.parametrize('contest, numbers', [
+    (5, [1, 2, 3, 4, 5, 6]),
+    (11, [1, 2, 3, 4, 5]),
+    (11, [1, 1, 2, 3, 4, 5]),
+    (11, [0, 1, 2, 3, 4, 5]),
+    (11, [1, 2, 3, 4, 5, 61]),
+])
+def test_invalid_draws_are_rejected(tmp_path, contest, numbers):
+    path = str(tmp_path / 'draws.bin')
+    draws = _draws(5, 10)
+    store = DrawStore.create(path, draws)
+    with pytest.raises(ValueError):
+        store.append(contest, FIRST_DATE, numbers)
+    with pytest.raises(ValueError):
+        store.extend([Draw(contest, FIRST_DATE, numbers)])
+    _assert_holds(DrawStore(path), draws)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        DrawStore(str(path))
+
+
+def test_importar_reads_the_caixa_csv(tmp_path, monkeypatch):
+    draws = _draws(6, 25)
+    lines = ['Concurso;Data do Sorteio;Bola1;Bola2;Bola3;Bola4;Bola5;Bola6;Ganhadores']
+    # Out of order, with unsorted numbers, as in the official spreadsheet
+    for draw in reversed(draws):
+        numbers = random.Random(draw.contest).sample(draw.numbers, COMBINATION_SIZE)
+        lines.append(';'.join([str(draw.contest), f'{draw.date:%d/%m/%Y}', *map(str, numbers), '0']))
+    source = tmp_path / 'resultados.csv'
+    source.write_text('\n'.join(lines) + '\n', encoding='utf-8-sig')
+    assert [draw.contest for draw in read_csv(str(source))] == [draw.contest for draw in draws]
+
+    path = str(tmp_path / 'draws.bin')
+    monkeypatch.setattr(sys, 'argv', ['HistoricoSorteios.py', '--arquivo', path, 'importar', str(source)])
+    HistoricoSorteios.main()
+    _assert_holds(DrawStore(path), draws)
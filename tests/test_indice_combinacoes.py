@@ -0,0 +1,73 @@
+"""Tests of the colexicographic ranking of IndiceCombinacoes."""
+
+import random
+from array import array
+from itertools import combinations
+
+import pytest
+
+from IndiceCombinacoes import (
+    COMBINATION_SIZE,
+    MAX_NUMBER,
+    MIN_NUMBER,
+    RANK_TYPECODE,
+    TOTAL_COMBINATIONS,
+    rank_batch,
+    rank_combination,
+    rank_rows,
+    unrank_batch,
+    unrank_combination,
+)
+
+
+def test_rank_bounds():
+    assert rank_combination(range(MIN_NUMBER, MIN_NUMBER + COMBINATION_SIZE)) == 0
+    assert rank_combination(range(MAX_NUMBER - COMBINATION_SIZE + 1, MAX_NUMBER + 1)) == TOTAL_COMBINATIONS - 1
+
+
+def test_ranks_follow_colex_order():
+    # Colex order over 1..10: sorted by the largest number, then the next
+    small = sorted(combinations(range(1, 11), COMBINATION_SIZE), key=lambda combo: combo[::-1])
+    assert [rank_combination(combo) for combo in small] == list(range(len(small)))
+
+
+def test_round_trip():
+    rng = random.Random(1)
+    ranks = [0, 1, TOTAL_COMBINATIONS - 1] + [rng.randrange(TOTAL_COMBINATIONS) for _ in range(2000)]
+    for rank in ranks:
+        combo = unrank_combination(rank)
+        assert combo == sorted(set(combo))
+        assert MIN_NUMBER <= combo[0] and combo[-1] <= MAX_NUMBER
+        assert rank_combination(combo) == rank
+    assert rank_batch(unrank_batch(ranks)) == array(RANK_TYPECODE, ranks)
+
+
+def test_rank_ignores_order():
+    assert rank_combination([60, 3, 17, 1, 42, 25]) == rank_combination([1, 3, 17, 25, 42, 60])
+
+
+def test_rank_rows_matches_rank_combination():
+    rng = random.Random(2)
+    tickets = [sorted(rng.sample(range(MIN_NUMBER, MAX_NUMBER + 1), COMBINATION_SIZE)) for _ in range(500)]
+    batch = array('B', [num for ticket in tickets for num in ticket])
+    assert list(rank_rows(batch)) == [rank_combination(ticket) for ticket in tickets]
+    assert list(rank_rows(bytes(batch))) == list(rank_rows(batch))
+    assert len(rank_rows(b'')) == 0
+
+
+@pytest.mark.parametrize('combo', [
+    [1, 2, 3, 4, 5],
+    [1, 2, 3, 4, 5, 6, 7],
+    [0, 2, 3, 4, 5, 6],
+    [1, 2, 3, 4, 5, 61],
+    [1, 1, 3, 4, 5, 6],
+])
+def test_rank_rejects_invalid(combo):
+    with pytest.raises(ValueError):
+        rank_combination(combo)
+
+
+@pytest.mark.parametrize('rank', [-1, TOTAL_COMBINATIONS])
+def test_unrank_rejects_out_of_range(rank):
+    with pytest.raises(ValueError):
+        unrank_combination(rank)
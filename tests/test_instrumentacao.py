@@ -0,0 +1,70 @@
+"""Tests of the opt-in instrumentation of SorteadorMegaSena."""
+
+import random
+
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+from Instrumentacao import CountingRandom
+
+SHADOWED = ('generate_batch', 'generate_parallel', 'analyze_combinations', '_refresh_statistics')
+
+
+def _history(seed, draws):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(MIN_NUMBER, MAX_NUMBER + 1), COMBINATION_SIZE)) for _ in range(draws)]
+
+
+def test_stats_count_calls_tickets_and_timings():
+    generator = SorteadorMegaSena(_history(1, 60), seed=0, instrument=True)
+    generator.generate_batch('mixed', 10)
+    generator.generate_batch('mixed', 5)
+    generator.generate_combinations('random', 7)
+    generator.generate_parallel('hot', 12, workers=1)
+    generator.analyze_combinations(generator.generate_batch('cold', 3))
+    generator.add_draw([4, 8, 15, 16, 23, 42])
+
+    stats = generator.stats()
+    assert stats['enabled']
+    assert stats['calls'] == {'mixed': 2, 'random': 1, 'hot': 1, 'cold': 1}
+    assert stats['tickets'] == {'mixed': 15, 'random': 7, 'hot': 12, 'cold': 3}
+    assert stats['total_tickets'] == 37
+    timings = stats['timings']
+    assert timings['generate']['calls'] == 5
+    assert timings['analyze']['calls'] == 1
+    assert timings['statistics']['calls'] == 1
+    assert timings['refresh']['calls'] == 1
+    assert all(timing['total_s'] >= timing['max_s'] >= timing['p50_s'] >= 0 for timing in timings.values())
+    assert stats['rng_draws'] is None
+
+
+def test_counting_draws_keeps_the_stream():
+    history = _history(2, 60)
+    plain = SorteadorMegaSena(history, seed=3)
+    counted = SorteadorMegaSena(history, seed=3)
+    counted.enable_instrumentation(count_rng_draws=True)
+    assert isinstance(counted.rng, CountingRandom)
+    for method in ('mixed', 'random', 'weighted'):
+        assert counted.generate_batch(method, 50) == plain.generate_batch(method, 50)
+    assert counted.stats()['rng_draws'] > 0
+
+
+def test_disable_restores_the_class_methods():
+    history = _history(3, 60)
+    generator = SorteadorMegaSena(history, seed=4)
+    assert not any(name in vars(generator) for name in SHADOWED)
+    generator.enable_instrumentation(count_rng_draws=True)
+    assert all(name in vars(generator) for name in SHADOWED)
+    generator.generate_batch('mixed', 5)
+
+    generator.disable_instrumentation()
+    assert generator.stats() == {'enabled': False}
+    assert generator.instrumentation is None
+    assert not any(name in vars(generator) for name in SHADOWED)
+    for name in SHADOWED:
+        assert getattr(generator, name).__func__ is getattr(SorteadorMegaSena, name)
+    assert type(generator.rng) is random.Random
+
+    # The stream continues where the instrumented one stopped
+    reference = SorteadorMegaSena(history, seed=4)
+    reference.generate_batch('mixed', 5)
+    assert generator.generate_batch('random', 20) == reference.generate_batch('random', 20)
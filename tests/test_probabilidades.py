@@ -0,0 +1,94 @@
+"""Tests of the exact prize probabilities of Probabilidades against brute force."""
+
+import random
+from fractions import Fraction
+from itertools import combinations
+from math import comb
+
+import pytest
+
+from Bilhetes import TicketArray
+from ConferirBilhetes import PRIZE_TIERS
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, TOTAL_COMBINATIONS, mask_rows
+from Probabilidades import match_probability, overlap_histogram, probability_report
+
+
+def _tickets(seed, count, pool_size):
+    """Random tickets over the numbers 1..pool_size, repeats included."""
+    rng = random.Random(seed)
+    tickets = [sorted(rng.sample(range(1, pool_size + 1), COMBINATION_SIZE)) for _ in range(count)]
+    return tickets + tickets[:2]
+
+
+def _brute_force(tickets, pool_size):
+    """
+    Score every draw, grouped by the numbers it takes from 1..pool_size:
+    the rest of the draw cannot match any ticket.
+    """
+    tickets = [set(ticket) for ticket in tickets]
+    pool = range(1, pool_size + 1)
+    moments = {tier: [Fraction(0), Fraction(0), Fraction(0)] for tier in PRIZE_TIERS}
+    for size in range(COMBINATION_SIZE + 1):
+        weight = Fraction(comb(MAX_NUMBER - pool_size, COMBINATION_SIZE - size), TOTAL_COMBINATIONS)
+        for part in combinations(pool, size):
+            part = set(part)
+            matches = [len(ticket & part) for ticket in tickets]
+            for tier, needed in PRIZE_TIERS.items():
+                winners = matches.count(needed)
+                moment = moments[tier]
+                moment[0] += weight * winners
+                moment[1] += weight * winners * winners
+                moment[2] += weight * any(count >= needed for count in matches)
+    return {
+        tier: {'expected_winners': first, 'variance': second - first * first, 'at_least_one': hit}
+        for tier, (first, second, hit) in moments.items()
+    }
+
+
+@pytest.mark.parametrize('seed, count, pool_size', [(1, 1, 6), (2, 5, 9), (3, 12, 11), (4, 20, 12)])
+def test_report_matches_brute_force(seed, count, pool_size):
+    tickets = _tickets(seed, count, pool_size)
+    report = probability_report(tickets)
+    expected = _brute_force(tickets, pool_size)
+    assert report['total_tickets'] == len(tickets)
+    assert report['distinct_tickets'] == len({tuple(ticket) for ticket in tickets})
+    for tier, values in expected.items():
+        result = report['tiers'][tier]
+        assert result['probability'] == match_probability(PRIZE_TIERS[tier])
+        assert result['expected_winners'] == values['expected_winners']
+        assert result['variance'] == values['variance']
+        assert result['at_least_one'] == values['at_least_one']
+        assert result['at_least_one_bounds'] == (values['at_least_one'], values['at_least_one'])
+
+
+def test_bounds_contain_the_exact_value():
+    tickets = _tickets(5, 15, 12)
+    exact = _brute_force(tickets, 12)
+    report = probability_report(tickets, max_enumeration=0)
+    for tier, values in exact.items():
+        result = report['tiers'][tier]
+        assert result['at_least_one'] is None
+        lower, upper = result['at_least_one_bounds']
+        assert lower <= values['at_least_one'] <= upper
+
+
+def test_input_encodings_agree():
+    tickets = _tickets(6, 8, 10)
+    rows = bytes(num for ticket in tickets for num in ticket)
+    report = probability_report(tickets)
+    assert probability_report(rows) == report
+    assert probability_report(mask_rows(rows)) == report
+    assert probability_report(TicketArray(tickets)) == report
+
+
+def test_overlap_histogram_matches_pairs():
+    tickets = _tickets(7, 30, 14)
+    masks = mask_rows(bytes(num for ticket in tickets for num in ticket))
+    pairs = [0] * (COMBINATION_SIZE + 1)
+    for first, second in combinations(tickets, 2):
+        pairs[len(set(first) & set(second))] += 1
+    assert overlap_histogram(masks) == pairs
+
+
+def test_single_ticket_probabilities_sum_to_one():
+    assert sum(match_probability(matches) for matches in range(COMBINATION_SIZE + 1)) == 1
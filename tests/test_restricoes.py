@@ -0,0 +1,82 @@
+"""Tests of the constrained sampler of Restricoes against enumeration."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER
+from Restricoes import ConstrainedSampler, Constraints, satisfies
+
+
+def _low_sum_tickets(max_sum, start=MIN_NUMBER, size=COMBINATION_SIZE):
+    """Enumerate, in lexicographic order, the tickets whose sum is at most max_sum."""
+    if size == 0:
+        yield ()
+        return
+    # The smallest completion from num on is num + (num + 1) + ...
+    num = start
+    while num <= MAX_NUMBER - size + 1 and size * num + size * (size - 1) // 2 <= max_sum:
+        for rest in _low_sum_tickets(max_sum - num, num + 1, size - 1):
+            yield (num,) + rest
+        num += 1
+
+
+def _mirror(ticket):
+    return tuple(sorted(MAX_NUMBER + MIN_NUMBER - num for num in ticket))
+
+
+CASES = [
+    Constraints(max_sum=60),
+    Constraints(max_sum=75, min_odd=2, max_odd=4),
+    Constraints(max_sum=80, max_per_decade=2),
+    Constraints(max_sum=80, max_run=2),
+    Constraints(min_sum=40, max_sum=85, min_odd=3, max_odd=3, max_per_decade=3, max_run=1),
+]
+
+
+@pytest.mark.parametrize('constraints', CASES)
+def test_unrank_enumerates_the_feasible_set(constraints):
+    expected = [
+        bytes(ticket) for ticket in _low_sum_tickets(constraints.max_sum) if satisfies(ticket, constraints)
+    ]
+    sampler = ConstrainedSampler(constraints)
+    assert sampler.count == len(expected)
+    assert sorted(map(sampler.unrank, range(sampler.count))) == sorted(expected)
+
+
+def test_high_sums_mirror_low_sums():
+    # num -> 61 - num maps the tickets summing to s onto those summing to 366 - s
+    low = ConstrainedSampler(Constraints(max_sum=70))
+    high = ConstrainedSampler(Constraints(min_sum=COMBINATION_SIZE * (MAX_NUMBER + MIN_NUMBER) - 70))
+    assert high.count == low.count
+    assert sorted(map(high.unrank, range(high.count))) == sorted(
+        bytes(_mirror(low.unrank(index))) for index in range(low.count)
+    )
+
+
+def test_sample_is_uniform():
+    sampler = ConstrainedSampler(Constraints(max_sum=30))
+    per_ticket = 400
+    draws = sampler.sample(sampler.count * per_ticket, rng=random.Random(5))
+    counts = Counter(draws)
+    assert len(counts) == sampler.count
+    # Binomial counts: every ticket within 5 standard deviations of the mean
+    spread = 5 * (per_ticket * (1 - 1 / sampler.count)) ** 0.5
+    assert all(abs(count - per_ticket) <= spread for count in counts.values())
+    chi_square = sum((count - per_ticket) ** 2 / per_ticket for count in counts.values())
+    # Far beyond the 99.9th percentile of chi-square with count - 1 degrees of freedom
+    assert chi_square < 3 * sampler.count + 30
+
+
+def test_unique_sample():
+    sampler = ConstrainedSampler(Constraints(max_sum=35))
+    draws = sampler.sample(sampler.count, unique=True, rng=random.Random(6))
+    assert sorted(draws) == sorted(map(sampler.unrank, range(sampler.count)))
+    with pytest.raises(ValueError):
+        sampler.sample(sampler.count + 1, unique=True)
+
+
+def test_infeasible_constraints():
+    with pytest.raises(ValueError):
+        ConstrainedSampler(Constraints(max_sum=30, min_odd=6))
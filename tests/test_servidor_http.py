@@ -0,0 +1,143 @@
+"""Tests of the HTTP ticket service against an in-process TicketServer."""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from AnalisadorCombinacoes import CombinationAnalyzer
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MAX_NUMBER, MIN_NUMBER, iter_rows
+from ServidorHTTP import MAX_BODY_BYTES, TicketServer
+
+
+def _history(seed, draws):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(MIN_NUMBER, MAX_NUMBER + 1), COMBINATION_SIZE)) for _ in range(draws)]
+
+
+HISTORY = _history(1, 200)
+
+
+async def _request(port, verb, target, body=b'', headers=()):
+    """Send one request on its own connection; return status, headers and body."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    lines = [f"{verb} {target} HTTP/1.1", f"Content-Length: {len(body)}", 'Connection: close', *headers]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *fields = head.decode('latin-1').split('\r\n')[:-2]
+    response_headers = dict(field.lower().split(': ', 1) for field in fields)
+    payload = await reader.readexactly(int(response_headers['content-length']))
+    writer.close()
+    return int(status_line.split()[1]), response_headers, payload
+
+
+def _serve(scenario, **options):
+    """Run `scenario(server, port)` against a server listening on a free port."""
+    async def main():
+        server = TicketServer(SorteadorMegaSena(HISTORY, seed=0), workers=0, **options)
+        listening = await server.start(port=0)
+        try:
+            return await scenario(server, listening.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_served_by_one_batch():
+    async def scenario(server, port):
+        coalescer = server.coalescer
+        futures = [coalescer.submit('mixed', count) for count in (1, 5, 3, 7)]
+        results = await asyncio.gather(*futures)
+        assert coalescer.requests == 4 and coalescer.batches == 1
+        return results
+
+    results = _serve(scenario)
+    expected = SorteadorMegaSena(HISTORY, seed=0).generate_batch('mixed', 16).tobytes()
+    assert [len(rows) // COMBINATION_SIZE for rows in results] == [1, 5, 3, 7]
+    assert b''.join(results) == expected
+
+
+def test_unseeded_requests_go_through_the_coalescer():
+    async def scenario(server, port):
+        responses = await asyncio.gather(*(_request(port, 'GET', '/generate?method=random&count=2') for _ in range(8)))
+        return server.coalescer, responses
+
+    coalescer, responses = _serve(scenario)
+    assert all(status == 200 for status, _, _ in responses)
+    assert all(len(json.loads(payload)['tickets']) == 2 for _, _, payload in responses)
+    assert coalescer.requests == 8 and 1 <= coalescer.batches <= 8
+
+
+@pytest.mark.parametrize('method', ['mixed', 'random', 'hot'])
+def test_seeded_requests_match_a_fresh_generator(method):
+    async def scenario(server, port):
+        # Unseeded traffic first, so the shared generator's stream has moved
+        await _request(port, 'GET', f'/generate?method={method}&count=3')
+        body = json.dumps({'method': method, 'count': 25, 'seed': 42, 'unique': True}).encode()
+        return await _request(port, 'POST', '/generate', body, ['Content-Type: application/json'])
+
+    status, _, payload = _serve(scenario)
+    expected = SorteadorMegaSena(HISTORY, seed=42).generate_batch(method, 25, unique=True)
+    assert status == 200
+    assert json.loads(payload)['tickets'] == [list(row) for row in iter_rows(expected)]
+
+
+def test_binary_round_trip():
+    async def scenario(server, port):
+        generated = await _request(port, 'GET', '/generate?method=mixed&count=40&seed=7&format=bin')
+        accepted = await _request(port, 'GET', '/generate?method=mixed&count=40&seed=7',
+                                  headers=['Accept: application/octet-stream'])
+        rows = generated[2]
+        analyzed = await _request(port, 'POST', '/analyze', rows, ['Content-Type: application/octet-stream'])
+        tickets = json.dumps({'tickets': [list(row) for row in iter_rows(rows)]}).encode()
+        analyzed_json = await _request(port, 'POST', '/analyze', tickets)
+        return generated, accepted, analyzed, analyzed_json
+
+    generated, accepted, analyzed, analyzed_json = _serve(scenario)
+    expected = SorteadorMegaSena(HISTORY, seed=7).generate_batch('mixed', 40).tobytes()
+    assert generated[0] == 200 and generated[1]['content-type'] == 'application/octet-stream'
+    assert generated[2] == accepted[2] == expected
+    assert analyzed[0] == analyzed_json[0] == 200
+    assert json.loads(analyzed[2]) == json.loads(analyzed_json[2])
+    assert json.loads(analyzed[2]) == json.loads(json.dumps(CombinationAnalyzer().update(expected).result()))
+
+
+@pytest.mark.parametrize('verb, target, body, headers, status, message', [
+    ('GET', '/generate?method=nope', b'', [], 400, 'Invalid method'),
+    ('GET', '/generate?count=0', b'', [], 400, "'count'"),
+    ('POST', '/generate', b'[1, 2]', [], 400, 'JSON object'),
+    ('POST', '/analyze', b'\x01\x02\x03', ['Content-Type: application/octet-stream'], 400, 'bytes each'),
+    ('GET', '/missing', b'', [], 404, '/missing'),
+    ('GET', '/analyze', b'', [], 405, 'accepts POST'),
+])
+def test_error_bodies(verb, target, body, headers, status, message):
+    async def scenario(server, port):
+        return await _request(port, verb, target, body, headers)
+
+    answer, response_headers, payload = _serve(scenario)
+    assert answer == status
+    assert response_headers['content-type'] == 'application/json'
+    assert message in json.loads(payload)['error']
+
+
+@pytest.mark.parametrize('header, status', [
+    (f'Content-Length: {MAX_BODY_BYTES + 1}', 413),
+    ('Content-Length: -5', 400),
+    ('Content-Length: abc', 400),
+    ('Transfer-Encoding: chunked', 501),
+])
+def test_unread_bodies_close_the_connection(header, status):
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"POST /analyze HTTP/1.1\r\n{header}\r\n\r\n".encode())
+        head = await reader.readuntil(b'\r\n\r\n')
+        rest = await reader.read()
+        writer.close()
+        return head.decode('latin-1'), rest
+
+    head, rest = _serve(scenario)
+    assert head.startswith(f'HTTP/1.1 {status} ')
+    assert 'Connection: close' in head
+    assert 'error' in json.loads(rest)
@@ -0,0 +1,56 @@
+"""Tests of the strategy backtest of SimuladorHistorico."""
+
+import random
+
+import pytest
+
+from Amostragem import child_seed
+from ConferirBilhetes import PRIZE_TIERS
+from GerarNumeros import SorteadorMegaSena
+from IndiceCombinacoes import COMBINATION_SIZE, MIN_NUMBER
+from Metodos import METHODS
+from SimuladorHistorico import backtest
+
+
+def _history(seed, draws, pool_size):
+    rng = random.Random(seed)
+    return [sorted(rng.sample(range(MIN_NUMBER, pool_size + 1), COMBINATION_SIZE)) for _ in range(draws)]
+
+
+def _replay(history, methods, tickets_per_contest, min_history, seed):
+    """Backtest with a generator rebuilt from scratch before every contest."""
+    reports = {method: {'contests': 0, 'tickets': 0, **{tier: 0 for tier in PRIZE_TIERS}} for method in methods}
+    for index in range(min_history, len(history)):
+        generator = SorteadorMegaSena(history[:index], seed=child_seed(seed, index))
+        draw = set(history[index])
+        for method in methods:
+            tickets = generator.generate_combinations(method, tickets_per_contest)
+            report = reports[method]
+            report['contests'] += 1
+            report['tickets'] += tickets_per_contest
+            for tier, matches in PRIZE_TIERS.items():
+                report[tier] += sum(len(draw.intersection(ticket)) == matches for ticket in tickets)
+    return reports
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    # A small pool of numbers, so every prize tier gets hits
+    history = _history(1, 30, pool_size=12)
+    single = backtest(history, tickets_per_contest=40, min_history=5, workers=1, seed=3)
+    assert backtest(history, tickets_per_contest=40, min_history=5, workers=3, seed=3) == single
+    assert single == _replay(history, METHODS, 40, 5, 3)
+    assert all(single[method]['contests'] == 25 and single[method]['tickets'] == 1000 for method in METHODS)
+    assert sum(report['quadra'] for report in single.values()) > 0
+
+
+def test_more_workers_than_contests():
+    history = _history(2, 6, pool_size=20)
+    methods = ('mixed', 'random')
+    expected = backtest(history, methods, tickets_per_contest=10, min_history=4, workers=1)
+    assert backtest(history, methods, tickets_per_contest=10, min_history=4, workers=4) == expected
+    assert expected == _replay(history, methods, 10, 4, 0)
+
+
+def test_min_history_must_be_positive():
+    with pytest.raises(ValueError):
+        backtest(_history(3, 5, pool_size=60), min_history=0, workers=1)
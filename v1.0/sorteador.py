@@ -8,7 +8,7 @@ class MegaSenaNumberGenerator:
     def __init__(self):
         # Números dos sorteios de fim de ano (31/12) de 2009 a 2024
         self.historical_results = [
-            [01, 17, 19, 29, 50, 57],  # 2024
+            [1, 17, 19, 29, 50, 57],  # 2024
             [21, 24, 33, 41, 45, 56],  # 2023
             [4, 5, 10, 34, 58, 59],    # 2022
             [12, 15, 23, 32, 33, 46],  # 2021